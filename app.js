@@ -42,6 +42,9 @@ const MAP_TILES = {
     light: 'https://tile.openstreetmap.org/{z}/{x}/{y}.png',
 };
 
+// Pin tile size in pixels (data/tiles/{list}/{z}/{x}/{y}.json, built by scripts/build_tiles.py)
+const PIN_TILE_SIZE = 256;
+
 /**
  * Cookie utility functions
  */
@@ -184,9 +187,13 @@ const state = {
     listColors: {}, // Store selected colors per list
     listIcons: {}, // Store selected icons per list (for schools)
     listVisibility: {}, // Store visibility state per list
-    subwayLines: null, // GeoJSON data for subway lines
+    tileIndex: null, // Pin tile manifest (data/tiles/index.json)
+    tileData: {}, // Fetched pin tile promises by path
+    lineBands: null, // Zoom band files per line kind (data/lines/index.json)
+    lineData: {}, // Fetched line GeoJSON promises by file
+    subwayLines: null, // GeoJSON data for subway lines (current zoom band)
     subwayLinesLayer: null, // Leaflet layer for subway lines
-    trainLines: null, // GeoJSON data for train lines
+    trainLines: null, // GeoJSON data for train lines (current zoom band)
     trainLinesLayer: null, // Leaflet layer for train lines
 };
 
@@ -328,6 +335,9 @@ function initMap() {
 
     // Auto-region selection on map move
     state.map.on('moveend', onMapMove);
+
+    // Swap line geometry when the zoom band changes
+    state.map.on('zoomend', onLineZoom);
 }
 
 /**
@@ -375,8 +385,18 @@ async function loadPinData() {
         const savedColors = loadColorsFromCookie();
         const savedIcons = loadIconsFromCookie();
 
-        // Load pins for each list from individual files
+        // Pin tiles are fetched per viewport; lists without tiles load their whole file
+        await loadTileIndex();
         const listPromises = listsData.lists.map(async (listMeta) => {
+            if (state.tileIndex && state.tileIndex.lists[listMeta.id]) {
+                return {
+                    ...listMeta,
+                    pins: [], // Pins of the tiles loaded for the current view
+                    tiles: null, // Tiles loaded for the current view
+                    tiled: true,
+                    tileKey: null
+                };
+            }
             try {
                 const pinsResponse = await fetch(`data/${listMeta.id}.json`);
                 if (!pinsResponse.ok) throw new Error(`Failed to load pins for list ${listMeta.id}`);
@@ -418,7 +438,8 @@ async function loadPinData() {
         renderPinLists();
         renderAllMarkers();
         
-        // Load subway lines GeoJSON
+        // Load line zoom bands, then the subway lines GeoJSON for the current zoom
+        await loadLineBands();
         await loadSubwayLines();
         
         // Load train lines GeoJSON
@@ -430,6 +451,117 @@ async function loadPinData() {
     }
 }
 
+/**
+ * Load the pin tile manifest (falls back to the full list files if missing)
+ */
+async function loadTileIndex() {
+    try {
+        const response = await fetch('data/tiles/index.json');
+        if (!response.ok) return;
+        state.tileIndex = await response.json();
+    } catch (error) {
+        console.warn('Pin tiles not available, using full list files:', error);
+    }
+}
+
+/**
+ * Pin tiles of a list that cover the current view
+ * @returns {{zoom: number, allPins: boolean, keys: string[], key: string}} tile zoom, whether the tiles hold every pin
+ *     (lower bands hold only the pins shown outside clusters), "x/y" keys that exist, and a cache key for the set
+ */
+function viewTiles(list) {
+    const index = state.tileIndex;
+    const zoom = Math.round(state.map.getZoom());
+    const band = index.bands.find(b => zoom >= b.min_zoom && zoom <= b.max_zoom) || index.bands[index.bands.length - 1];
+    const tileZoom = band.tile_zoom;
+    const available = index.lists[list.id].tiles[tileZoom] || {};
+    
+    const bounds = state.map.getBounds();
+    const nw = state.map.project(bounds.getNorthWest(), tileZoom).divideBy(PIN_TILE_SIZE).floor();
+    const se = state.map.project(bounds.getSouthEast(), tileZoom).divideBy(PIN_TILE_SIZE).floor();
+    const keys = [];
+    for (let x = nw.x; x <= se.x; x++) {
+        for (let y = nw.y; y <= se.y; y++) {
+            if (available.hasOwnProperty(`${x}/${y}`)) keys.push(`${x}/${y}`);
+        }
+    }
+    return { zoom: tileZoom, allPins: band.all_pins === true, keys, key: `${tileZoom}:${keys.join(',')}` };
+}
+
+/**
+ * Fetch a pin tile (pins + precomputed clusters) once per path
+ */
+function fetchPinTile(listId, zoom, key) {
+    const path = `data/tiles/${listId}/${zoom}/${key}.json`;
+    if (!state.tileData[path]) {
+        state.tileData[path] = fetch(path).then(response => {
+            if (!response.ok) throw new Error(`${path}: ${response.status}`);
+            return response.json();
+        }).then(data => ({ pins: data.pins || [], clusters: data.clusters }));
+        state.tileData[path].catch(() => delete state.tileData[path]);
+    }
+    return state.tileData[path];
+}
+
+/**
+ * Show markers for a list, loading the pin tiles for the current view first
+ */
+async function showListPins(listId) {
+    const list = state.pinLists.find(l => l.id === listId);
+    if (!list) return;
+    
+    if (list.tiled) {
+        const tiles = viewTiles(list);
+        if (list.tileKey !== tiles.key) {
+            let loaded;
+            try {
+                loaded = await Promise.all(tiles.keys.map(key => fetchPinTile(listId, tiles.zoom, key)));
+            } catch (error) {
+                console.error(`Error loading pin tiles for list ${listId}:`, error);
+                return;
+            }
+            // View changed again while loading
+            if (viewTiles(list).key !== tiles.key) return;
+            list.tiles = loaded;
+            list.pins = [].concat(...loaded.map(tile => tile.pins));
+            list.tileKey = tiles.key;
+            updatePinCounts();
+        }
+    }
+    
+    // Hidden while loading
+    if (state.listVisibility[listId]) {
+        showMarkers(listId);
+    }
+}
+
+/**
+ * Number of a list's pins inside bounds
+ * Exact when all of the list's pins for the current view are loaded; otherwise estimated from the
+ * manifest's per-tile counts, weighted by how much of each tile is in view.
+ */
+function countPinsInView(list, bounds) {
+    const tiles = list.tiled ? viewTiles(list) : null;
+    if (!tiles || (tiles.allPins && list.tileKey === tiles.key)) {
+        return list.pins.filter(pin => bounds.contains([pin.lat, pin.lng])).length;
+    }
+    
+    const zoom = state.tileIndex.count_zoom;
+    const counts = state.tileIndex.lists[list.id].tiles[zoom] || {};
+    const nw = state.map.project(bounds.getNorthWest(), zoom).divideBy(PIN_TILE_SIZE);
+    const se = state.map.project(bounds.getSouthEast(), zoom).divideBy(PIN_TILE_SIZE);
+    let total = 0;
+    Object.entries(counts).forEach(([key, count]) => {
+        const [x, y] = key.split('/').map(Number);
+        const width = Math.min(x + 1, se.x) - Math.max(x, nw.x);
+        const height = Math.min(y + 1, se.y) - Math.max(y, nw.y);
+        if (width > 0 && height > 0) {
+            total += count * width * height;
+        }
+    });
+    return Math.round(total);
+}
+
 /**
  * Refresh all markers based on map bounds
  */
@@ -453,9 +585,7 @@ function updatePinCounts() {
     const bounds = state.map.getBounds();
     
     state.pinLists.forEach(list => {
-        const filteredCount = list.pins.filter(pin => 
-            bounds.contains([pin.lat, pin.lng])
-        ).length;
+        const filteredCount = countPinsInView(list, bounds);
         
         const countElement = document.querySelector(
             `.pin-list-item[data-list-id="${list.id}"] .pin-count`
@@ -480,9 +610,7 @@ function renderPinLists() {
         const isActive = state.listVisibility[list.id];
         
         // Count pins in current view
-        const filteredCount = list.pins.filter(pin => 
-            bounds.contains([pin.lat, pin.lng])
-        ).length;
+        const filteredCount = countPinsInView(list, bounds);
         
         const listElement = document.createElement('div');
         listElement.className = `pin-list-item ${isActive ? 'active' : ''}`;
@@ -597,7 +725,7 @@ function toggleListVisibility(listId) {
 
     // Update markers
     if (isVisible) {
-        showMarkers(listId);
+        showListPins(listId);
     } else {
         hideMarkers(listId);
     }
@@ -605,7 +733,7 @@ function toggleListVisibility(listId) {
     // Toggle subway lines when subway station list is toggled
     if (listId === LIST_ID_SUBWAY) {
         if (isVisible) {
-            showSubwayLines();
+            loadSubwayLines();
         } else {
             hideSubwayLines();
         }
@@ -615,7 +743,7 @@ function toggleListVisibility(listId) {
     if (listId === LIST_ID_HIGHSPEED_RAIL || listId === LIST_ID_REGULAR_RAIL) {
         const anyTrainListVisible = state.listVisibility[LIST_ID_HIGHSPEED_RAIL] || state.listVisibility[LIST_ID_REGULAR_RAIL];
         if (anyTrainListVisible) {
-            showTrainLines();
+            loadTrainLines();
         } else {
             hideTrainLines();
         }
@@ -687,7 +815,7 @@ function changeListIcon(listId, newIcon) {
 function renderAllMarkers() {
     state.pinLists.forEach(list => {
         if (state.listVisibility[list.id]) {
-            showMarkers(list.id);
+            showListPins(list.id);
         }
     });
 }
@@ -711,6 +839,12 @@ function showMarkers(listId) {
         });
     }
     
+    // Tiles carry clusters precomputed per zoom: place them as they are
+    if (list.tiles && list.tiles.every(tile => tile.clusters)) {
+        showPrecomputedMarkers(list, color);
+        return;
+    }
+    
     // Create new cluster group with custom icon
     const clusterGroup = L.markerClusterGroup({
         maxClusterRadius: 50,
@@ -718,17 +852,7 @@ function showMarkers(listId) {
         showCoverageOnHover: false,
         zoomToBoundsOnClick: true,
         iconCreateFunction: function(cluster) {
-            const count = cluster.getChildCount();
-            
-            let size = 'small';
-            if (count > 50) size = 'large';
-            else if (count > 10) size = 'medium';
-            
-            return L.divIcon({
-                html: `<div class="cluster-marker cluster-${size}" style="background: ${color}"><span>${count}</span></div>`,
-                className: 'custom-cluster-wrapper',
-                iconSize: L.point(40, 40)
-            });
+            return createClusterIcon(cluster.getChildCount(), color);
         }
     });
     
@@ -787,6 +911,58 @@ function showMarkers(listId) {
     }
 }
 
+/**
+ * Show the precomputed cluster points and individual pins of the loaded tiles for the current zoom
+ * (scripts/build_tiles.py; zooms past cluster_max_zoom show every pin)
+ */
+function showPrecomputedMarkers(list, color) {
+    const zoom = Math.round(state.map.getZoom());
+    const bounds = state.map.getBounds();
+    const clustered = zoom <= state.tileIndex.cluster_max_zoom;
+    const group = L.layerGroup();
+    
+    list.tiles.forEach(tile => {
+        // A tile has no entry for a zoom where all its pins joined clusters centred in other tiles
+        const level = tile.clusters[zoom] || { points: [], pins: [] };
+        const pins = clustered ? level.pins.map(i => tile.pins[i]) : tile.pins;
+        pins.forEach(pin => {
+            if (bounds.contains([pin.lat, pin.lng])) {
+                group.addLayer(createMarker(pin, color, list.title, list.id));
+            }
+        });
+        if (!clustered) return;
+        
+        level.points.forEach(([lat, lng, count, expandZoom]) => {
+            if (!bounds.contains([lat, lng])) return;
+            const marker = L.marker([lat, lng], { icon: createClusterIcon(count, color) });
+            // Zoom in to where the cluster splits up
+            marker.on('click', () => {
+                state.map.setView([lat, lng], Math.min(expandZoom, state.map.getMaxZoom()));
+            });
+            group.addLayer(marker);
+        });
+    });
+    
+    group.addTo(state.map);
+    state.clusterGroups[list.id] = group;
+    state.individualMarkers[list.id] = [];
+}
+
+/**
+ * Cluster marker icon (size by pin count)
+ */
+function createClusterIcon(count, color) {
+    let size = 'small';
+    if (count > 50) size = 'large';
+    else if (count > 10) size = 'medium';
+    
+    return L.divIcon({
+        html: `<div class="cluster-marker cluster-${size}" style="background: ${color}"><span>${count}</span></div>`,
+        className: 'custom-cluster-wrapper',
+        iconSize: L.point(40, 40)
+    });
+}
+
 /**
  * Hide markers for a specific list
  */
@@ -804,18 +980,125 @@ function hideMarkers(listId) {
 }
 
 /**
- * Load subway lines GeoJSON
+ * Load the zoom band index for line geometry (falls back to the full files if missing)
  */
-async function loadSubwayLines() {
+async function loadLineBands() {
     try {
-        const response = await fetch('data/subway_lines.json');
+        const response = await fetch('data/lines/index.json');
         if (!response.ok) return;
+        state.lineBands = await response.json();
+    } catch (error) {
+        console.warn('Line zoom bands not available, using full line files:', error);
+    }
+}
+
+/**
+ * Line GeoJSON file for the current zoom
+ * @param {string} kind - 'subway' or 'train'
+ */
+function lineFile(kind) {
+    const bands = state.lineBands && state.lineBands[kind];
+    if (!bands || bands.length === 0) return `${kind}_lines.json`;
+    const zoom = Math.round(state.map.getZoom());
+    const band = bands.find(b => zoom >= b.min_zoom && zoom <= b.max_zoom);
+    return (band || bands[bands.length - 1]).file;
+}
+
+/**
+ * Decode a Google encoded polyline into [[lon, lat], ...] (x first, as written by line_bands.py)
+ * @param {string} str - Encoded polyline
+ * @param {number} scale - 10^decimals
+ */
+function decodePolyline(str, scale) {
+    const points = [];
+    let x = 0, y = 0, i = 0;
+    while (i < str.length) {
+        for (let axis = 0; axis < 2; axis++) {
+            let result = 0, shift = 0, byte;
+            do {
+                byte = str.charCodeAt(i++) - 63;
+                result |= (byte & 0x1f) << shift;
+                shift += 5;
+            } while (byte >= 0x20);
+            const delta = (result & 1) ? ~(result >> 1) : (result >> 1);
+            if (axis === 0) x += delta; else y += delta;
+        }
+        points.push([x / scale, y / scale]);
+    }
+    return points;
+}
+
+/**
+ * Convert a line Topology (shared encoded arcs) into a GeoJSON FeatureCollection
+ * Arc index ~i means arc i reversed; consecutive arcs share their joining point.
+ */
+function decodeLineTopology(topology) {
+    const scale = Math.pow(10, topology.decimals);
+    const arcs = topology.arcs.map(arc => decodePolyline(arc, scale));
+    const features = topology.features.map(feature => ({
+        type: 'Feature',
+        properties: feature.properties,
+        geometry: {
+            type: 'MultiLineString',
+            coordinates: feature.arcs.map(refs => {
+                const line = [];
+                refs.forEach(ref => {
+                    const points = ref < 0 ? arcs[~ref].slice().reverse() : arcs[ref];
+                    for (let i = line.length ? 1 : 0; i < points.length; i++) {
+                        line.push(points[i]);
+                    }
+                });
+                return line;
+            })
+        }
+    }));
+    return { type: 'FeatureCollection', features };
+}
+
+/**
+ * Fetch line GeoJSON once per file (zoom band files are Topology and decoded here)
+ */
+function fetchLineData(file) {
+    if (!state.lineData[file]) {
+        state.lineData[file] = fetch(`data/${file}`).then(response => {
+            if (!response.ok) throw new Error(`${file}: ${response.status}`);
+            return response.json();
+        }).then(data => data.type === 'Topology' ? decodeLineTopology(data) : data);
+        state.lineData[file].catch(() => delete state.lineData[file]);
+    }
+    return state.lineData[file];
+}
+
+/**
+ * Reload visible lines when the zoom band changes
+ */
+function onLineZoom() {
+    if (state.listVisibility[LIST_ID_SUBWAY]) {
+        loadSubwayLines();
+    }
+    if (state.listVisibility[LIST_ID_HIGHSPEED_RAIL] || state.listVisibility[LIST_ID_REGULAR_RAIL]) {
+        loadTrainLines();
+    }
+}
+
+/**
+ * Load subway lines GeoJSON for the current zoom band
+ */
+async function loadSubwayLines() {
+    try {
+        const file = lineFile('subway');
+        const data = await fetchLineData(file);
+        // Zoom changed again while loading
+        if (file !== lineFile('subway')) return;
         
-        state.subwayLines = await response.json();
-        console.log(`Loaded ${state.subwayLines.features.length} subway lines`);
+        if (state.subwayLines !== data) {
+            state.subwayLines = data;
+            hideSubwayLines();
+            console.log(`Loaded ${data.features.length} subway lines (${file})`);
+        }
         
         // Show subway lines if subway station list is visible
-        if (state.listVisibility[6]) {
+        if (state.listVisibility[LIST_ID_SUBWAY]) {
             showSubwayLines();
         }
     } catch (error) {
@@ -865,18 +1148,23 @@ function hideSubwayLines() {
 }
 
 /**
- * Load train lines GeoJSON
+ * Load train lines GeoJSON for the current zoom band
  */
 async function loadTrainLines() {
     try {
-        const response = await fetch('data/train_lines.json');
-        if (!response.ok) return;
+        const file = lineFile('train');
+        const data = await fetchLineData(file);
+        // Zoom changed again while loading
+        if (file !== lineFile('train')) return;
         
-        state.trainLines = await response.json();
-        console.log(`Loaded ${state.trainLines.features.length} train lines`);
+        if (state.trainLines !== data) {
+            state.trainLines = data;
+            hideTrainLines();
+            console.log(`Loaded ${data.features.length} train lines (${file})`);
+        }
         
         // Show train lines if either train station list is visible
-        if (state.listVisibility[7] || state.listVisibility[8]) {
+        if (state.listVisibility[LIST_ID_HIGHSPEED_RAIL] || state.listVisibility[LIST_ID_REGULAR_RAIL]) {
             showTrainLines();
         }
     } catch (error) {
@@ -25,6 +25,14 @@ cp data/lists.json "$OUTPUT_DIR/data/"
 cp data/[0-9]*.json "$OUTPUT_DIR/data/" 2>/dev/null
 cp data/*_lines.json "$OUTPUT_DIR/data/" 2>/dev/null
 
+# 노선도 줌 구간 파일 (data/lines/) 새로 만들어서 복사
+echo "🗺️ 노선도 줌 구간 파일 만드는 중..."
+python3 scripts/line_bands.py > /dev/null && cp -r data/lines "$OUTPUT_DIR/data/"
+
+# 핀 타일 (data/tiles/) 새로 만들어서 복사 - 웹은 화면에 걸친 타일만 받음
+echo "🧱 핀 타일 만드는 중..."
+python3 scripts/build_tiles.py > /dev/null && cp -r data/tiles "$OUTPUT_DIR/data/"
+
 # 결과 출력
 echo ""
 echo "✅ Export 완료!"
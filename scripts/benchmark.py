@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+수집 파이프라인 벤치마크
+mock_server.py를 띄우고 수집 스크립트를 실제 API 대신 그 서버에 연결해서 실행한다.
+스크립트마다 걸린 시간, 초당 요청 수, 최대 메모리(RSS)를 보고한다.
+결과 파일은 임시 폴더에 저장되므로 data/와 scripts/의 파일은 바뀌지 않는다.
+
+사용법:
+    python benchmark.py pipeline                              # fetch_all, 지하철역, 학교 정보
+    python benchmark.py pipeline fetch_all stations --latency 50 --rate-limit 0.02
+    python benchmark.py pipeline --workers 8 --rps 20
+    python benchmark.py rules                                 # 필터 규칙: 기존 손으로 쓴 필터 vs 컴파일된 함수
+    python benchmark.py osm --scale 10                        # 노선 조립: 원소 dict 색인 vs 스트리밍 + NodeStore
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mock_server import DATA_DIR, start_server
+from rules import place_to_doc
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# 벤치마크 대상: 이름 → (스크립트, 임시 data 폴더에 미리 복사할 파일)
+PIPELINE_TARGETS = {
+    "fetch_all": ("fetch_libraries.py", []),
+    "stations": ("fetch_stations.py", []),
+    "schools": ("fetch_school_info.py", ["1.json", "9.json"]),
+    "subway_lines": ("fetch_subway_lines.py", []),
+    "train_lines": ("fetch_train_lines.py", []),
+}
+DEFAULT_PIPELINE = ["fetch_all", "stations", "schools"]
+
+
+# 스크립트를 감싸서 끝날 때 자기 메모리 최대치(VmHWM)를 파일에 남긴다.
+# 리눅스에서 자식의 ru_maxrss에는 fork한 부모(대역 서버가 응답을 들고 있는 이 프로세스)의 최대치가 섞인다.
+PEAK_RUNNER = """
+import atexit, os, runpy, sys
+
+def report_peak():
+    try:
+        with open("/proc/self/status") as f:
+            peak = next(line.split()[1] for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        return
+    with open(os.environ["BENCHMARK_PEAK_FILE"], "w") as f:
+        f.write(peak)
+
+atexit.register(report_peak)
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+
+def run_script(script: str, env: dict, log_path: Path):
+    """
+    스크립트를 자식 프로세스로 실행
+
+    Returns:
+        (종료 코드, 걸린 시간 초, 최대 RSS MB)
+    """
+    peak_path = log_path.with_name("peak_rss_kb")
+    env = {**env, "BENCHMARK_PEAK_FILE": str(peak_path)}
+    with open(log_path, "w", encoding="utf-8") as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-c", PEAK_RUNNER, script, "--no-cache"],
+            cwd=SCRIPTS_DIR,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        # wait4로 이 프로세스 하나의 자원 사용량만 가져온다
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+    # /proc가 없으면(macOS) ru_maxrss - 리눅스는 KB, macOS는 바이트 단위
+    if peak_path.exists():
+        peak_mb = int(peak_path.read_text()) / 1024
+        peak_path.unlink()
+    else:
+        peak_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return process.returncode, elapsed, peak_mb
+
+
+def benchmark_pipeline(args):
+    targets = args.targets or DEFAULT_PIPELINE
+    unknown = [t for t in targets if t not in PIPELINE_TARGETS]
+    if unknown:
+        print(f"❌ 알 수 없는 대상: {', '.join(unknown)} (가능: {', '.join(PIPELINE_TARGETS)})")
+        return 1
+
+    server = start_server(latency=args.latency / 1000, rate_limit=args.rate_limit)
+    work_root = Path(tempfile.mkdtemp(prefix="pins_benchmark_"))
+    print(f"🧪 API 대역 서버: {server.base_url} (지연 {args.latency:g}ms, 429 비율 {args.rate_limit:g})")
+    print(f"   작업 폴더: {work_root}")
+    print()
+
+    results = []
+    try:
+        for target in targets:
+            script, seed_files = PIPELINE_TARGETS[target]
+            work_dir = work_root / target
+            data_dir = work_dir / "data"
+            data_dir.mkdir(parents=True)
+            for name in seed_files:
+                shutil.copy(DATA_DIR / name, data_dir / name)
+
+            env = dict(os.environ)
+            env.update({
+                "KAKAO_API_BASE": server.base_url,
+                "SCHOOLINFO_BASE_URL": f"{server.base_url}/openApi.do",
+                "OVERPASS_URL": f"{server.base_url}/api/interpreter",
+                "KAKAO_API_KEY": "mock",
+                "SCHOOLINFO_API_KEY": "mock",
+                "KAKAO_DAILY_QUOTA": "0",
+                "KAKAO_MAX_WORKERS": str(args.workers),
+                "KAKAO_REQUESTS_PER_SECOND": str(args.rps),
+                "SCHOOLINFO_REQUESTS_PER_SECOND": str(args.rps),
+                "SCHOOLINFO_MAX_WORKERS": str(args.workers),
+                "PINS_DATA_DIR": str(data_dir),
+                "PINS_WORK_DIR": str(work_dir),
+            })
+
+            server.counts.clear()
+            print(f"⏱️ {target} ({script}) 실행 중...", end=" ", flush=True)
+            code, elapsed, peak_mb = run_script(script, env, work_dir / "output.log")
+            requests = server.counts["requests"]
+            print("완료" if code == 0 else f"실패 (종료 코드 {code}, {work_dir / 'output.log'})")
+            results.append({
+                "target": target,
+                "ok": code == 0,
+                "seconds": elapsed,
+                "requests": requests,
+                "throttled": server.counts["throttled"],
+                "rps": requests / elapsed if elapsed > 0 else 0,
+                "peak_mb": peak_mb,
+            })
+    finally:
+        server.shutdown()
+        if not args.keep:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    print()
+    print(f"{'대상':<14}{'시간(s)':>10}{'요청':>9}{'429':>7}{'req/s':>10}{'최대 RSS(MB)':>14}")
+    for r in results:
+        mark = "" if r["ok"] else " ❌"
+        print(
+            f"{r['target']:<14}{r['seconds']:>10.2f}{r['requests']:>9}{r['throttled']:>7}"
+            f"{r['rps']:>10.1f}{r['peak_mb']:>14.1f}{mark}"
+        )
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+# 규칙으로 바꾸기 전의 손으로 쓴 필터 (컴파일된 규칙과 결과/속도를 비교하는 기준)
+def handwritten_university(doc):
+    name = doc.get("place_name", "")
+    category = doc.get("category_name", "")
+    if "폐교" in name or "(폐교)" in name:
+        return False
+    if "와플대학" in name:
+        return False
+    if "교육" not in category and "학교" not in category and "대학" not in category:
+        return False
+    has_university_keyword = "대학교" in name or "대학" in name
+    is_special_case = any(keyword in name for keyword in ["KAIST", "POSTECH", "GIST", "UNIST", "DGIST", "예정"])
+    if not (has_university_keyword or is_special_case):
+        return False
+    exclude_keywords = [
+        "별관", "체육관", "학생체육관", "도서관", "기숙사", "연구소",
+        "병원", "의원", "센터", "타워", "관", "호관", "건물",
+        "교육원", "연수원", "학원", "SLP", "비전", "글로벌센터",
+        "지역대학", "지점", "분원", "수련원", "수위실", "어린이집", "구장", "노인대학",
+        "강당", "연구동", "공학동", "교습소", "교류원", "산학협력단", "총학생회", "교육장",
+        "보건실", "강의동", "여행대학", "입시컨설팅", "분수대", "매점", "아트홀", "장학재단",
+        "연습장", "게임장", "실습동"
+    ]
+    if any(ex in name for ex in exclude_keywords):
+        return False
+    if ("부속" in name or "부설" in name) and "학교" in name:
+        return False
+    if "캠퍼스" in name:
+        building_keywords = ["관", "타워", "센터", "건물", "호관"]
+        if any(bk in name for bk in building_keywords):
+            return False
+    return True
+
+
+def handwritten_pool(known_pool_centers):
+    def filter_pool(doc):
+        name = doc.get("place_name", "")
+        category = doc.get("category_name", "")
+        for center in known_pool_centers:
+            if center in name:
+                return True
+        if "수영" not in name and "수영" not in category:
+            return False
+        exclude = ["호텔", "리조트", "콘도", "아파트", "빌라", "학원", "레슨", "주차장", "화장실"]
+        for ex in exclude:
+            if ex in name:
+                return False
+        return True
+    return filter_pool
+
+
+def handwritten_library(doc):
+    name = doc.get("place_name", "")
+    category = doc.get("category_name", "")
+    if "도서관" not in name:
+        return False
+    if "도서관" not in category:
+        return False
+    exclude = ["학교도서관", "대학도서관", "어린이집", "유치원", "사립", "작은도서관"]
+    for ex in exclude:
+        if ex in name:
+            return False
+    return True
+
+
+def handwritten_school(level):
+    def filter_school(doc):
+        name = doc.get("place_name", "")
+        category = doc.get("category_name", "")
+        if level not in name:
+            return False
+        if "교육" not in category and "학교" not in category:
+            return False
+        if name.endswith("학교") or "예정" in name:
+            return True
+        return False
+    return filter_school
+
+
+def handwritten_mcdonalds(doc):
+    name = doc.get("place_name", "")
+    return "맥도날드" in name or "McDonald" in name
+
+
+def handwritten_subway(doc):
+    name = doc.get("place_name", "")
+    category = doc.get("category_name", "")
+    if "써브웨이" not in name and "서브웨이" not in name and "SUBWAY" not in name.upper():
+        return False
+    if "지하철" in category:
+        return False
+    return True
+
+
+def handwritten_station(doc):
+    name = doc.get('place_name', '')
+    category = doc.get('category_name', '')
+    if '지하철' in category or '전철' in category:
+        exclude = ['주차장', '화장실', '편의점', '보관함', '출입구', '환승', '대합실', '매표소', '출구']
+        for ex in exclude:
+            if ex in name:
+                return False
+        return True
+    if name.endswith('역') and ('교통' in category or '철도' in category):
+        return True
+    return False
+
+
+def handwritten_brand(keywords):
+    def filter_func(doc):
+        name = doc.get("place_name", "")
+        for keyword in keywords:
+            if keyword in name:
+                return True
+        return False
+    return filter_func
+
+
+def handwritten_apartment(brand_name):
+    if brand_name == '이편한세상':
+        brand_variants = ['이편한세상', 'e편한세상']
+    else:
+        brand_variants = [brand_name]
+
+    def filter_func(doc):
+        name = doc.get('place_name', '')
+        category = doc.get('category_name', '')
+        if '아파트' not in category:
+            return False
+        if not any(variant in name for variant in brand_variants):
+            return False
+        if '상가동' in name:
+            return False
+        return True
+    return filter_func
+
+
+def rule_sets() -> list:
+    """벤치마크할 필터 규칙 (수집 스크립트에 정의된 것)과 같은 조건의 손으로 쓴 필터"""
+    import fetch_apartments
+    import fetch_brand
+    import fetch_high_schools
+    import fetch_libraries
+    import fetch_mcdonalds
+    import fetch_middle_schools
+    import fetch_stations
+    import fetch_subway
+    import fetch_swimming_pools
+    import fetch_universities
+
+    sets = [
+        ("대학교", fetch_universities.filter_university, handwritten_university),
+        ("공공수영장", fetch_swimming_pools.filter_pool, handwritten_pool(fetch_swimming_pools.KNOWN_POOL_CENTERS)),
+        ("공공도서관", fetch_libraries.filter_library, handwritten_library),
+        ("고등학교", fetch_high_schools.filter_school, handwritten_school("고등학교")),
+        ("중학교", fetch_middle_schools.filter_school, handwritten_school("중학교")),
+        ("맥도날드", fetch_mcdonalds.filter_mcdonalds, handwritten_mcdonalds),
+        ("써브웨이", fetch_subway.filter_subway, handwritten_subway),
+        ("지하철역", fetch_stations.filter_station, handwritten_station),
+    ]
+    sets += [
+        (brand["name"], fetch_brand.make_filter(brand["keywords"]), handwritten_brand(brand["keywords"]))
+        for brand in fetch_brand.BRANDS.values()
+    ]
+    sets += [
+        (brand["name"], fetch_apartments.create_apartment_filter(brand["name"]), handwritten_apartment(brand["name"]))
+        for brand in fetch_apartments.APARTMENT_BRANDS
+    ]
+    return sets
+
+
+def benchmark_rules(args):
+    # 모든 원본 데이터를 합친 문서 (리스트마다 대부분 걸러지는 실제 검색 결과와 비슷한 분포)
+    docs = []
+    for path in sorted(SCRIPTS_DIR.glob("*_raw.json")):
+        if "_schoolinfo_" in path.name:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            docs.extend(place_to_doc(place) for place in json.load(f))
+    print(f"🧪 원본 데이터 {len(docs)}건 × {args.repeat}회")
+    print()
+    print(f"{'리스트':<14}{'통과':>7}{'기존(ms)':>11}{'키워드별(ms)':>14}{'컴파일(ms)':>13}{'기존 대비':>10}")
+
+    def measure(func):
+        """repeat번 중 가장 빠른 시간 ms (다른 프로세스 때문에 느려진 회차는 빼고 비교)"""
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
+
+    total_handwritten = total_interpreted = total_compiled = 0.0
+    for name, rules, handwritten in rule_sets():
+        expected = [handwritten(doc) for doc in docs]
+        if [rules.interpret(doc) for doc in docs] != expected or [rules(doc) for doc in docs] != expected:
+            print(f"❌ {name}: 규칙의 결과가 기존 필터와 다릅니다")
+            return 1
+
+        # 모두 fetch_all처럼 문서마다 필터를 호출
+        handwritten_ms = measure(lambda: [doc for doc in docs if handwritten(doc)])
+        interpreted_ms = measure(lambda: [doc for doc in docs if rules.interpret(doc)])
+        compiled_ms = measure(lambda: [doc for doc in docs if rules(doc)])
+
+        total_handwritten += handwritten_ms
+        total_interpreted += interpreted_ms
+        total_compiled += compiled_ms
+        print(
+            f"{name:<14}{sum(expected):>7}{handwritten_ms:>11.1f}{interpreted_ms:>14.1f}"
+            f"{compiled_ms:>13.1f}{handwritten_ms / compiled_ms:>9.2f}x"
+        )
+
+    print(
+        f"{'합계':<14}{'':>7}{total_handwritten:>11.1f}{total_interpreted:>14.1f}"
+        f"{total_compiled:>13.1f}{total_handwritten / total_compiled:>9.2f}x"
+    )
+    return 0
+
+
+def overpass_inputs(scale: int) -> list:
+    """
+    [(이름, Overpass 응답 bytes)] - 대역 서버의 노선 응답과 그것을 scale배로 늘린 합성 응답
+    node는 실제 응답(qt 순서)처럼 ID 순서가 아니게 섞는다.
+    "섞임"은 복사본마다 node 다음 way가 오는 응답 (node와 way가 번갈아 와서 조회 사이에 노드가 계속 늘어남)
+    """
+    import random
+
+    from mock_server import MockData
+
+    mock = MockData()
+    inputs = []
+    rng = random.Random(0)
+    for kind in ("subway", "train"):
+        elements = json.loads(mock.overpass(kind))["elements"]
+        relations = [e for e in elements if e["type"] == "relation"]
+        nodes = [e for e in elements if e["type"] == "node"]
+        ways = [e for e in elements if e["type"] == "way"]
+        rng.shuffle(nodes)
+        inputs.append((kind, json.dumps({"elements": relations + nodes + ways}).encode("utf-8")))
+
+        if kind == "subway" and scale > 1:
+            # 노선 이름과 ID를 바꾸고 좌표를 조금씩 옮긴 복사본 scale개
+            offset = max(e["id"] for e in elements) + 1
+            copies = {"relation": [], "node": [], "way": []}
+            sections = []
+            for k in range(scale):
+                shift = k * 0.01
+                for rel in relations:
+                    copies["relation"].append({
+                        **rel,
+                        "id": rel["id"] + k * offset,
+                        "members": [{**m, "ref": m["ref"] + k * offset} for m in rel["members"]],
+                        "tags": {**rel["tags"], "name": f"{rel['tags']['name']} #{k}"},
+                    })
+                for node in nodes:
+                    copies["node"].append({**node, "id": node["id"] + k * offset, "lat": node["lat"] + shift, "lon": node["lon"] + shift})
+                for way in ways:
+                    copies["way"].append({**way, "id": way["id"] + k * offset, "nodes": [n + k * offset for n in way["nodes"]]})
+                sections += copies["node"][-len(nodes):] + copies["way"][-len(ways):]
+            rng.shuffle(copies["node"])
+            body = {"elements": copies["relation"] + copies["node"] + copies["way"]}
+            inputs.append((f"subway x{scale}", json.dumps(body).encode("utf-8")))
+            body = {"elements": copies["relation"] + sections}
+            inputs.append((f"x{scale} 섞임", json.dumps(body).encode("utf-8")))
+    return inputs
+
+
+def dict_index_lines(raw: bytes, relation_line) -> list:
+    """이전 방식: 응답 전체를 파싱하고 node/way 원소 dict를 ID로 찾기 (구간 이어 붙이기는 같게)"""
+    from osm_lines import stitch_lines
+
+    elements = json.loads(raw)["elements"]
+    nodes_by_id = {e["id"]: e for e in elements if e["type"] == "node"}
+    ways_by_id = {e["id"]: e for e in elements if e["type"] == "way"}
+    lines = {}
+    for rel in elements:
+        if rel["type"] != "relation":
+            continue
+        line = relation_line(rel.get("tags", {}))
+        if line is None:
+            continue
+        coordinates = lines.setdefault(line[0], [])
+        for m in rel.get("members", []):
+            way = ways_by_id.get(m["ref"]) if m["type"] == "way" else None
+            if way:
+                coords = [[nodes_by_id[n]["lon"], nodes_by_id[n]["lat"]] for n in way["nodes"] if n in nodes_by_id]
+                if len(coords) >= 2:
+                    coordinates.append(coords)
+    return [stitch_lines(coordinates) for coordinates in lines.values() if coordinates]
+
+
+def benchmark_osm(args):
+    import io
+    import tracemalloc
+
+    import fetch_subway_lines
+    from osm_lines import NodeStore, iter_elements, stream_features
+
+    def measure(func):
+        """(결과, 시간 ms, 메모리 최대치 MB) - tracemalloc은 작은 할당이 많을수록 느려지므로 시간은 따로 잰다"""
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result, elapsed * 1000, peak / 1024 / 1024
+
+    relation_line, colour = fetch_subway_lines.relation_line, fetch_subway_lines.DEFAULT_COLOUR
+    print("노선 조립 전체 (응답 bytes → 노선 좌표), 메모리는 tracemalloc 최대치")
+    print(f"{'입력':<14}{'크기(MB)':>10}{'원소 dict(ms)':>15}{'(MB)':>8}{'스트리밍(ms)':>14}{'(MB)':>8}")
+    inputs = overpass_inputs(args.scale)
+    for name, raw in inputs:
+        expected, dict_ms, dict_mb = measure(lambda: dict_index_lines(raw, relation_line))
+        features, stream_ms, stream_mb = measure(lambda: list(stream_features(iter_elements(io.BytesIO(raw)), relation_line, colour)))
+        if sorted(map(json.dumps, expected)) != sorted(json.dumps(f["geometry"]["coordinates"]) for f in features):
+            print(f"❌ {name}: 스트리밍 결과가 다릅니다")
+            return 1
+        print(f"{name:<14}{len(raw) / 1024 / 1024:>10.1f}{dict_ms:>15.0f}{dict_mb:>8.1f}{stream_ms:>14.0f}{stream_mb:>8.1f}")
+
+    print()
+    print("노드 조회만 (way의 노드 ID → 좌표), 색인 메모리는 만든 뒤 남은 양")
+    print(f"{'입력':<14}{'노드':>9}{'조회':>9}{'dict(ms)':>10}{'(MB)':>8}{'NodeStore(ms)':>15}{'(MB)':>8}")
+    for name, raw in inputs:
+        elements = json.loads(raw)["elements"]
+        nodes = [e for e in elements if e["type"] == "node"]
+        ways = [e["nodes"] for e in elements if e["type"] == "way"]
+        lookups = sum(map(len, ways))
+
+        tracemalloc.start()
+        index = {node["id"]: {"type": "node", "id": node["id"], "lat": node["lat"], "lon": node["lon"]} for node in nodes}
+        dict_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for way in ways:
+            [[index[n]["lon"], index[n]["lat"]] for n in way if n in index]
+        dict_ms = (time.perf_counter() - start) * 1000
+        del index
+
+        tracemalloc.start()
+        store = NodeStore()
+        for node in nodes:
+            store.add(node["id"], node["lon"], node["lat"])
+        store.freeze()
+        store_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for way in ways:
+            store.lookup(way)
+        store_ms = (time.perf_counter() - start) * 1000
+        print(f"{name:<14}{len(nodes):>9}{lookups:>9}{dict_ms:>10.1f}{dict_mb:>8.1f}{store_ms:>15.1f}{store_mb:>8.1f}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 파이프라인 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pipeline = subparsers.add_parser("pipeline", help="API 대역 서버로 수집 스크립트 실행")
+    pipeline.add_argument("targets", nargs="*", help=f"대상 ({', '.join(PIPELINE_TARGETS)})")
+    pipeline.add_argument("--latency", type=float, default=20, help="평균 응답 지연 (ms)")
+    pipeline.add_argument("--rate-limit", type=float, default=0.0, help="429로 응답할 비율 (0~1)")
+    pipeline.add_argument("--workers", type=int, default=int(os.environ.get("KAKAO_MAX_WORKERS", "4")))
+    pipeline.add_argument("--rps", type=float, default=0, help="초당 요청 수 제한 (0이면 제한 없음)")
+    pipeline.add_argument("--keep", action="store_true", help="작업 폴더를 지우지 않음")
+    pipeline.set_defaults(func=benchmark_pipeline)
+
+    rules = subparsers.add_parser("rules", help="필터 규칙 검사 속도 (기존 필터 vs 키워드별 vs 컴파일)")
+    rules.add_argument("--repeat", type=int, default=5)
+    rules.set_defaults(func=benchmark_rules)
+
+    osm = subparsers.add_parser("osm", help="노선 조립: 원소 dict 색인 vs 스트리밍 + NodeStore")
+    osm.add_argument("--scale", type=int, default=10, help="합성 입력의 배수")
+    osm.set_defaults(func=benchmark_osm)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+핀 타일 만들기
+data/{id}.json의 핀을 웹 메르카토르 타일로 나눠서 data/tiles/{id}/{z}/{x}/{y}.json으로 저장한다.
+지도 줌 구간마다 타일 줌 하나를 정해 두고(화면에 타일이 2×2개 정도 걸리는 크기),
+클라이언트(app.js)는 data/tiles/index.json을 보고 보이는 리스트의 화면에 걸친 타일만 받는다.
+
+마커 클러스터도 여기서 미리 계산한다 (supercluster 방식).
+CLUSTER_MAX_ZOOM부터 줌을 하나씩 낮추며 바로 위 줌의 점(핀 또는 클러스터)을 KD 트리로 찾은 반경 CLUSTER_RADIUS_PX 안의
+점들과 차례로 묶고(핀 수 가중 중심), 줌마다 클러스터 중심과 핀 수, 따로 보일 핀을 그 점이 있는 타일에 넣는다.
+클라이언트는 현재 줌의 점만 지도에 놓는다.
+
+    index.json: {"bands": [{"min_zoom": 0, "max_zoom": 8, "tile_zoom": 6, "all_pins": false}, ...],
+                 "count_zoom": 11, "cluster_max_zoom": 18,
+                 "lists": {"6": {"count": 858, "tiles": {"6": {"54/24": 120, ...}, ...}}}}
+
+타일 파일은 data/{id}.json과 같은 {"pins": [...]}에 그 타일 줌을 쓰는 지도 줌별 클러스터를 더한 형식이다.
+구간의 모든 줌이 cluster_max_zoom 이하면(all_pins가 false) pins에는 그 구간 어느 줌에서든 따로 보이는 핀만 넣고,
+클러스터에 묶인 핀은 클러스터 점으로만 남긴다. 모든 핀은 all_pins 구간(타일 줌 11)의 타일에만 있다.
+
+    {"pins": [...],
+     "clusters": {"12": {"points": [[위도, 경도, 핀 수, 펼쳐지는 줌], ...], "pins": [따로 보일 핀의 pins 번호, ...]}, ...}}
+
+타일에 점이 없는 줌은 clusters에서 빠지고, 구간의 어느 줌에도 점이 없는 타일은 만들지 않는다
+(핀이 모두 다른 타일에 중심이 있는 클러스터로 묶인 경우).
+index.json의 cluster_max_zoom보다 큰 줌은 모든 핀을 따로 보인다.
+클러스터 중심이 핀이 없는 타일에 떨어지면 핀 없이 클러스터만 있는 타일이 생긴다 (index.json에는 핀 수 0).
+lists의 tiles는 타일 줌별로 파일이 있는 타일과 그 타일 안의 핀 수(클러스터에 묶인 핀 포함)라서,
+클라이언트는 없는 타일을 요청하지 않고, all_pins가 아닌 구간이나 숨긴 리스트의 화면 안 핀 수는
+count_zoom 타일의 핀 수로 어림한다.
+
+사용법:
+    python build_tiles.py           # lists.json의 모든 리스트
+    python build_tiles.py 1 9       # 지정한 리스트만 (나머지 리스트의 타일은 그대로)
+"""
+
+import json
+import math
+import os
+import shutil
+import sys
+
+from spatial import KDTree
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.environ.get("PINS_DATA_DIR", os.path.join(os.path.dirname(SCRIPT_DIR), "data"))
+
+# 지도 줌 구간 (최소 줌, 최대 줌, 타일 줌) - 구간의 최소 줌보다 2~3 낮은 타일이라 화면에 2×2개 정도 걸림
+ZOOM_BANDS = [(0, 8, 6), (9, 11, 8), (12, 19, 11)]
+
+# 숨긴 리스트의 화면 안 핀 수를 어림할 때 쓰는 타일 줌 (가장 작은 타일)
+COUNT_ZOOM = max(tile_zoom for _, _, tile_zoom in ZOOM_BANDS)
+
+# 메르카토르 투영 한계 위도
+MAX_LAT = 85.05112878
+
+TILE_SIZE = 256
+
+# 클러스터 반경 (화면 픽셀), 최소 핀 수 - app.js의 예전 기준(50픽셀 안에 2개 이하면 따로)과 같음
+CLUSTER_RADIUS_PX = 50
+CLUSTER_MIN_POINTS = 3
+
+# 이 줌까지 묶고, 더 크게 확대하면 모든 핀을 따로 보임 (지도 최대 줌 19)
+CLUSTER_MAX_ZOOM = 18
+
+
+def tile_of(lat: float, lng: float, zoom: int) -> tuple:
+    """위경도 → 이 줌의 타일 (x, y)"""
+    n = 2 ** zoom
+    lat = max(-MAX_LAT, min(MAX_LAT, lat))
+    x = int((lng + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def project(lat: float, lng: float) -> tuple:
+    """위경도 → 웹 메르카토르 (0~1, 0~1) - 줌 z에서 TILE_SIZE * 2^z를 곱하면 픽셀"""
+    lat = max(-MAX_LAT, min(MAX_LAT, lat))
+    return (lng + 180) / 360, (1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2
+
+
+def unproject(x: float, y: float) -> tuple:
+    """project의 반대 (위도, 경도)"""
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y)))), x * 360 - 180
+
+
+def partition(pins: list, zoom: int) -> dict:
+    """핀 → {(x, y): [핀 번호]} (좌표 없는 핀은 뺌)"""
+    tiles = {}
+    for i, pin in enumerate(pins):
+        if pin.get("lat") is None or pin.get("lng") is None:
+            continue
+        tiles.setdefault(tile_of(pin["lat"], pin["lng"], zoom), []).append(i)
+    return tiles
+
+
+def cluster_level(points: list, zoom: int) -> list:
+    """
+    바로 위 줌의 점들을 이 줌에서 묶기
+    아직 묶이지 않은 점마다 반경 안의 묶이지 않은 점을 모아, 핀 수 합이 CLUSTER_MIN_POINTS 이상이면 클러스터 하나로,
+    아니면 모두 그대로 둔다 (그대로 둔 이웃도 이 줌에서는 다시 묶지 않음).
+
+    Args:
+        points: [(x, y, 핀 수, 핀 번호(클러스터는 -1), 펼쳐지는 줌)] - x, y는 project 좌표
+
+    Returns:
+        같은 형식의 이 줌의 점
+    """
+    tree = KDTree([(x, y) for x, y, *_ in points])
+    radius = CLUSTER_RADIUS_PX / (TILE_SIZE * 2 ** zoom)
+    done = bytearray(len(points))
+    result = []
+    for i, point in enumerate(points):
+        if done[i]:
+            continue
+        done[i] = 1
+        x, y, count = point[:3]
+        neighbours = [j for j in tree.within(x, y, radius) if not done[j]]
+        for j in neighbours:
+            done[j] = 1
+        total = count + sum(points[j][2] for j in neighbours)
+        if neighbours and total >= CLUSTER_MIN_POINTS:
+            sum_x = x * count + sum(points[j][0] * points[j][2] for j in neighbours)
+            sum_y = y * count + sum(points[j][1] * points[j][2] for j in neighbours)
+            result.append((sum_x / total, sum_y / total, total, -1, zoom + 1))
+        else:
+            result.append(point)
+            result.extend(points[j] for j in neighbours)
+    return result
+
+
+def build_clusters(pins: list) -> dict:
+    """
+    줌별 클러스터 (CLUSTER_MAX_ZOOM → 0, 위 줌의 결과를 다시 묶음)
+
+    Returns:
+        {줌: [(x, y, 핀 수, 핀 번호(클러스터는 -1), 펼쳐지는 줌)]}
+    """
+    points = [
+        (*project(pin["lat"], pin["lng"]), 1, i, CLUSTER_MAX_ZOOM + 1)
+        for i, pin in enumerate(pins)
+        if pin.get("lat") is not None and pin.get("lng") is not None
+    ]
+    levels = {}
+    for zoom in range(CLUSTER_MAX_ZOOM, -1, -1):
+        points = levels[zoom] = cluster_level(points, zoom)
+    return levels
+
+
+def build_list(list_id: int, data_dir: str, list_dir: str) -> dict:
+    """
+    리스트 하나의 타일을 list_dir/{z}/{x}/{y}.json으로 쓰기
+
+    Returns:
+        index.json의 lists 항목 {"count", "tiles", "files", "bytes"} (files, bytes는 출력용)
+    """
+    with open(os.path.join(data_dir, f"{list_id}.json"), "r", encoding="utf-8") as f:
+        pins = json.load(f).get("pins", [])
+
+    entry = {"count": 0, "tiles": {}, "files": 0, "bytes": 0}
+    levels = build_clusters(pins)
+    for min_zoom, max_zoom, zoom in ZOOM_BANDS:
+        # 모든 줌이 클러스터로 보이는 구간은 어느 줌에서든 따로 보이는 핀만 넣음 (z7 화면에 776KB 대신 점 수십 개)
+        all_pins = max_zoom > CLUSTER_MAX_ZOOM
+        shown = None if all_pins else {
+            pin for map_zoom in range(min_zoom, max_zoom + 1) for *_, pin, _ in levels[map_zoom] if pin >= 0
+        }
+        tiles = {}
+        position = {}
+        pin_counts = {}
+        for key, ids in partition(pins, zoom).items():
+            pin_counts[key] = len(ids)
+            ids = ids if all_pins else [i for i in ids if i in shown]
+            if ids:
+                tiles[key] = {"pins": [pins[i] for i in ids], "clusters": {}}
+                position.update((i, (key, n)) for n, i in enumerate(ids))
+
+        for map_zoom in range(min_zoom, min(max_zoom, CLUSTER_MAX_ZOOM) + 1):
+            for x, y, count, pin, expand in levels[map_zoom]:
+                if pin >= 0:
+                    key, n = position[pin]
+                    tile = tiles[key]["clusters"].setdefault(str(map_zoom), {"points": [], "pins": []})
+                    tile["pins"].append(n)
+                    continue
+                lat, lng = unproject(x, y)
+                key = tile_of(lat, lng, zoom)
+                if key not in tiles:
+                    tiles[key] = {"pins": [], "clusters": {}}
+                tile = tiles[key]["clusters"].setdefault(str(map_zoom), {"points": [], "pins": []})
+                tile["points"].append([round(lat, 6), round(lng, 6), count, expand])
+
+        counts = {}
+        for (x, y), tile in sorted(tiles.items()):
+            path = os.path.join(list_dir, str(zoom), str(x), f"{y}.json")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(tile, f, ensure_ascii=False, separators=(",", ":"))
+            counts[f"{x}/{y}"] = pin_counts.get((x, y), 0)
+            entry["files"] += 1
+            entry["bytes"] += os.path.getsize(path)
+        entry["tiles"][str(zoom)] = counts
+        entry["count"] = sum(counts.values())
+    return entry
+
+
+def build_tiles(list_ids: list, data_dir: str = DATA_DIR) -> dict:
+    """
+    지정한 리스트의 타일을 새로 쓰고 index.json 갱신
+    리스트마다 임시 폴더에 다 쓴 뒤 바꿔 넣어서, 쓰는 도중에도 이전 타일을 받을 수 있다.
+
+    Returns:
+        {리스트 id: build_list 결과}
+    """
+    tiles_dir = os.path.join(data_dir, "tiles")
+    index_path = os.path.join(tiles_dir, "index.json")
+    index = {"lists": {}}
+    if os.path.exists(index_path):
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+
+    results = {}
+    for list_id in list_ids:
+        tmp_dir = os.path.join(tiles_dir, f".{list_id}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        entry = build_list(list_id, data_dir, tmp_dir)
+        list_dir = os.path.join(tiles_dir, str(list_id))
+        shutil.rmtree(list_dir, ignore_errors=True)
+        os.replace(tmp_dir, list_dir)
+        index["lists"][str(list_id)] = {"count": entry["count"], "tiles": entry["tiles"]}
+        results[list_id] = entry
+
+    index["bands"] = [
+        {"min_zoom": min_zoom, "max_zoom": max_zoom, "tile_zoom": tile_zoom, "all_pins": max_zoom > CLUSTER_MAX_ZOOM}
+        for min_zoom, max_zoom, tile_zoom in ZOOM_BANDS
+    ]
+    index["count_zoom"] = COUNT_ZOOM
+    index["cluster_max_zoom"] = CLUSTER_MAX_ZOOM
+    with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(index_path + ".tmp", index_path)
+    return results
+
+
+def main():
+    with open(os.path.join(DATA_DIR, "lists.json"), "r", encoding="utf-8") as f:
+        known = [meta["id"] for meta in json.load(f)["lists"]]
+
+    args = sys.argv[1:]
+    if args:
+        try:
+            list_ids = [int(arg) for arg in args]
+        except ValueError:
+            print(f"❌ 리스트 ID는 숫자여야 합니다: {' '.join(args)}")
+            return 1
+        unknown = [list_id for list_id in list_ids if list_id not in known]
+        if unknown:
+            print(f"❌ lists.json에 없는 리스트: {', '.join(map(str, unknown))}")
+            return 1
+    else:
+        list_ids = known
+
+    missing = [list_id for list_id in list_ids if not os.path.exists(os.path.join(DATA_DIR, f"{list_id}.json"))]
+    for list_id in missing:
+        print(f"⚠️ data/{list_id}.json 파일이 없습니다. 건너뜁니다.")
+    list_ids = [list_id for list_id in list_ids if list_id not in missing]
+
+    results = build_tiles(list_ids)
+    print(f"🧱 핀 타일 (타일 줌 {', '.join(str(z) for _, _, z in ZOOM_BANDS)})")
+    for list_id, entry in results.items():
+        source = os.path.getsize(os.path.join(DATA_DIR, f"{list_id}.json"))
+        tile_counts = ", ".join(f"z{zoom} {len(counts)}개" for zoom, counts in entry["tiles"].items())
+        print(f"   {list_id:>3}: 핀 {entry['count']}개, {source / 1024:.0f}KB → 타일 {tile_counts} ({entry['bytes'] / 1024:.0f}KB)")
+    index_size = os.path.getsize(os.path.join(DATA_DIR, "tiles", "index.json"))
+    print(f"   index.json: {index_size / 1024:.0f}KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,20 +4,105 @@
 """
 
 import os
+import sys
 import json
+import math
+import atexit
+import threading
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from dotenv import load_dotenv
 
+import http_client
+import telemetry
+from dedup import merge_nearby
+from journal import Journal
+from response_cache import ResponseCache
+from throttle import DailyQuota, QuotaExceeded, TokenBucket
+
 # 프로젝트 루트
 PROJECT_ROOT = Path(__file__).parent.parent
 
 # .env 파일 로드
 load_dotenv(PROJECT_ROOT / ".env")
 
-# 카카오 REST API 키
+# 핀 데이터 저장 폴더 (data/{id}.json)
+DATA_DIR = Path(os.environ.get("PINS_DATA_DIR", PROJECT_ROOT / "data"))
+
+# 원본 데이터, 리포트, 상태 파일을 두는 작업 폴더 (기본: scripts)
+WORK_DIR = Path(os.environ.get("PINS_WORK_DIR", Path(__file__).parent))
+
+# 카카오 REST API 키 및 주소 (벤치마크에서는 mock_server.py 주소로 바꿔서 사용)
 API_KEY = os.environ.get("KAKAO_API_KEY", "")
+KAKAO_API_BASE = os.environ.get("KAKAO_API_BASE", "https://dapi.kakao.com").rstrip("/")
+
+# 동시 요청 수 및 초당 요청 수 (모든 스레드가 공유)
+MAX_WORKERS = int(os.environ.get("KAKAO_MAX_WORKERS", "4"))
+REQUESTS_PER_SECOND = float(os.environ.get("KAKAO_REQUESTS_PER_SECOND", "10"))
+
+kakao_limiter = TokenBucket(REQUESTS_PER_SECOND)
+
+# 실행 간에 유지되는 상태 파일 (할당량, 증분 수집 지문 등)
+STATE_DIR = WORK_DIR / ".state"
+
+# 일일 API 할당량 (캐시 적중은 차감하지 않음, 0이면 제한 없음)
+DAILY_QUOTA = int(os.environ.get("KAKAO_DAILY_QUOTA", "300000"))
+
+kakao_quota = DailyQuota(STATE_DIR / "kakao_quota.json", DAILY_QUOTA)
+_quota_save_registered = False
+
+
+def save_quota_at_exit():
+    """할당량을 쓰는 진입점(fetch_all, scheduler.run_jobs 등)에서 호출: 종료할 때 남은 사용량 저장 (한 번만 등록)"""
+    global _quota_save_registered
+    if not _quota_save_registered:
+        atexit.register(kakao_quota.save)
+        _quota_save_registered = True
+
+
+def has_flag(name: str) -> bool:
+    """명령행 플래그(--name) 또는 환경변수(FETCH_NAME=1) 설정 여부"""
+    env_name = "FETCH_" + name.upper().replace("-", "_")
+    return f"--{name}" in sys.argv[1:] or os.environ.get(env_name, "") not in ("", "0")
+
+
+def flag_value(name: str, default: str = None) -> str:
+    """명령행 옵션 값(--name 값, --name=값) 또는 환경변수(FETCH_NAME) 값"""
+    args = sys.argv[1:]
+    for i, arg in enumerate(args):
+        if arg.startswith(f"--{name}="):
+            return arg.split("=", 1)[1]
+        if arg == f"--{name}" and i + 1 < len(args):
+            return args[i + 1]
+    return os.environ.get("FETCH_" + name.upper().replace("-", "_"), default)
+
+
+# 카카오 응답 캐시 (--no-cache: 캐시 사용 안 함, --offline: 캐시만 사용)
+CACHE_DIR = Path(os.environ.get("KAKAO_CACHE_DIR", WORK_DIR / ".cache" / "kakao"))
+CACHE_TTL_HOURS = float(os.environ.get("KAKAO_CACHE_TTL_HOURS", "24"))
+CACHE_MAX_MB = float(os.environ.get("KAKAO_CACHE_MAX_MB", "500"))
+
+kakao_cache = None if has_flag("no-cache") else ResponseCache(
+    CACHE_DIR,
+    ttl=CACHE_TTL_HOURS * 3600,
+    max_bytes=int(CACHE_MAX_MB * 1024 * 1024),
+    offline=has_flag("offline"),
+)
+
+# 중단된 수집을 이어서 하기 위한 작업 저널 (--resume)
+JOURNAL_DIR = WORK_DIR / ".journal"
+
+# 재시도 후에도 실패한 검색 (query, page, rect, 오류) - 지역 검색은 rect가 ""
+failed_queries = []
+_failed_lock = threading.Lock()
+
+
+def record_failure(query: str, page: int, error, rect: str = None):
+    """실패한 검색 기록 (fetch_all이 끝에 보고하고, 실패가 있으면 저널을 남긴다)"""
+    with _failed_lock:
+        failed_queries.append((query, page, rect or "", str(error)))
+
 
 # 광역자치단체 목록 (기본)
 REGIONS = [
@@ -146,7 +231,9 @@ DETAILED_REGIONS = [
 
 
 def check_api_key():
-    """API 키 확인"""
+    """API 키 확인 (오프라인 모드에서는 키가 필요 없음)"""
+    if kakao_cache and kakao_cache.offline:
+        return True
     if not API_KEY:
         print("❌ 오류: KAKAO_API_KEY가 설정되지 않았습니다.")
         print("   .env 파일에 KAKAO_API_KEY=발급받은키 를 추가하세요.")
@@ -154,22 +241,122 @@ def check_api_key():
     return True
 
 
-def search_keyword(query: str, page: int = 1) -> dict:
-    """카카오 키워드 검색 API 호출"""
-    url = "https://dapi.kakao.com/v2/local/search/keyword.json"
+def search_keyword(query: str, page: int = 1, rect: str = None, fresh: bool = False) -> dict:
+    """
+    카카오 키워드 검색 API 호출 (디스크 캐시 사용)
+    
+    Args:
+        query: 검색어
+        page: 페이지 번호 (1~3)
+        rect: 검색 영역 "min_lng,min_lat,max_lng,max_lat" (선택)
+        fresh: True면 캐시된 응답을 쓰지 않고 새로 요청 (받은 응답은 캐시에 저장, 오프라인 모드에서는 캐시 사용)
+    """
+    url = f"{KAKAO_API_BASE}/v2/local/search/keyword.json"
     headers = {"Authorization": f"KakaoAK {API_KEY}"}
     params = {
         "query": query,
         "page": page,
         "size": 15,
     }
+    if rect:
+        params["rect"] = rect
+    
+    if kakao_cache and (not fresh or kakao_cache.offline):
+        cached = kakao_cache.get(url, params)
+        if cached is not None:
+            return cached
+    
+    kakao_quota.consume()
+    data = http_client.get_json("kakao/keyword", url, params=params, headers=headers, limiter=kakao_limiter)
+    
+    if kakao_cache:
+        kakao_cache.put(url, params, data)
+    return data
+
+
+def open_journal(name: str) -> Journal:
+    """수집 작업 저널 열기 (--resume이면 이전 기록을 이어서 사용)"""
+    resume = has_flag("resume")
+    journal = Journal(JOURNAL_DIR / f"{name.lower().replace(' ', '_')}.jsonl", resume=resume)
+    if resume and len(journal):
+        print(f"♻️ 이전 실행에서 완료된 작업 {len(journal)}개를 이어서 사용합니다")
+    return journal
+
+
+def journaled_search(journal, query: str, page: int = 1, rect: str = None, fresh: bool = False) -> dict:
+    """저널에 기록된 페이지는 다시 요청하지 않는 search_keyword"""
+    if journal is None:
+        return search_keyword(query, page, rect=rect, fresh=fresh)
     
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
-    return response.json()
+    unit = (query, page, rect or "")
+    data = journal.get(unit)
+    if data is None:
+        data = search_keyword(query, page, rect=rect, fresh=fresh)
+        journal.record(unit, data)
+    return data
+
 
+def doc_to_place(doc: dict) -> dict:
+    """카카오 검색 결과 문서를 장소 데이터로 변환"""
+    return {
+        "id": doc.get("id"),
+        "name": doc.get("place_name", ""),
+        "address": doc.get("address_name", ""),
+        "road_address": doc.get("road_address_name", ""),
+        "lat": float(doc.get("y", 0)),
+        "lng": float(doc.get("x", 0)),
+        "phone": doc.get("phone", ""),
+        "url": doc.get("place_url", ""),
+        "category": doc.get("category_name", ""),
+    }
 
-def fetch_places_in_region(region: str, keywords: list, filter_func=None) -> list:
+
+def fetch_query_pages(query: str, journal=None, fingerprints=None) -> list:
+    """
+    검색어 하나의 응답 페이지 수집 (최대 3페이지, 45개)
+    
+    Args:
+        query: 검색어
+        journal: 완료된 페이지를 기록할 Journal (선택)
+        fingerprints: 증분 수집용 FingerprintStore (선택)
+    
+    Returns:
+        페이지별 응답 리스트 (오류가 나면 그 전까지의 페이지)
+    """
+    pages = []
+    
+    # 증분 수집은 1페이지로 변경 여부를 판단하므로 응답 캐시(기본 24시간)의 지난 응답을 쓰지 않는다
+    # (바뀐 검색어의 2~3페이지도 캐시에서 가져오면 1페이지와 시점이 어긋남)
+    fresh = fingerprints is not None
+    for page in range(1, 4):
+        try:
+            data = journaled_search(journal, query, page, fresh=fresh)
+        except QuotaExceeded:
+            raise
+        except Exception as e:
+            print(f"  오류 발생 ({query}, page {page}): {e}")
+            record_failure(query, page, e)
+            return pages
+        
+        pages.append(data)
+        
+        if not data.get("documents") or data.get("meta", {}).get("is_end", True):
+            break
+        
+        # 1페이지가 지난번과 같으면 나머지 페이지는 이전 응답 재사용
+        if page == 1 and fingerprints is not None:
+            reused = fingerprints.reuse(query, data)
+            if reused is not None:
+                pages.extend(reused)
+                break
+    
+    if fingerprints is not None and pages:
+        fingerprints.update(query, pages)
+    
+    return pages
+
+
+def fetch_places_in_region(region: str, keywords: list, filter_func=None, journal=None, fingerprints=None, yields=None) -> list:
     """
     특정 지역에서 장소 검색
     
@@ -177,54 +364,104 @@ def fetch_places_in_region(region: str, keywords: list, filter_func=None) -> lis
         region: 검색할 지역
         keywords: 검색 키워드 리스트
         filter_func: 결과 필터링 함수 (doc -> bool)
+        journal: 완료된 페이지를 기록할 Journal (선택)
+        fingerprints: 증분 수집용 FingerprintStore (선택)
+        yields: (지역, 키워드)별 수확률을 기록할 YieldStats (선택)
     
     Returns:
         검색된 장소 리스트
     """
     results = []
+    started = time.perf_counter()
+    region_raw = 0
     
     for keyword in keywords:
         query = f"{region} {keyword}"
+        pages = fetch_query_pages(query, journal, fingerprints)
+        raw = 0
+        accepted_ids = []
         
-        for page in range(1, 4):  # 최대 3페이지 (45개)
-            try:
-                data = search_keyword(query, page)
-                documents = data.get("documents", [])
+        for data in pages:
+            for doc in data.get("documents", []):
+                raw += 1
+                # 필터 함수가 있으면 적용
+                if filter_func and not filter_func(doc):
+                    continue
                 
-                if not documents:
-                    break
-                
-                for doc in documents:
-                    # 필터 함수가 있으면 적용
-                    if filter_func and not filter_func(doc):
-                        continue
-                    
-                    results.append({
-                        "id": doc.get("id"),
-                        "name": doc.get("place_name", ""),
-                        "address": doc.get("address_name", ""),
-                        "road_address": doc.get("road_address_name", ""),
-                        "lat": float(doc.get("y", 0)),
-                        "lng": float(doc.get("x", 0)),
-                        "phone": doc.get("phone", ""),
-                        "url": doc.get("place_url", ""),
-                        "category": doc.get("category_name", ""),
-                    })
-                
-                if data.get("meta", {}).get("is_end", True):
-                    break
-                
-                time.sleep(0.1)
-                
-            except Exception as e:
-                print(f"  오류 발생 ({query}, page {page}): {e}")
-                break
+                place = doc_to_place(doc)
+                accepted_ids.append(place["id"])
+                results.append(place)
         
-        time.sleep(0.1)
+        if yields is not None:
+            yields.record(region, keyword, raw, accepted_ids, len(pages))
+        region_raw += raw
     
+    telemetry.record_region(region, len(results), time.perf_counter() - started, raw=region_raw)
     return results
 
 
+def fetch_regions(regions: list, keywords: list, filter_func=None, journal=None, fingerprints=None, yields=None, plan=None) -> list:
+    """
+    여러 지역을 동시에 검색 (MAX_WORKERS개 스레드, 초당 REQUESTS_PER_SECOND건)
+    
+    Args:
+        regions: 검색할 지역 리스트
+        keywords: 검색 키워드 리스트
+        filter_func: 결과 필터링 함수 (doc -> bool)
+        journal: 완료된 페이지를 기록할 Journal (선택)
+        fingerprints: 증분 수집용 FingerprintStore (선택)
+        yields: (지역, 키워드)별 수확률을 기록할 YieldStats (선택)
+        plan: {지역: 키워드 리스트} - 지역마다 이 키워드만 검색 (선택, --plan)
+    
+    Returns:
+        지역별 검색 결과 리스트 (regions와 같은 순서)
+    
+    Raises:
+        QuotaExceeded: 일일 할당량을 다 쓴 경우 (남은 지역은 취소)
+    """
+    results = [None] * len(regions)
+    progress = telemetry.Progress(len(regions))
+    
+    with ThreadPoolExecutor(max_workers=max(1, MAX_WORKERS)) as executor:
+        futures = {
+            executor.submit(
+                fetch_places_in_region,
+                region,
+                plan[region] if plan is not None else keywords,
+                filter_func,
+                journal,
+                fingerprints,
+                yields,
+            ): i
+            for i, region in enumerate(regions)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except QuotaExceeded:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+            progress.step(f"{regions[i]} → {len(results[i])}개")
+    
+    return results
+
+
+def haversine_distance(lat1, lng1, lat2, lng2):
+    """두 좌표 간 거리 계산 (km)"""
+    R = 6371  # 지구 반경 (km)
+    
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lng = math.radians(lng2 - lng1)
+    
+    a = math.sin(delta_lat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lng/2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    
+    return R * c
+
+
 def remove_duplicates(places: list) -> list:
     """중복 제거 (카카오 place id 기준)"""
     seen = set()
@@ -276,7 +513,7 @@ def convert_to_pins(places: list) -> list:
 
 def save_pins(pins: list, list_id: int):
     """핀 데이터를 JSON 파일로 저장"""
-    output_path = PROJECT_ROOT / "data" / f"{list_id}.json"
+    output_path = DATA_DIR / f"{list_id}.json"
     output_data = {"pins": pins}
     
     with open(output_path, "w", encoding="utf-8") as f:
@@ -288,7 +525,7 @@ def save_pins(pins: list, list_id: int):
 
 def save_raw_data(places: list, filename: str):
     """원본 데이터 백업"""
-    backup_path = Path(__file__).parent / filename
+    backup_path = WORK_DIR / filename
     
     with open(backup_path, "w", encoding="utf-8") as f:
         json.dump(places, f, ensure_ascii=False, indent=2)
@@ -297,7 +534,18 @@ def save_raw_data(places: list, filename: str):
     return backup_path
 
 
-def fetch_all(name: str, keywords: list, list_id: int, filter_func=None, regions=None):
+def save_report(report, filename: str):
+    """수집 통계/리포트 저장 (작업 폴더)"""
+    report_path = WORK_DIR / filename
+    
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    
+    print(f"📊 리포트 저장: {report_path}")
+    return report_path
+
+
+def fetch_all(name: str, keywords: list, list_id: int, filter_func=None, regions=None, sweep=None, merge=None):
     """
     장소 데이터 수집 메인 함수
     
@@ -307,38 +555,124 @@ def fetch_all(name: str, keywords: list, list_id: int, filter_func=None, regions
         list_id: 저장할 리스트 ID (data/{list_id}.json)
         filter_func: 결과 필터링 함수
         regions: 검색할 지역 리스트 (기본: 전국)
+        sweep: True면 지역 이름 대신 사각형 영역 분할로 검색 (기본: --sweep 플래그)
+        merge: True면 가까이 있는 같은 이름의 장소 병합 (기본: --merge-nearby 플래그)
+    
+    --incremental 플래그를 주면 1페이지 결과가 지난번과 같은 검색어는
+    나머지 페이지를 다시 요청하지 않고, 끝나면 변경 내역을 보고한다.
+    --plan 플래그를 주면 최근 실행에서 새 장소가 없던 (지역, 키워드) 조합은 건너뛴다.
     """
     if not check_api_key():
         return
+    save_quota_at_exit()
     
     search_regions = regions or REGIONS
+    use_sweep = has_flag("sweep") if sweep is None else sweep
+    use_merge = has_flag("merge-nearby") if merge is None else merge
     
     print(f"🔍 {name} 위치 수집 시작...")
-    print(f"   검색할 지역 수: {len(search_regions)}개")
+    if use_sweep:
+        print("   검색 방식: 영역 분할 (quadtree)")
+    else:
+        print(f"   검색할 지역 수: {len(search_regions)}개")
     print(f"   검색 키워드: {', '.join(keywords)}")
+    print(f"   동시 요청: {MAX_WORKERS}개, 초당 {REQUESTS_PER_SECOND:g}건")
     print()
     
-    all_places = []
+    telemetry.start()
+    journal = open_journal(name)
+    failures_before = len(failed_queries)
+    raw_filename = f"{name.lower().replace(' ', '_')}_raw.json"
+    
+    fingerprints = None
+    if has_flag("incremental"):
+        from incremental import FingerprintStore, load_previous_places
+        fingerprints = FingerprintStore(name)
+        previous_places = load_previous_places(raw_filename)
+    
+    # (지역, 키워드)별 수확률은 항상 기록하고, --plan이면 그 기록으로 검색할 조합을 정한다
+    yields = None
+    plan = None
+    if not use_sweep:
+        from planner import YieldStats, print_plan
+        yields = YieldStats(name)
+        if has_flag("plan"):
+            plan, plan_summary = yields.plan(search_regions, keywords)
+            print_plan(plan_summary)
+            print()
     
-    for i, region in enumerate(search_regions, 1):
-        print(f"[{i}/{len(search_regions)}] {region} 검색 중...")
-        places = fetch_places_in_region(region, keywords, filter_func)
-        print(f"         → {len(places)}개 발견")
-        all_places.extend(places)
-        time.sleep(0.2)
+    if use_sweep:
+        from sweep import sweep as sweep_search
+        if fingerprints is not None:
+            print("   (영역 분할 검색에서는 증분 수집을 지원하지 않아 전체를 다시 검색합니다)")
     
-    # 중복 제거
+    try:
+        if use_sweep:
+            all_places, sweep_report = sweep_search(keywords, filter_func, journal=journal)
+            save_report(sweep_report, f"{name.lower().replace(' ', '_')}_sweep_stats.json")
+        else:
+            # 지역 순서대로 합쳐야 순차 수집과 같은 중복 제거 결과가 나온다
+            all_places = []
+            seen_ids = set()
+            region_results = fetch_regions(search_regions, keywords, filter_func, journal, fingerprints, yields, plan)
+            for region, places in zip(search_regions, region_results):
+                before = len(seen_ids)
+                seen_ids.update(place["id"] for place in places if place.get("id"))
+                telemetry.annotate_region(region, new=len(seen_ids) - before)
+                all_places.extend(places)
+    except QuotaExceeded as e:
+        print(f"\n⛔ {e} - 저장하지 않고 중단합니다 (--resume으로 이어서 수집할 수 있습니다)")
+        journal.close(completed=False)
+        telemetry.write_report(name, WORK_DIR, {"aborted": "quota"})
+        return None
+    
+    # 중복 제거 (id 기준, --merge-nearby면 이어서 가까이 있는 같은 이름의 장소 병합)
     unique_places = remove_duplicates(all_places)
+    id_unique_count = len(unique_places)
+    if use_merge:
+        unique_places = merge_nearby(unique_places)
     print()
     print(f"✅ 총 {len(unique_places)}개 {name} 수집 완료 (중복 제거 후)")
+    if len(unique_places) < id_unique_count:
+        print(f"   🔗 가까이 있는 같은 이름의 장소 {id_unique_count - len(unique_places)}개 병합 (원본 데이터의 merged_ids)")
+    if kakao_cache:
+        print(f"   {kakao_cache.stats()}")
+    http_client.print_stats()
+    run_failures = failed_queries[failures_before:]
+    if run_failures:
+        print(f"⚠️ 재시도 후에도 실패한 검색 {len(run_failures)}건:")
+        for query, page, rect, error in run_failures:
+            print(f"   {query} (page {page}{f', rect {rect}' if rect else ''}): {error}")
     
     # 핀 형식으로 변환 및 저장
     pins = convert_to_pins(unique_places)
     save_pins(pins, list_id)
     
+    # 증분 수집: 이전 원본 데이터와 비교
+    if fingerprints is not None:
+        from incremental import diff_places, print_diff
+        print(f"   {fingerprints.summary()}")
+        diff = diff_places(previous_places, unique_places)
+        print_diff(diff)
+        save_report(diff, f"{name.lower().replace(' ', '_')}_diff.json")
+        if not run_failures:
+            fingerprints.save()
+    
+    if yields is not None:
+        yields.finish(search_regions, keywords, {query for query, *_ in run_failures})
+        yields.save()
+    
     # 원본 데이터 백업
-    raw_filename = f"{name.lower().replace(' ', '_')}_raw.json"
     save_raw_data(unique_places, raw_filename)
+    telemetry.write_report(name, WORK_DIR, {
+        "mode": "sweep" if use_sweep else "regions",
+        "found": len(unique_places),
+        "fuzzy_merged": id_unique_count - len(unique_places),
+        "failed_queries": len(run_failures),
+    })
+    
+    # 실패한 검색(지역 검색 페이지, 영역 분할 검색의 셀)이 있으면 --resume으로 그 부분만 다시 시도할 수 있도록 저널을 남긴다
+    journal.close(completed=not run_failures)
     
     return unique_places
 
@@ -0,0 +1,104 @@
+"""
+근접 중복 병합
+카카오 place id가 달라도 가까이 있고 정규화한 이름이 같은 장소는 하나로 합친다.
+(예: 구립도서관 본관/별관이 따로 등록된 경우, 이름이 바뀐 지점이 두 번 나오는 경우)
+격자 색인으로 주변 후보만 비교하므로 원본이 수십만 개여도 거의 선형 시간에 끝난다.
+
+다른 장소를 합쳐서 핀이 빠질 수 있으므로 기본으로는 하지 않고 --merge-nearby 플래그를 줄 때만 병합한다.
+"""
+
+import os
+import re
+import unicodedata
+
+from spatial import GridIndex
+
+# 이 거리 안에 있는 같은 이름의 장소를 병합 (m)
+MERGE_DISTANCE_M = float(os.environ.get("DEDUP_DISTANCE_M", "100"))
+
+# 괄호 안 설명 (지점명 보충, 옛 이름 등)
+_PARENTHESES = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+
+# 괄호 안에 있어도 남기는 구분 (래미안부평아파트(2단지), 1회차/2회차, A블록 - 서로 다른 단지)
+_UNIT = re.compile(r"(?:\d+|[a-z])\s*(?:단지|회차|차|블록|블럭)", re.IGNORECASE)
+
+# 이름 앞의 행정구역 (서울특별시, 경기, 강남구 등)
+_REGION_PREFIX = re.compile(
+    r"^(?:(?:\S+(?:특별시|광역시|특별자치시|특별자치도)|서울|부산|대구|인천|광주|대전|울산|세종"
+    r"|경기도?|강원도?|충청[남북]도|충[남북]|전라[남북]도|전[남북]|경상[남북]도|경[남북]|제주도?|\S+[시군구])\s+)+"
+)
+
+# 운영 주체 표시 (강남구립, 서울시립, 공립 등)
+_OPERATOR = re.compile(r"\S*(?:구립|시립|군립|도립)|공립")
+
+# 같은 시설의 다른 건물 (본관/별관/신관/제2관)
+_ANNEX = re.compile(r"(?:본관|별관|신관|분관|제\d+관)$")
+
+# 공백과 기호
+_NOISE = re.compile(r"[\s\W_]+")
+
+
+def normalize_name(name: str) -> str:
+    """비교용 이름 (행정구역, 운영 주체, 별관 표시, 공백/기호 제거, 단지/회차 구분은 유지)"""
+    name = unicodedata.normalize("NFKC", name or "")
+    name = _PARENTHESES.sub(lambda m: " " + " ".join(_UNIT.findall(m.group())) + " ", name)
+    name = _REGION_PREFIX.sub("", name.strip())
+    name = _OPERATOR.sub("", name)
+    name = _NOISE.sub("", name).lower()
+    return _ANNEX.sub("", name)
+
+
+def merge_nearby(places: list, distance_m: float = None) -> list:
+    """
+    가까이 있는 같은 이름의 장소 병합
+
+    먼저 나온 장소를 남기고, 병합된 장소의 id는 남긴 장소의 merged_ids에 기록한다.
+    입력 순서가 같으면 결과도 같다.
+
+    Args:
+        places: 장소 리스트 (id 기준 중복 제거 후)
+        distance_m: 병합 거리 (기본: MERGE_DISTANCE_M)
+
+    Returns:
+        병합된 장소 리스트
+    """
+    distance_m = MERGE_DISTANCE_M if distance_m is None else distance_m
+    if distance_m <= 0:
+        return places
+
+    index = GridIndex(distance_m)
+    kept = []
+
+    for place in places:
+        lat, lng = place.get("lat"), place.get("lng")
+        if not lat or not lng:
+            kept.append(place)
+            continue
+
+        key = normalize_name(place.get("name", ""))
+        target = None
+        if key:
+            for _, candidate in index.within(lat, lng, distance_m):
+                if candidate[0] == key:
+                    target = candidate[1]
+                    break
+
+        if target is None:
+            kept.append(place)
+            index.insert(lat, lng, (key, place))
+            continue
+
+        merged_ids = target.setdefault("merged_ids", [])
+        merged_ids.append(place.get("id"))
+        merged_ids.extend(place.get("merged_ids", []))
+
+    return kept
+
+
+def merge_report(places: list) -> list:
+    """병합 내역 [{id, name, merged_ids}]"""
+    return [
+        {"id": place.get("id"), "name": place.get("name"), "merged_ids": place["merged_ids"]}
+        for place in places
+        if place.get("merged_ids")
+    ]
@@ -1,14 +1,13 @@
 #!/usr/bin/env python3
 """유명 브랜드 아파트 단지 수집"""
 
-import json
 import os
 import sys
-import time
 sys.path.append(os.path.dirname(__file__))
 
-from common import check_api_key, fetch_places_in_region, remove_duplicates, convert_to_pins, save_pins, save_raw_data, DETAILED_REGIONS
+from common import DETAILED_REGIONS
 from dotenv import load_dotenv
+from rules import compile_rules
 
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
@@ -72,79 +71,51 @@ APARTMENT_BRANDS = [
 
 
 def create_apartment_filter(brand_name):
-    """브랜드별 아파트 필터 함수 생성"""
+    """브랜드별 아파트 필터 생성"""
     # 이편한세상은 e편한세상도 허용
     if brand_name == '이편한세상':
         brand_variants = ['이편한세상', 'e편한세상']
     else:
         brand_variants = [brand_name]
     
-    def filter_func(doc):
-        name = doc.get('place_name', '')
-        category = doc.get('category_name', '')
-        
+    return compile_rules([
         # 카테고리에 '아파트'가 포함되어야 함
-        if '아파트' not in category:
-            return False
-        
+        ("reject", {"not": {"category": ["아파트"]}}),
         # 브랜드 이름이 포함되어야 함
-        if not any(variant in name for variant in brand_variants):
-            return False
-        
+        ("reject", {"not": {"name": brand_variants}}),
         # 상가동 제외
-        if '상가동' in name:
-            return False
-        
-        return True
-    
-    return filter_func
+        ("reject", {"name": ["상가동"]}),
+    ], default="accept", name=f"create_apartment_filter({brand_name})")
+
+
+def apartment_job(brand):
+    """스케줄러용 아파트 브랜드 수집 작업"""
+    from scheduler import make_job
+    return make_job(
+        name=brand['name'],
+        list_id=brand['list_id'],
+        keywords=brand['keywords'],
+        filter_func=create_apartment_filter(brand['name']),
+        regions=DETAILED_REGIONS,
+    )
 
 
 def fetch_brand(brand):
-    """단일 브랜드 아파트 수집"""
-    brand_name = brand['name']
-    keywords = brand['keywords']
-    list_id = brand['list_id']
-    
-    print(f"\n🏢 {brand_name} 아파트 수집 시작...")
-    print(f"   검색 키워드: {', '.join(keywords)}")
-    print(f"   검색 지역 수: {len(DETAILED_REGIONS)}개")
-    print()
-    
-    filter_func = create_apartment_filter(brand_name)
-    all_places = []
-    
-    for i, region in enumerate(DETAILED_REGIONS, 1):
-        print(f"[{i}/{len(DETAILED_REGIONS)}] {region} 검색 중...", end=" ")
-        places = fetch_places_in_region(region, keywords, filter_func)
-        print(f"→ {len(places)}개")
-        all_places.extend(places)
-        time.sleep(0.1)  # Rate limit
-    
-    # 중복 제거
-    unique_places = remove_duplicates(all_places)
-    print()
-    print(f"✅ 총 {len(unique_places)}개 {brand_name} 아파트 수집 완료")
-    
-    # 핀 형식으로 변환 및 저장
-    pins = convert_to_pins(unique_places)
-    save_pins(pins, list_id)
-    
-    # 원본 데이터 백업
-    save_raw_data(unique_places, f"{brand_name}_raw.json")
-    
-    return len(unique_places)
+    """단일 브랜드 아파트 수집 (스케줄러로 실행해서 저널/근접 병합/할당량 처리가 같음)"""
+    from scheduler import run_jobs
+    return run_jobs([apartment_job(brand)]).get(brand['name'], 0)
+
+
+def apartment_jobs():
+    """스케줄러용 아파트 브랜드 수집 작업 목록"""
+    return [apartment_job(brand) for brand in APARTMENT_BRANDS]
 
 
 def main():
-    if not check_api_key():
-        return
-    
-    results = {}
+    from scheduler import run_jobs
     
-    for brand in APARTMENT_BRANDS:
-        count = fetch_brand(brand)
-        results[brand['name']] = count
+    # 모든 브랜드를 한 번에 섞어서 수집 (리스트별로 끝나는 대로 저장)
+    results = run_jobs(apartment_jobs())
     
     print("\n" + "=" * 50)
     print("📊 수집 결과 요약:")
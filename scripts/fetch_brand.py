@@ -5,6 +5,7 @@
 
 import sys
 from common import fetch_all, DETAILED_REGIONS
+from rules import compile_rules
 
 # 브랜드별 설정
 # use_detailed: True면 시/군/구 단위로 검색 (매장이 많은 브랜드용)
@@ -43,14 +44,8 @@ BRANDS = {
 
 
 def make_filter(keywords):
-    """브랜드 필터 함수 생성"""
-    def filter_func(doc):
-        name = doc.get("place_name", "")
-        for keyword in keywords:
-            if keyword in name:
-                return True
-        return False
-    return filter_func
+    """브랜드 필터 생성 (이름에 키워드가 포함된 매장만)"""
+    return compile_rules([("accept", {"name": keywords})], default="reject", name="make_filter")
 
 
 def fetch_brand(brand_key):
@@ -71,11 +66,25 @@ def fetch_brand(brand_key):
     )
 
 
+def brand_jobs():
+    """스케줄러용 브랜드 수집 작업 목록"""
+    from scheduler import make_job
+    return [
+        make_job(
+            name=brand['name'],
+            list_id=brand['id'],
+            keywords=brand['keywords'],
+            filter_func=make_filter(brand['keywords']),
+            regions=DETAILED_REGIONS if brand.get('use_detailed', False) else None,
+        )
+        for brand in BRANDS.values()
+    ]
+
+
 def fetch_all_brands():
-    """모든 브랜드 데이터 수집"""
-    for brand_key in BRANDS:
-        print(f"\n{'='*60}")
-        fetch_brand(brand_key)
+    """모든 브랜드 데이터 수집 (한 번에 섞어서 수집)"""
+    from scheduler import run_jobs
+    run_jobs(brand_jobs())
     print(f"\n{'='*60}")
     print("✅ 모든 브랜드 수집 완료!")
 
@@ -2,6 +2,7 @@
 """공공도서관 위치 수집"""
 
 from common import fetch_all, DETAILED_REGIONS
+from rules import compile_rules
 
 NAME = "공공도서관"
 LIST_ID = 4
@@ -16,25 +17,17 @@ KEYWORDS = [
 ]
 
 
-def filter_library(doc):
-    """공공도서관만 필터링"""
-    name = doc.get("place_name", "")
-    category = doc.get("category_name", "")
-    
+# 공공도서관만 필터링
+LIBRARY_RULES = [
     # 도서관이 이름에 포함되어야 함
-    if "도서관" not in name:
-        return False
-    
+    ("reject", {"not": {"name": ["도서관"]}}),
     # 카테고리가 도서관이어야 함 (카페, 화장실 등 제외)
-    if "도서관" not in category:
-        return False
-    
+    ("reject", {"not": {"category": ["도서관"]}}),
     # 제외 키워드 (학교도서관, 대학도서관, 작은도서관 등)
-    exclude = ["학교도서관", "대학도서관", "어린이집", "유치원", "사립", "작은도서관"]
-    for ex in exclude:
-        if ex in name:
-            return False
-    return True
+    ("reject", {"name": ["학교도서관", "대학도서관", "어린이집", "유치원", "사립", "작은도서관"]}),
+]
+
+filter_library = compile_rules(LIBRARY_RULES, default="accept", name="filter_library")
 
 
 if __name__ == "__main__":
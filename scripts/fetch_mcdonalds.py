@@ -2,16 +2,18 @@
 """맥도날드 매장 위치 수집"""
 
 from common import fetch_all, DETAILED_REGIONS
+from rules import compile_rules
 
 NAME = "맥도날드"
 LIST_ID = 2
 KEYWORDS = ["맥도날드"]
 
 
-def filter_mcdonalds(doc):
-    """맥도날드 매장만 필터링"""
-    name = doc.get("place_name", "")
-    return "맥도날드" in name or "McDonald" in name
+MCDONALDS_RULES = [
+    ("accept", {"name": ["맥도날드", "McDonald"]}),
+]
+
+filter_mcdonalds = compile_rules(MCDONALDS_RULES, default="reject", name="filter_mcdonalds")
 
 
 if __name__ == "__main__":
@@ -13,14 +13,93 @@ API 문서: https://www.schoolinfo.go.kr/download/OpenAPI_Developer_Guide.pdf
 
 import os
 import json
+import re
 import time
-import requests
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+from pathlib import Path
 from dotenv import load_dotenv
 
+import http_client
+import telemetry
+from common import DATA_DIR, WORK_DIR, extract_region, flag_value, has_flag, open_journal, save_report
+from join import join_records, match_report
+from response_cache import ResponseCache
+from school_stats import SchoolStats
+from throttle import TokenBucket
+
 load_dotenv()
 
 SCHOOLINFO_API_KEY = os.getenv("SCHOOLINFO_API_KEY")
-BASE_URL = "https://www.schoolinfo.go.kr/openApi.do"
+BASE_URL = os.getenv("SCHOOLINFO_BASE_URL", "https://www.schoolinfo.go.kr/openApi.do")
+
+# 학교알리미 초당 요청 수 (429 응답 시 자동으로 낮아짐)
+schoolinfo_limiter = TokenBucket(float(os.getenv("SCHOOLINFO_REQUESTS_PER_SECOND", "10")))
+
+# 학교별 상세 조회(학생수, 졸업생 진로)를 동시에 보낼 수 (모든 스레드가 위의 초당 요청 수를 공유)
+MAX_WORKERS = int(os.getenv("SCHOOLINFO_MAX_WORKERS", "4"))
+
+
+# 공시 연도: 학생수는 이 연도, 졸업생 진로현황은 전년도 (--year 2026으로 한 해씩 넘김)
+SCHOOLINFO_YEAR = int(flag_value("year", os.getenv("SCHOOLINFO_YEAR", "2025")))
+
+# 학교알리미 응답 캐시 (--no-cache: 사용 안 함, --offline: 캐시만 사용)
+# 지난 연도 공시 자료는 바뀌지 않으므로 만료 없이 두고, 올해 자료만 TTL이 지나면 다시 받는다
+SCHOOLINFO_CACHE_DIR = Path(os.getenv("SCHOOLINFO_CACHE_DIR", WORK_DIR / ".cache" / "schoolinfo"))
+SCHOOLINFO_CACHE_TTL_HOURS = float(os.getenv("SCHOOLINFO_CACHE_TTL_HOURS", "168"))
+
+schoolinfo_cache = None if has_flag("no-cache") else ResponseCache(
+    SCHOOLINFO_CACHE_DIR,
+    ttl=SCHOOLINFO_CACHE_TTL_HOURS * 3600,
+    offline=has_flag("offline"),
+)
+
+# 캐시 키에 쓰는 요청 파라미터 (API 키는 넣지 않음, 기본정보는 sidoCode/sggCode로 구분)
+CACHE_KEY_PARAMS = ("apiType", "sidoCode", "sggCode", "schulCode", "schulKndCode", "pbanYr")
+
+
+def call_api(params):
+    """학교알리미 API 호출 (연결 재사용, 재시도 포함)"""
+    return http_client.get_json(
+        f"schoolinfo/apiType={params['apiType']}",
+        BASE_URL,
+        params=params,
+        limiter=schoolinfo_limiter,
+        timeout=10,
+    )
+
+
+def year_ttl(year):
+    """공시 연도별 캐시 유효 기간 (지난 연도는 만료 없음)"""
+    return None if int(year) < date.today().year else SCHOOLINFO_CACHE_TTL_HOURS * 3600
+
+
+def call_api_cached(params, year=None):
+    """
+    연도별 공시 자료 조회 (apiType, sidoCode, sggCode, schulCode, schulKndCode, pbanYr로 캐시)
+    
+    올해 자료는 TTL로 저장되므로, 해가 바뀌어 지난 연도가 된 자료는 한 번 더 받은 뒤 만료 없이 남는다.
+    오프라인 모드(--offline)에서 캐시에 없으면 요청하지 않고 CacheMiss.
+    
+    Args:
+        year: 요청에 pbanYr가 없는 조회(기본정보)의 캐시 연도
+    """
+    # 요청에 있는 파라미터만 키에 넣음 (학생수/졸업생 진로현황은 예전 캐시 키와 같음)
+    year = params.get("pbanYr", year)
+    key = {name: params[name] for name in CACHE_KEY_PARAMS if name in params}
+    key["pbanYr"] = year
+    if schoolinfo_cache:
+        cached = schoolinfo_cache.get("schoolinfo", key)
+        if cached is not None:
+            return cached
+    
+    data = call_api(params)
+    
+    # 오류 응답(list 없음)은 저장하지 않음
+    if schoolinfo_cache and "list" in data:
+        schoolinfo_cache.put("schoolinfo", key, data, ttl=year_ttl(year))
+    return data
+
 
 # 학교급 코드
 SCHOOL_KIND = {
@@ -183,8 +262,8 @@ SIDO_SGG_CODES = {
 }
 
 
-def fetch_schools_basic(sido_code, sgg_code, school_kind_code):
-    """학교 기본정보 조회 (apiType=0)"""
+def fetch_schools_basic(sido_code, sgg_code, school_kind_code, year=str(SCHOOLINFO_YEAR)):
+    """학교 기본정보 조회 (apiType=0, 공시 연도별로 캐시)"""
     params = {
         "apiKey": SCHOOLINFO_API_KEY,
         "apiType": "0",
@@ -194,15 +273,14 @@ def fetch_schools_basic(sido_code, sgg_code, school_kind_code):
     }
     
     try:
-        response = requests.get(BASE_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = call_api_cached(params, year)
         return data.get("list", [])
     except Exception as e:
-        return []
+        print(f"(오류: {e})", end=" ")
+        return None
 
 
-def fetch_student_count(school_code, school_kind_code, year="2025"):
+def fetch_student_count(school_code, school_kind_code, year=str(SCHOOLINFO_YEAR)):
     """학생수 조회 (apiType=10) - 남녀별 학생수 포함"""
     params = {
         "apiKey": SCHOOLINFO_API_KEY,
@@ -212,59 +290,56 @@ def fetch_student_count(school_code, school_kind_code, year="2025"):
         "pbanYr": year,
     }
     
-    try:
-        response = requests.get(BASE_URL, params=params, timeout=10)
-        data = response.json()
-        if "list" in data and len(data["list"]) > 0:
-            raw = data["list"][0]
-            
-            # 학년별 남녀 학생수 계산
-            result = {
-                "total": raw.get("STDNT_SUM", 0),
-            }
-            
-            if school_kind_code == "03":  # 중학교
-                # 남학생: MAN_STDNT_31, MAN_STDNT_32, MAN_STDNT_33
-                # 여학생: WOMAN_STDNT_31, WOMAN_STDNT_32, WOMAN_STDNT_33
-                male_total = (
-                    int(raw.get("MAN_STDNT_31", 0) or 0) +
-                    int(raw.get("MAN_STDNT_32", 0) or 0) +
-                    int(raw.get("MAN_STDNT_33", 0) or 0)
-                )
-                female_total = (
-                    int(raw.get("WOMAN_STDNT_31", 0) or 0) +
-                    int(raw.get("WOMAN_STDNT_32", 0) or 0) +
-                    int(raw.get("WOMAN_STDNT_33", 0) or 0)
-                )
-                result["male"] = male_total
-                result["female"] = female_total
-                result["g1"] = raw.get("STDNT_SUM_31", 0)
-                result["g2"] = raw.get("STDNT_SUM_32", 0)
-                result["g3"] = raw.get("STDNT_SUM_33", 0)
-            else:  # 고등학교
-                male_total = (
-                    int(raw.get("MAN_STDNT_41", 0) or 0) +
-                    int(raw.get("MAN_STDNT_42", 0) or 0) +
-                    int(raw.get("MAN_STDNT_43", 0) or 0)
-                )
-                female_total = (
-                    int(raw.get("WOMAN_STDNT_41", 0) or 0) +
-                    int(raw.get("WOMAN_STDNT_42", 0) or 0) +
-                    int(raw.get("WOMAN_STDNT_43", 0) or 0)
-                )
-                result["male"] = male_total
-                result["female"] = female_total
-                result["g1"] = raw.get("STDNT_SUM_41", 0)
-                result["g2"] = raw.get("STDNT_SUM_42", 0)
-                result["g3"] = raw.get("STDNT_SUM_43", 0)
-            
-            return result
-        return None
-    except:
-        return None
+    # 요청 오류는 호출한 쪽으로 (목록이 없는 응답만 None)
+    data = call_api_cached(params)
+    if "list" in data and len(data["list"]) > 0:
+        raw = data["list"][0]
+        
+        # 학년별 남녀 학생수 계산
+        result = {
+            "total": raw.get("STDNT_SUM", 0),
+        }
+        
+        if school_kind_code == "03":  # 중학교
+            # 남학생: MAN_STDNT_31, MAN_STDNT_32, MAN_STDNT_33
+            # 여학생: WOMAN_STDNT_31, WOMAN_STDNT_32, WOMAN_STDNT_33
+            male_total = (
+                int(raw.get("MAN_STDNT_31", 0) or 0) +
+                int(raw.get("MAN_STDNT_32", 0) or 0) +
+                int(raw.get("MAN_STDNT_33", 0) or 0)
+            )
+            female_total = (
+                int(raw.get("WOMAN_STDNT_31", 0) or 0) +
+                int(raw.get("WOMAN_STDNT_32", 0) or 0) +
+                int(raw.get("WOMAN_STDNT_33", 0) or 0)
+            )
+            result["male"] = male_total
+            result["female"] = female_total
+            result["g1"] = raw.get("STDNT_SUM_31", 0)
+            result["g2"] = raw.get("STDNT_SUM_32", 0)
+            result["g3"] = raw.get("STDNT_SUM_33", 0)
+        else:  # 고등학교
+            male_total = (
+                int(raw.get("MAN_STDNT_41", 0) or 0) +
+                int(raw.get("MAN_STDNT_42", 0) or 0) +
+                int(raw.get("MAN_STDNT_43", 0) or 0)
+            )
+            female_total = (
+                int(raw.get("WOMAN_STDNT_41", 0) or 0) +
+                int(raw.get("WOMAN_STDNT_42", 0) or 0) +
+                int(raw.get("WOMAN_STDNT_43", 0) or 0)
+            )
+            result["male"] = male_total
+            result["female"] = female_total
+            result["g1"] = raw.get("STDNT_SUM_41", 0)
+            result["g2"] = raw.get("STDNT_SUM_42", 0)
+            result["g3"] = raw.get("STDNT_SUM_43", 0)
+        
+        return result
+    return None
 
 
-def fetch_graduation_info(school_code, year="2024"):
+def fetch_graduation_info(school_code, year=str(SCHOOLINFO_YEAR - 1)):
     """졸업생 진로현황 조회 - 고등학교만 (apiType=51)"""
     params = {
         "apiKey": SCHOOLINFO_API_KEY,
@@ -274,14 +349,11 @@ def fetch_graduation_info(school_code, year="2024"):
         "pbanYr": year,
     }
     
-    try:
-        response = requests.get(BASE_URL, params=params, timeout=10)
-        data = response.json()
-        if "list" in data and len(data["list"]) > 0:
-            return data["list"][0]
-        return None
-    except:
-        return None
+    # 요청 오류는 호출한 쪽으로 (목록이 없는 응답만 None)
+    data = call_api_cached(params)
+    if "list" in data and len(data["list"]) > 0:
+        return data["list"][0]
+    return None
 
 
 def get_coed_type(code):
@@ -335,123 +407,262 @@ def get_school_type(school):
     return "일반고"
 
 
+def fetch_school_details(school_info, school_kind_code):
+    """
+    학교 하나의 학생수(남녀별), 고등학교는 졸업생 진로현황까지 조회해서 school_info에 추가
+    
+    Returns:
+        (school_info, 실패한 조회의 오류 리스트) - 응답에 목록이 없는 것은 실패가 아님
+    """
+    school_code = school_info["school_code"]
+    errors = []
+    
+    # 학생수 조회 (남녀별)
+    try:
+        student_data = fetch_student_count(school_code, school_kind_code)
+    except Exception as e:
+        student_data = None
+        errors.append(f"학생수 {school_code}: {e}")
+    if student_data:
+        school_info["student_total"] = student_data.get("total", 0)
+        school_info["student_male"] = student_data.get("male", 0)
+        school_info["student_female"] = student_data.get("female", 0)
+        school_info["student_g1"] = student_data.get("g1", 0)
+        school_info["student_g2"] = student_data.get("g2", 0)
+        school_info["student_g3"] = student_data.get("g3", 0)
+    
+    # 고등학교는 졸업생 진로현황도 조회
+    if school_kind_code == SCHOOL_KIND["고등학교"]:
+        try:
+            grad_data = fetch_graduation_info(school_code)
+        except Exception as e:
+            grad_data = None
+            errors.append(f"졸업생 진로 {school_code}: {e}")
+        if grad_data:
+            school_info["grad_male"] = grad_data.get("MAN_SUM", 0)
+            school_info["grad_female"] = grad_data.get("WOMAN_SUM", 0)
+            school_info["advancement_rate"] = grad_data.get("TOTAL_RATE", "")
+    
+    return school_info, errors
+
+
+def basic_school_infos(schools, sido_name, sgg_name, school_kind_code):
+    """기본정보 조회 결과 → 학교 정보 리스트 (폐교 제외, 조회 순서 유지)"""
+    is_high_school = school_kind_code == SCHOOL_KIND["고등학교"]
+    
+    region_schools = []
+    for school in schools:
+        # 폐교 제외
+        if school.get("CLOSE_YN") == "Y":
+            continue
+        
+        school_info = {
+            "name": school.get("SCHUL_NM", ""),
+            "coed_type": get_coed_type(school.get("COEDU_SC_CODE", "")),
+            "found_type": school.get("FOND_SC_CODE", ""),
+            "sido": sido_name,
+            "sgg": sgg_name,
+            "school_code": school.get("SCHUL_CODE", ""),
+        }
+        
+        # 고등학교는 학교유형 추가 (인문계/실업계/자사고 등)
+        if is_high_school:
+            school_info["school_type"] = get_school_type(school)
+        
+        region_schools.append(school_info)
+    
+    return region_schools
+
+
+def timed(func, *args):
+    """(결과, 걸린 시간 초) - 스레드 풀에서 호출별 소요 시간을 재기 위해"""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
 def fetch_all_schools(school_type):
-    """전국 학교 정보 수집"""
+    """
+    전국 학교 정보 수집 (--resume이면 완료된 시군구는 건너뜀)
+    
+    시군구별 기본정보 조회와 학교별 상세 조회를 모두 한 스레드 풀(MAX_WORKERS개)에 맡기고,
+    시군구마다 상세 조회가 모두 끝나는 대로 저널에 기록한다 (중단돼도 끝난 시군구는 남음).
+    조회에 실패한 학교가 있는 시군구는 기록하지 않고 결과에서도 빼서(기존 핀의 학교 정보는 그대로),
+    저널을 남겨 --resume으로 다시 조회한다.
+    결과는 시군구 순서, 시군구 안에서는 기본정보 조회 순서대로 모은다.
+    """
     school_kind_code = SCHOOL_KIND[school_type]
-    all_schools = []
-    is_high_school = school_type == "고등학교"
+    failed_regions = 0
+    journal = open_journal(f"{school_type}_schoolinfo_{SCHOOLINFO_YEAR}")
+    
+    print(f"\n🏫 {school_type} 정보 수집 중... (동시 요청 {MAX_WORKERS}개)")
     
-    print(f"\n🏫 {school_type} 정보 수집 중...")
+    regions = [
+        (sido_name, sido_info["code"], sgg_name, sgg_code)
+        for sido_name, sido_info in SIDO_SGG_CODES.items()
+        for sgg_name, sgg_code in sido_info["sgg"].items()
+    ]
+    progress = telemetry.Progress(len(regions))
     
-    total_regions = sum(len(info["sgg"]) for info in SIDO_SGG_CODES.values())
-    current = 0
+    # 시군구 → 학교 목록 (이전 실행에서 끝낸 시군구 포함)
+    region_schools = {}
+    for sido_name, _, sgg_name, _ in regions:
+        unit = (school_type, sido_name, sgg_name)
+        if journal.get(unit) is not None:
+            region_schools[unit] = journal.get(unit)
+            print(f"  {sido_name} {sgg_name} → {len(region_schools[unit])}개 (이전 실행, {progress.advance()})")
     
-    for sido_name, sido_info in SIDO_SGG_CODES.items():
-        sido_code = sido_info["code"]
+    def finish(unit, seconds, futures):
+        """시군구의 상세 조회가 모두 끝남: 실패가 없으면 바로 저널에 기록 (성공 여부 반환)"""
+        schools = []
+        errors = []
+        for future in futures:
+            (school_info, detail_errors), detail_seconds = future.result()
+            schools.append(school_info)
+            errors.extend(detail_errors)
+            seconds += detail_seconds
+        if errors:
+            print(f"  {unit[1]} {unit[2]} → 상세 조회 실패 {len(errors)}건 (오류: {errors[0]}) ({progress.advance()})")
+            return False
+        journal.record(unit, schools)
+        region_schools[unit] = schools
+        telemetry.record_region(f"{school_type} {unit[1]} {unit[2]}", len(schools), seconds)
+        print(f"  {unit[1]} {unit[2]} → {len(schools)}개 ({progress.advance()})")
+        return True
+    
+    with ThreadPoolExecutor(max_workers=max(1, MAX_WORKERS)) as executor:
+        # 끝내지 못한 시군구의 기본정보 조회를 모두 맡기고, 오는 대로 학교별 상세 조회를 맡긴다
+        pending = {}
+        for sido_name, sido_code, sgg_name, sgg_code in regions:
+            unit = (school_type, sido_name, sgg_name)
+            if unit not in region_schools:
+                future = executor.submit(timed, fetch_schools_basic, sido_code, sgg_code, school_kind_code)
+                pending[future] = unit
         
-        for sgg_name, sgg_code in sido_info["sgg"].items():
-            current += 1
-            print(f"  [{current}/{total_regions}] {sido_name} {sgg_name}...", end=" ", flush=True)
-            
-            schools = fetch_schools_basic(sido_code, sgg_code, school_kind_code)
-            region_count = 0
-            
-            for school in schools:
-                # 폐교 제외
-                if school.get("CLOSE_YN") == "Y":
-                    continue
-                
-                school_code = school.get("SCHUL_CODE", "")
-                
-                school_info = {
-                    "name": school.get("SCHUL_NM", ""),
-                    "coed_type": get_coed_type(school.get("COEDU_SC_CODE", "")),
-                    "found_type": school.get("FOND_SC_CODE", ""),
-                    "sido": sido_name,
-                    "school_code": school_code,
-                }
-                
-                # 고등학교는 학교유형 추가 (인문계/실업계/자사고 등)
-                if is_high_school:
-                    school_info["school_type"] = get_school_type(school)
-                
-                # 학생수 조회 (남녀별)
-                student_data = fetch_student_count(school_code, school_kind_code)
-                if student_data:
-                    school_info["student_total"] = student_data.get("total", 0)
-                    school_info["student_male"] = student_data.get("male", 0)
-                    school_info["student_female"] = student_data.get("female", 0)
-                    school_info["student_g1"] = student_data.get("g1", 0)
-                    school_info["student_g2"] = student_data.get("g2", 0)
-                    school_info["student_g3"] = student_data.get("g3", 0)
-                
-                # 고등학교는 졸업생 진로현황도 조회
-                if is_high_school:
-                    grad_data = fetch_graduation_info(school_code)
-                    if grad_data:
-                        school_info["grad_male"] = grad_data.get("MAN_SUM", 0)
-                        school_info["grad_female"] = grad_data.get("WOMAN_SUM", 0)
-                        school_info["advancement_rate"] = grad_data.get("TOTAL_RATE", "")
-                
-                all_schools.append(school_info)
-                region_count += 1
-                time.sleep(0.05)  # API 부하 방지
-            
-            print(f"→ {region_count}개")
-            time.sleep(0.1)
+        # 시군구 → [기본정보 조회 시간, 상세 조회 futures, 남은 상세 조회 수]
+        details = {}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                unit = pending.pop(future)
+                if unit in details:
+                    details[unit][2] -= 1
+                else:
+                    schools, seconds = future.result()
+                    if schools is None:
+                        failed_regions += 1
+                        print(f"  {unit[1]} {unit[2]} → 실패 ({progress.advance()})")
+                        continue
+                    futures = [
+                        executor.submit(timed, fetch_school_details, school_info, school_kind_code)
+                        for school_info in basic_school_infos(schools, unit[1], unit[2], school_kind_code)
+                    ]
+                    details[unit] = [seconds, futures, len(futures)]
+                    pending.update((detail, unit) for detail in futures)
+                seconds, futures, left = details[unit]
+                if left == 0 and not finish(unit, seconds, futures):
+                    failed_regions += 1
+    
+    if failed_regions:
+        print(f"⚠️ 조회에 실패한 시군구 {failed_regions}개 (--resume으로 다시 시도할 수 있습니다)")
+    journal.close(completed=failed_regions == 0)
     
+    all_schools = []
+    for sido_name, _, sgg_name, _ in regions:
+        all_schools.extend(region_schools.get((school_type, sido_name, sgg_name), []))
     return all_schools
 
 
-def merge_with_existing_data(school_info_list, existing_data_path, output_path):
-    """기존 위치 데이터와 병합"""
+# 유사도를 잴 때 빼는 학교급 접미사 (공통 부분 때문에 다른 학교가 비슷해 보이지 않도록)
+SCHOOL_SUFFIX = re.compile(r"(?:남자|여자)?(?:초등|중|고등)?학교$")
+
+
+def school_name_stem(name):
+    """학교 이름에서 학교급 접미사를 뺀 부분 (성남여자고등학교 → 성남)"""
+    return SCHOOL_SUFFIX.sub("", name)
+
+
+def set_school_fields(pin, info, stats=None):
+    """핀에 학교 상세 정보 필드 추가 (stats가 있으면 숫자는 연도별 저장소의 최근 값 + 추이)"""
+    pin["coed_type"] = info.get("coed_type", "")
+    pin["found_type"] = info.get("found_type", "")
+    pin["student_total"] = info.get("student_total", 0)
+    pin["student_male"] = info.get("student_male", 0)
+    pin["student_female"] = info.get("student_female", 0)
+    pin["student_g1"] = info.get("student_g1", 0)
+    pin["student_g2"] = info.get("student_g2", 0)
+    pin["student_g3"] = info.get("student_g3", 0)
+    
+    # 고등학교 추가 정보 (학교유형, 졸업생 진로)
+    if "school_type" in info:
+        pin["school_type"] = info.get("school_type", "")
+    if "grad_male" in info:
+        pin["grad_male"] = info.get("grad_male", 0)
+        pin["grad_female"] = info.get("grad_female", 0)
+        pin["advancement_rate"] = info.get("advancement_rate", "")
+    
+    if stats is not None and info.get("school_code"):
+        pin.update(stats.pin_fields(info["school_code"]))
+
+
+def apply_school_info(pins, school_info_list, stats=None):
+    """
+    핀에 학교 상세 정보 추가 - rebuild.py에서도 사용
+    
+    (학교명, 시도)가 같은 학교를 찾고, 같은 이름이 여럿이면 시군구로 가리며,
+    못 찾으면 같은 시도에서 이름이 비슷한 학교를 찾는다 (join.py).
+    stats(SchoolStats)를 주면 학생수·진학률은 저장소의 최근 값과 연도별 추이(student_trend 등)로 넣는다.
+    
+    Returns:
+        매칭 리포트 (summary, unmatched, fuzzy, matches)
+    """
+    matches = join_records(
+        pins,
+        school_info_list,
+        item_key=lambda pin: (pin.get("title", ""), extract_region(pin.get("description", "")), pin.get("description", "")),
+        record_key=lambda info: (info["name"], extract_region(info.get("sido", "")), info.get("sgg", "")),
+        stem=school_name_stem,
+    )
+    for match in matches:
+        if match.record is not None:
+            set_school_fields(match.item, match.record, stats)
+    
+    return match_report(
+        matches,
+        describe_item=lambda pin: {"title": pin.get("title", ""), "address": pin.get("description", "")},
+        describe_record=lambda info: {
+            "name": info["name"],
+            "sido": info.get("sido", ""),
+            "sgg": info.get("sgg", ""),
+            "school_code": info.get("school_code", ""),
+        },
+    )
+
+
+def merge_with_existing_data(school_info_list, existing_data_path, output_path, report_name, stats=None):
+    """기존 위치 데이터와 병합 (매칭 리포트는 작업 폴더의 {report_name}_match_report.json)"""
     
     with open(existing_data_path, 'r', encoding='utf-8') as f:
         existing_data = json.load(f)
     
-    # 학교명으로 매칭
-    school_info_map = {}
-    for info in school_info_list:
-        name_key = info["name"].replace(" ", "").strip()
-        school_info_map[name_key] = info
-    
-    matched_count = 0
-    for pin in existing_data.get("pins", []):
-        title = pin.get("title", "").replace(" ", "").strip()
-        
-        if title in school_info_map:
-            info = school_info_map[title]
-            pin["coed_type"] = info.get("coed_type", "")
-            pin["found_type"] = info.get("found_type", "")
-            pin["student_total"] = info.get("student_total", 0)
-            pin["student_male"] = info.get("student_male", 0)
-            pin["student_female"] = info.get("student_female", 0)
-            pin["student_g1"] = info.get("student_g1", 0)
-            pin["student_g2"] = info.get("student_g2", 0)
-            pin["student_g3"] = info.get("student_g3", 0)
-            
-            # 고등학교 추가 정보 (학교유형, 졸업생 진로)
-            if "school_type" in info:
-                pin["school_type"] = info.get("school_type", "")
-            if "grad_male" in info:
-                pin["grad_male"] = info.get("grad_male", 0)
-                pin["grad_female"] = info.get("grad_female", 0)
-                pin["advancement_rate"] = info.get("advancement_rate", "")
-            
-            matched_count += 1
+    report = apply_school_info(existing_data.get("pins", []), school_info_list, stats)
     
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(existing_data, f, ensure_ascii=False, indent=2)
     
-    print(f"\n✅ 매칭 완료: {matched_count}/{len(existing_data.get('pins', []))}개")
+    summary = report["summary"]
+    print(f"\n✅ 매칭 완료: {summary['matched']}/{summary['items']}개")
+    print(f"   정확히 일치 {summary.get('exact', 0)}, 시군구로 구분 {summary.get('locality', 0)}, "
+          f"유사한 이름 {summary.get('fuzzy', 0)}, 같은 이름이 여럿 {summary.get('ambiguous', 0)}, 없음 {summary.get('none', 0)}")
     print(f"💾 저장 완료: {output_path}")
+    save_report(report, f"{report_name}_match_report.json")
     
-    return matched_count
+    return summary["matched"]
 
 
 def save_raw_data(schools, filename):
     """원본 데이터 저장"""
-    filepath = os.path.join(os.path.dirname(__file__), filename)
+    filepath = WORK_DIR / filename
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(schools, f, ensure_ascii=False, indent=2)
     print(f"📋 원본 데이터 저장: {filepath}")
@@ -464,10 +675,12 @@ if __name__ == "__main__":
         print("   API 키는 https://www.schoolinfo.go.kr 에서 발급받을 수 있습니다.")
         exit(1)
     
+    telemetry.start()
     print("=" * 60)
     print("🏫 학교 상세 정보 수집 (학교알리미 API)")
     print("=" * 60)
     print("수집 항목: 남/녀/공학, 설립유형, 학생수")
+    print(f"공시 연도: 학생수 {SCHOOLINFO_YEAR}, 졸업생 진로 {SCHOOLINFO_YEAR - 1}")
     print("고등학교 추가: 졸업생 성별, 진학률")
     print("=" * 60)
     
@@ -481,26 +694,38 @@ if __name__ == "__main__":
     print(f"\n📊 고등학교 총 {len(high_schools)}개 수집")
     save_raw_data(high_schools, "고등학교_schoolinfo_raw.json")
     
-    # 기존 데이터와 병합
-    data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+    # 연도별 저장소에 올해 값 추가 (같은 연도를 다시 수집하면 교체)
+    stats = SchoolStats.load()
+    stats.record(middle_schools, SCHOOLINFO_YEAR)
+    stats.record(high_schools, SCHOOLINFO_YEAR)
+    stats.save()
     
+    # 기존 데이터와 병합
     print("\n" + "=" * 60)
     print("📝 기존 데이터와 병합 중...")
     print("=" * 60)
     
     merge_with_existing_data(
         middle_schools,
-        os.path.join(data_dir, "1.json"),
-        os.path.join(data_dir, "1.json")
+        DATA_DIR / "1.json",
+        DATA_DIR / "1.json",
+        "중학교",
+        stats,
     )
     
     merge_with_existing_data(
         high_schools,
-        os.path.join(data_dir, "9.json"),
-        os.path.join(data_dir, "9.json")
+        DATA_DIR / "9.json",
+        DATA_DIR / "9.json",
+        "고등학교",
+        stats,
     )
     
     print("\n" + "=" * 60)
     print("✅ 완료!")
     print("=" * 60)
+    if schoolinfo_cache:
+        print(f"   {schoolinfo_cache.stats()}")
+    http_client.print_stats()
+    telemetry.write_report("학교정보", WORK_DIR, {"middle_schools": len(middle_schools), "high_schools": len(high_schools)})
     print("\n데이터 출처: 학교알리미 (https://www.schoolinfo.go.kr)")
@@ -2,17 +2,16 @@
 """지하철/국철역 위치 수집"""
 
 import json
-import os
 import re
-import math
-import requests
-from dotenv import load_dotenv
-
-load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
+import time
+import http_client
+import telemetry
+from common import DATA_DIR, WORK_DIR, save_quota_at_exit, search_keyword
+from spatial import cluster_points
+from rules import compile_rules
 
 NAME = "지하철역"
 LIST_ID = 6
-API_KEY = os.environ.get('KAKAO_API_KEY')
 
 # 검색 쿼리 목록 (지역 + 호선별로 세분화)
 SEARCH_QUERIES = [
@@ -38,21 +37,26 @@ SEARCH_QUERIES = [
 
 def fetch_stations():
     """지하철역 검색"""
-    url = 'https://dapi.kakao.com/v2/local/search/keyword.json'
-    headers = {'Authorization': f'KakaoAK {API_KEY}'}
-    
+    save_quota_at_exit()
     all_results = []
     seen_ids = set()
+    progress = telemetry.Progress(len(SEARCH_QUERIES))
     
     for query in SEARCH_QUERIES:
         page = 1
+        started = time.perf_counter()
+        found_before = len(seen_ids)
+        raw = 0
         
         while page <= 45:  # max 45 pages
-            params = {'query': query, 'size': 15, 'page': page}
-            response = requests.get(url, headers=headers, params=params)
-            data = response.json()
+            try:
+                data = search_keyword(query, page)
+            except Exception as e:
+                print(f"  오류 발생 ({query}, page {page}): {e}")
+                break
             
             for doc in data.get('documents', []):
+                raw += 1
                 if doc['id'] not in seen_ids:
                     seen_ids.add(doc['id'])
                     all_results.append(doc)
@@ -61,29 +65,32 @@ def fetch_stations():
                 break
             page += 1
         
-        print(f"  {query}: {len(seen_ids)}개 누적")
+        telemetry.record_region(query, len(seen_ids) - found_before, time.perf_counter() - started, raw=raw)
+        print(f"  {query}: {len(seen_ids)}개 누적 ({progress.advance()})")
     
     return all_results
 
 
+# 지역 호선 패턴 (부산4호선, 대구3호선 등)
+REGIONAL_LINE_PATTERNS = [
+    (re.compile(r'부산(\d)호선'), '부산{}호선'),
+    (re.compile(r'대구(\d)호선'), '대구{}호선'),
+    (re.compile(r'대전(\d)호선'), '대전{}호선'),
+    (re.compile(r'광주(\d)호선'), '광주{}호선'),
+    (re.compile(r'인천(\d)호선'), '인천{}호선'),
+]
+
+
 def extract_lines(name, category):
     """역 이름이나 카테고리에서 호선 정보 추출"""
     lines = []
     text = name + ' ' + category
     
-    # 지역 호선 먼저 확인 (부산4호선, 대구3호선 등)
-    regional_patterns = [
-        (r'부산(\d)호선', '부산{}호선'),
-        (r'대구(\d)호선', '대구{}호선'),
-        (r'대전(\d)호선', '대전{}호선'),
-        (r'광주(\d)호선', '광주{}호선'),
-        (r'인천(\d)호선', '인천{}호선'),
-    ]
-    
     regional_line_nums = set()  # 지역 호선에서 사용된 번호 기록
     
-    for pattern, format_str in regional_patterns:
-        matches = re.findall(pattern, text)
+    # 지역 호선 먼저 확인 (부산4호선, 대구3호선 등)
+    for pattern, format_str in REGIONAL_LINE_PATTERNS:
+        matches = pattern.findall(text)
         for num in matches:
             line_name = format_str.format(num)
             if line_name not in lines:
@@ -115,25 +122,19 @@ def extract_lines(name, category):
     return lines
 
 
-def filter_station(doc):
-    """지하철/전철역만 필터링"""
-    name = doc.get('place_name', '')
-    category = doc.get('category_name', '')
-    
-    # 지하철/전철 카테고리인 경우
-    if '지하철' in category or '전철' in category:
-        # 제외 키워드
-        exclude = ['주차장', '화장실', '편의점', '보관함', '출입구', '환승', '대합실', '매표소', '출구']
-        for ex in exclude:
-            if ex in name:
-                return False
-        return True
-    
+# 지하철/전철역만 필터링
+STATION_RULES = [
+    # 지하철/전철 카테고리인 경우 (제외 키워드가 있으면 제외)
+    ("reject", {"all": [
+        {"category": ["지하철", "전철"]},
+        {"name": ['주차장', '화장실', '편의점', '보관함', '출입구', '환승', '대합실', '매표소', '출구']},
+    ]}),
+    ("accept", {"category": ["지하철", "전철"]}),
     # 역 이름으로 끝나는 경우
-    if name.endswith('역') and ('교통' in category or '철도' in category):
-        return True
-    
-    return False
+    ("accept", {"all": [{"name_endswith": ["역"]}, {"category": ["교통", "철도"]}]}),
+]
+
+filter_station = compile_rules(STATION_RULES, default="reject", name="filter_station")
 
 
 def get_region(doc):
@@ -143,104 +144,63 @@ def get_region(doc):
     return parts[0] if parts else '기타'
 
 
-def haversine_distance(lat1, lng1, lat2, lng2):
-    """두 좌표 간 거리 계산 (km)"""
-    R = 6371  # 지구 반경 (km)
-    
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lng = math.radians(lng2 - lng1)
-    
-    a = math.sin(delta_lat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lng/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    
-    return R * c
+# 역 이름 뒤에 붙은 노선 이름 ("고촌역 김포골드라인" -> "고촌역", "서울역 1호선" -> "서울역")
+LINE_SUFFIX_PATTERN = re.compile(
+    r'\s+(?:김포골드라인|에버라인|의정부경전철|신분당선|경의중앙선|공항철도|신림선|우이신설선|서해선|경춘선|경강선|분당선|수인분당선'
+    r'|부산\d호선|대구\d호선|대전\d호선|광주\d호선|인천\d호선'
+    r'|\d호선'
+    r'|GTX-?[A-Z]?'
+    r'|동해선'
+    r'|부산김해경전철)'
+)
+
+# 이 거리 안에서 이어지는 같은 이름의 역은 하나의 환승역으로 병합 (m)
+MERGE_DISTANCE_M = 500
 
 
 def normalize_station_name(name):
     """역 이름에서 호선 정보 제거하여 정규화"""
-    # "고촌역 김포골드라인" -> "고촌역"
-    # "서울역 1호선" -> "서울역"
-    patterns = [
-        r'\s+(김포골드라인|에버라인|의정부경전철|신분당선|경의중앙선|공항철도|신림선|우이신설선|서해선|경춘선|경강선|분당선|수인분당선)',
-        r'\s+(부산\d호선|대구\d호선|대전\d호선|광주\d호선|인천\d호선)',
-        r'\s+\d호선',
-        r'\s+GTX-?[A-Z]?',
-        r'\s+동해선',
-        r'\s+부산김해경전철',
-    ]
-    
-    result = name
-    for pattern in patterns:
-        result = re.sub(pattern, '', result)
-    
-    return result.strip()
+    return LINE_SUFFIX_PATTERN.sub('', name).strip()
 
 
 def merge_transfer_stations(pins):
-    """가까운 거리에 있는 같은 이름의 역을 환승역으로 병합"""
-    MERGE_DISTANCE_KM = 0.5  # 500m 이내만 병합
+    """
+    가까운 거리에 있는 같은 이름의 역을 환승역으로 병합
     
-    # 정규화된 이름으로 그룹화
-    name_groups = {}
+    격자 색인으로 주변 역만 비교하고 union-find로 이어진 역을 한 묶음으로 만든다.
+    (A-B, B-C가 500m 안이면 A-C가 멀어도 한 역) 입력 순서와 관계없이 결과가 같다.
+    """
     for pin in pins:
-        normalized = normalize_station_name(pin['title'])
-        if normalized not in name_groups:
-            name_groups[normalized] = []
-        name_groups[normalized].append(pin)
+        pin['title'] = normalize_station_name(pin['title'])
     
-    merged_pins = []
+    # 입력 순서와 관계없는 기준 순서
+    ordered = sorted(pins, key=lambda p: (p['title'], p['lat'], p['lng'], p['description'] or '', p.get('url') or ''))
+    clusters = cluster_points(
+        [(pin['lat'], pin['lng']) for pin in ordered],
+        MERGE_DISTANCE_M,
+        key=lambda i: ordered[i]['title'],
+    )
     
-    for name, group in name_groups.items():
-        if len(group) == 1:
-            # 단일 역
-            pin = group[0]
-            pin['title'] = name  # 정규화된 이름 사용
-            merged_pins.append(pin)
-        else:
-            # 여러 개의 같은 이름 역 - 거리 기반 클러스터링
-            clusters = []
-            
-            for pin in group:
-                added_to_cluster = False
-                
-                for cluster in clusters:
-                    # 클러스터의 첫 번째 역과 거리 비교
-                    dist = haversine_distance(
-                        cluster[0]['lat'], cluster[0]['lng'],
-                        pin['lat'], pin['lng']
-                    )
-                    
-                    if dist < MERGE_DISTANCE_KM:
-                        cluster.append(pin)
-                        added_to_cluster = True
-                        break
-                
-                if not added_to_cluster:
-                    clusters.append([pin])
-            
-            # 각 클러스터를 하나의 역으로 병합
-            for cluster in clusters:
-                if len(cluster) == 1:
-                    pin = cluster[0]
-                    pin['title'] = name
-                    merged_pins.append(pin)
-                else:
-                    # 환승역 - 노선 정보 합치기
-                    all_lines = []
-                    for pin in cluster:
-                        if pin['description']:
-                            for line in pin['description'].split(', '):
-                                if line and line not in all_lines:
-                                    all_lines.append(line)
-                    
-                    # 첫 번째 역 정보를 기준으로 병합
-                    merged = cluster[0].copy()
-                    merged['title'] = name
-                    merged['description'] = ', '.join(all_lines)
-                    merged_pins.append(merged)
+    merged_pins = []
+    for cluster in clusters:
+        members = [ordered[i] for i in cluster]
+        if len(members) == 1:
+            merged_pins.append(members[0])
+            continue
+        
+        # 환승역 - 노선 정보 합치기 (첫 번째 역 정보를 기준으로 병합)
+        all_lines = []
+        for pin in members:
+            if pin['description']:
+                for line in pin['description'].split(', '):
+                    if line and line not in all_lines:
+                        all_lines.append(line)
+        
+        merged = members[0].copy()
+        merged['description'] = ', '.join(all_lines)
+        merged_pins.append(merged)
     
+    merged_pins.sort(key=lambda p: (p['title'], p['lat'], p['lng']))
     return merged_pins
 
 
@@ -268,26 +228,14 @@ def convert_to_pins(docs):
     return pins
 
 
-def main():
-    print(f"🚇 {NAME} 데이터 수집 시작...")
-    
-    # 1. Fetch
-    raw = fetch_stations()
-    print(f"📥 검색 결과: {len(raw)}개")
-    
-    # 2. Save raw
-    raw_path = os.path.join(os.path.dirname(__file__), f'{NAME}_raw.json')
-    with open(raw_path, 'w', encoding='utf-8') as f:
-        json.dump(raw, f, ensure_ascii=False, indent=2)
-    
-    # 3. Filter
-    filtered = [doc for doc in raw if filter_station(doc)]
+def build_pins(raw):
+    """검색 결과 → 핀 (필터, 변환, 중복 제거, 환승역 병합) - rebuild.py에서도 사용"""
+    filtered = filter_station.filter_docs(raw)
     print(f"🔍 필터링 후: {len(filtered)}개")
     
-    # 4. Convert to pins
     pins = convert_to_pins(filtered)
     
-    # 5. Remove duplicates by title + address
+    # 제목 + 주소 기준 중복 제거
     seen = set()
     unique_pins = []
     for pin in pins:
@@ -298,16 +246,36 @@ def main():
     
     print(f"✨ 중복 제거 후: {len(unique_pins)}개")
     
-    # 6. Merge transfer stations (within 500m)
+    # 500m 안의 같은 이름 역은 환승역으로 병합
     merged_pins = merge_transfer_stations(unique_pins)
     print(f"🔄 환승역 병합 후: {len(merged_pins)}개")
+    return merged_pins
+
+
+def main():
+    print(f"🚇 {NAME} 데이터 수집 시작...")
+    telemetry.start()
+    
+    # 1. Fetch
+    raw = fetch_stations()
+    print(f"📥 검색 결과: {len(raw)}개")
+    
+    # 2. Save raw
+    raw_path = WORK_DIR / f'{NAME}_raw.json'
+    with open(raw_path, 'w', encoding='utf-8') as f:
+        json.dump(raw, f, ensure_ascii=False, indent=2)
+    
+    # 3~6. Filter, convert, dedup, merge
+    merged_pins = build_pins(raw)
     
     # 7. Save
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', f'{LIST_ID}.json')
+    data_path = DATA_DIR / f'{LIST_ID}.json'
     with open(data_path, 'w', encoding='utf-8') as f:
         json.dump({"pins": merged_pins}, f, ensure_ascii=False, indent=2)
     
     print(f"✅ {data_path} 저장 완료!")
+    http_client.print_stats()
+    telemetry.write_report(NAME, WORK_DIR, {"found": len(raw), "pins": len(merged_pins)})
 
 
 if __name__ == "__main__":
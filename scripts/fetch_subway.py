@@ -2,22 +2,19 @@
 """써브웨이 매장 위치 수집"""
 
 from common import fetch_all, DETAILED_REGIONS
+from rules import compile_rules
 
 NAME = "써브웨이"
 LIST_ID = 3
 KEYWORDS = ["써브웨이"]  # 카카오맵에서는 "써브웨이"로 표기됨
 
 
-def filter_subway(doc):
-    """써브웨이 매장만 필터링"""
-    name = doc.get("place_name", "")
-    category = doc.get("category_name", "")
-    
-    if "써브웨이" not in name and "서브웨이" not in name and "SUBWAY" not in name.upper():
-        return False
-    if "지하철" in category:
-        return False
-    return True
+SUBWAY_RULES = [
+    ("reject", {"not": {"any": [{"name": ["써브웨이", "서브웨이"]}, {"name": ["SUBWAY"], "ignore_case": True}]}}),
+    ("reject", {"category": ["지하철"]}),
+]
+
+filter_subway = compile_rules(SUBWAY_RULES, default="accept", name="filter_subway")
 
 
 if __name__ == "__main__":
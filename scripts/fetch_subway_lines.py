@@ -7,14 +7,13 @@
 
 출력:
     data/subway_lines.json - 지하철 노선 GeoJSON
+    data/lines/subway_z*.json - 줌 구간별 단순화한 노선 (line_bands.py)
 """
 
-import json
 import os
-import urllib.request
-import urllib.parse
 
-OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+from line_bands import BandWriter, print_bands
+from osm_lines import fetch_lines
 
 # Overpass QL 쿼리 - 대한민국 지하철/경전철 노선
 QUERY = """
@@ -29,126 +28,45 @@ out body;
 out skel qt;
 """
 
+# colour 태그가 없는 노선의 색상
+DEFAULT_COLOUR = '#888888'
 
-def fetch_from_overpass():
-    """Overpass API에서 데이터 가져오기"""
-    print("🚇 Overpass API에서 지하철 노선 데이터 가져오는 중...")
-    
-    data = urllib.parse.urlencode({'data': QUERY}).encode('utf-8')
-    req = urllib.request.Request(OVERPASS_URL, data=data)
-    
-    with urllib.request.urlopen(req, timeout=300) as response:
-        result = json.loads(response.read().decode('utf-8'))
-    
-    print(f"   {len(result.get('elements', []))}개 elements 수신")
-    return result
 
-
-def process_osm_data(data):
-    """OSM 데이터를 GeoJSON으로 변환"""
-    from collections import defaultdict
-    
-    elements = data.get('elements', [])
-    
-    # 인덱스 생성
-    nodes_by_id = {}
-    ways_by_id = {}
-    
-    for e in elements:
-        if e.get('type') == 'node':
-            nodes_by_id[e['id']] = e
-        elif e.get('type') == 'way':
-            ways_by_id[e['id']] = e
-    
-    relations = [e for e in elements if e.get('type') == 'relation']
-    print(f"   {len(relations)}개 노선 relation 발견")
-    
-    # 노선별로 구간 모으기 (같은 이름의 노선은 합치기)
-    lines = defaultdict(lambda: {'colour': '#888888', 'coordinates': []})
-    
-    for rel in relations:
-        tags = rel.get('tags', {})
-        name = tags.get('name', '')
-        colour = tags.get('colour', '#888888')
-        
-        # 이름에서 기본 노선명 추출 (방향/구간 정보 제거)
-        base_name = name.split(':')[0].strip()
-        if not base_name:
-            continue
-        
-        # 색상 저장 (같은 노선은 같은 색상 사용)
-        if colour != '#888888':
-            lines[base_name]['colour'] = colour
-        
-        # way 멤버들의 좌표 추출
-        way_ids = [m['ref'] for m in rel.get('members', []) if m['type'] == 'way']
-        
-        for way_id in way_ids:
-            way = ways_by_id.get(way_id)
-            if not way:
-                continue
-            
-            coords = []
-            for node_id in way.get('nodes', []):
-                node = nodes_by_id.get(node_id)
-                if node and 'lat' in node and 'lon' in node:
-                    coords.append([node['lon'], node['lat']])
-            
-            if len(coords) >= 2:
-                lines[base_name]['coordinates'].append(coords)
-    
-    # GeoJSON 생성
-    features = []
-    for name, line_data in lines.items():
-        if line_data['coordinates']:
-            feature = {
-                "type": "Feature",
-                "properties": {
-                    "name": name,
-                    "colour": line_data['colour']
-                },
-                "geometry": {
-                    "type": "MultiLineString",
-                    "coordinates": line_data['coordinates']
-                }
-            }
-            features.append(feature)
-    
-    return {
-        "type": "FeatureCollection",
-        "features": features
-    }
+def relation_line(tags):
+    """relation 태그 → (노선명, 색상) - 이름의 방향/구간 정보는 빼고, 색상이 없으면 노선 색상을 그대로 둠"""
+    base_name = tags.get('name', '').split(':')[0].strip()
+    if not base_name:
+        return None
+    colour = tags.get('colour', DEFAULT_COLOUR)
+    return base_name, (colour if colour != DEFAULT_COLOUR else None)
 
 
 def main():
     # 스크립트 위치 기준으로 경로 설정
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_dir = os.path.dirname(script_dir)
-    output_path = os.path.join(project_dir, 'data', 'subway_lines.json')
+    data_dir = os.environ.get("PINS_DATA_DIR", os.path.join(project_dir, 'data'))
+    output_path = os.path.join(data_dir, 'subway_lines.json')
     
-    # Overpass API에서 데이터 가져오기
-    raw_data = fetch_from_overpass()
-    
-    # GeoJSON으로 변환
-    print("🔄 GeoJSON으로 변환 중...")
-    geojson = process_osm_data(raw_data)
-    
-    # 저장
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(geojson, f, ensure_ascii=False)
+    # Overpass 응답을 읽으면서 노선이 완성되는 대로 GeoJSON과 줌 구간별 단순화한 파일에 기록
+    print("🚇 Overpass API에서 지하철 노선 데이터 가져오는 중...")
+    with BandWriter("subway", data_dir) as bands:
+        lines = fetch_lines(QUERY, relation_line, DEFAULT_COLOUR, output_path, bands.add)
     
     file_size = os.path.getsize(output_path) / 1024 / 1024
-    print(f"✅ {len(geojson['features'])}개 노선 저장 완료")
+    print(f"✅ {len(lines)}개 노선 저장 완료")
     print(f"   파일: {output_path} ({file_size:.1f}MB)")
     
     # 노선 목록 출력
     print("\n📋 노선 목록:")
-    for feat in sorted(geojson['features'], key=lambda x: x['properties']['name'])[:15]:
-        props = feat['properties']
-        print(f"   {props['name']} ({props['colour']})")
+    for name, colour in sorted(lines)[:15]:
+        print(f"   {name} ({colour})")
+    
+    if len(lines) > 15:
+        print(f"   ... 외 {len(lines) - 15}개")
     
-    if len(geojson['features']) > 15:
-        print(f"   ... 외 {len(geojson['features']) - 15}개")
+    print()
+    print_bands(bands, data_dir)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 """공공수영장 위치 수집"""
 
 from common import fetch_all, DETAILED_REGIONS
+from rules import compile_rules
 
 NAME = "공공수영장"
 LIST_ID = 5
@@ -26,25 +27,16 @@ KNOWN_POOL_CENTERS = [
 ]
 
 
-def filter_pool(doc):
-    """공공수영장만 필터링"""
-    name = doc.get("place_name", "")
-    category = doc.get("category_name", "")
-    
+# 공공수영장만 필터링
+POOL_RULES = [
     # 알려진 수영장 보유 체육센터는 무조건 포함
-    for center in KNOWN_POOL_CENTERS:
-        if center in name:
-            return True
-    
-    if "수영" not in name and "수영" not in category:
-        return False
-    
+    ("accept", {"name": KNOWN_POOL_CENTERS}),
+    ("reject", {"not": {"any": [{"name": ["수영"]}, {"category": ["수영"]}]}}),
     # 제외 키워드 (사설 수영장, 호텔, 부대시설 등)
-    exclude = ["호텔", "리조트", "콘도", "아파트", "빌라", "학원", "레슨", "주차장", "화장실"]
-    for ex in exclude:
-        if ex in name:
-            return False
-    return True
+    ("reject", {"name": ["호텔", "리조트", "콘도", "아파트", "빌라", "학원", "레슨", "주차장", "화장실"]}),
+]
+
+filter_pool = compile_rules(POOL_RULES, default="accept", name="filter_pool")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+"""
+공통 HTTP 전송 계층
+- keep-alive 연결 재사용 (requests.Session 연결 풀)
+- 일시적 오류는 지수 백오프 + 지터로 재시도
+- 429 응답이면 Retry-After만큼 멈추고 전체 요청 속도를 낮춤
+- 엔드포인트별 요청/재시도/실패 횟수, 응답 시간, 수신 바이트 집계
+"""
+
+import math
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "5"))
+BACKOFF_BASE = 0.5   # 첫 재시도 대기 (초)
+BACKOFF_MAX = 30.0   # 최대 재시도 대기 (초)
+POOL_SIZE = 32
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=POOL_SIZE)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+_stats = defaultdict(lambda: {"requests": 0, "retries": 0, "throttled": 0, "failures": 0, "bytes": 0})
+_latencies = defaultdict(list)
+_stats_lock = threading.Lock()
+
+
+def _count(endpoint: str, field: str, amount: int = 1):
+    with _stats_lock:
+        _stats[endpoint][field] += amount
+
+
+def _record_latency(endpoint: str, seconds: float):
+    with _stats_lock:
+        _latencies[endpoint].append(seconds)
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """정렬된 값의 p 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(p / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+def _retry_after(response) -> float:
+    """Retry-After 헤더를 초 단위로 변환 (없으면 0)"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _backoff(attempt: int) -> float:
+    """지수 백오프 + full jitter"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def request(endpoint: str, method: str, url: str, limiter=None, max_retries=None, **kwargs):
+    """
+    재시도와 속도 제한을 적용한 HTTP 요청
+
+    Args:
+        endpoint: 통계용 엔드포인트 이름 (예: "kakao/keyword")
+        method: HTTP 메서드
+        url: 요청 URL
+        limiter: 요청 전에 토큰을 얻을 TokenBucket (429 시 속도 감소)
+        max_retries: 최대 재시도 횟수 (기본: HTTP_MAX_RETRIES)
+        **kwargs: requests에 그대로 전달
+
+    Returns:
+        requests.Response (2xx)
+
+    Raises:
+        requests.RequestException: 재시도 후에도 실패한 경우
+    """
+    retries = MAX_RETRIES if max_retries is None else max_retries
+    kwargs.setdefault("timeout", 30)
+
+    for attempt in range(retries + 1):
+        if limiter:
+            limiter.acquire()
+        _count(endpoint, "requests")
+
+        started = time.perf_counter()
+        try:
+            response = _session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            _record_latency(endpoint, time.perf_counter() - started)
+            if attempt >= retries:
+                _count(endpoint, "failures")
+                raise
+            _count(endpoint, "retries")
+            time.sleep(_backoff(attempt))
+            continue
+
+        _record_latency(endpoint, time.perf_counter() - started)
+        _count(endpoint, "bytes", len(response.content))
+
+        if response.status_code not in RETRY_STATUS:
+            if response.ok and limiter:
+                limiter.recover()
+            if not response.ok:
+                _count(endpoint, "failures")
+            response.raise_for_status()
+            return response
+
+        if attempt >= retries:
+            _count(endpoint, "failures")
+            response.raise_for_status()
+
+        _count(endpoint, "retries")
+        wait = _retry_after(response)
+        if response.status_code == 429:
+            _count(endpoint, "throttled")
+            if limiter:
+                limiter.slow_down(pause=wait)
+        time.sleep(max(wait, _backoff(attempt)))
+
+
+def get_json(endpoint: str, url: str, params=None, headers=None, limiter=None, **kwargs):
+    """GET 요청 후 JSON 응답 반환"""
+    response = request(endpoint, "GET", url, limiter=limiter, params=params, headers=headers, **kwargs)
+    return response.json()
+
+
+def get_stats() -> dict:
+    """엔드포인트별 요청 통계 (응답 시간 백분위수는 ms)"""
+    with _stats_lock:
+        stats = {endpoint: dict(counts) for endpoint, counts in _stats.items()}
+        latencies = {endpoint: sorted(values) for endpoint, values in _latencies.items()}
+
+    for endpoint, counts in stats.items():
+        values = latencies.get(endpoint, [])
+        counts["latency_ms"] = {
+            "p50": round(percentile(values, 50) * 1000, 1),
+            "p90": round(percentile(values, 90) * 1000, 1),
+            "p99": round(percentile(values, 99) * 1000, 1),
+            "max": round(values[-1] * 1000, 1) if values else 0.0,
+            "mean": round(sum(values) / len(values) * 1000, 1) if values else 0.0,
+        }
+    return stats
+
+
+def total_requests() -> int:
+    """모든 엔드포인트의 요청 수 합계"""
+    with _stats_lock:
+        return sum(counts["requests"] for counts in _stats.values())
+
+
+def print_stats():
+    """엔드포인트별 요청/재시도 횟수와 응답 시간 출력"""
+    stats = get_stats()
+    if not stats:
+        return
+    print("📡 HTTP 요청 통계:")
+    for endpoint, counts in sorted(stats.items()):
+        latency = counts["latency_ms"]
+        print(
+            f"   {endpoint}: 요청 {counts['requests']}건, 재시도 {counts['retries']}건 "
+            f"(429 {counts['throttled']}건), 실패 {counts['failures']}건, "
+            f"응답 p50 {latency['p50']:g}ms / p90 {latency['p90']:g}ms / p99 {latency['p99']:g}ms, "
+            f"수신 {counts['bytes'] / 1024 / 1024:.1f}MB"
+        )
@@ -0,0 +1,129 @@
+"""
+증분 수집 (--incremental)
+검색어별로 1페이지 결과 ID 목록과 total_count를 지문으로 저장해 두고,
+다음 실행에서 1페이지 지문이 같으면 2~3페이지는 다시 요청하지 않고 이전 응답을 재사용한다.
+수집이 끝나면 이전 원본 데이터와 비교해 추가/삭제/이동된 장소를 보고한다.
+"""
+
+import json
+import threading
+
+import common
+
+# 이 거리 이상 좌표가 바뀐 장소를 '이동'으로 보고 (m)
+MOVED_THRESHOLD_M = 30
+
+
+def fingerprint(data: dict) -> dict:
+    """검색 응답 1페이지의 지문"""
+    return {
+        "total_count": data.get("meta", {}).get("total_count", 0),
+        "ids": [doc.get("id") for doc in data.get("documents", [])],
+    }
+
+
+class FingerprintStore:
+    """
+    검색어별 지문과 2페이지 이후 응답 저장소
+
+    Args:
+        name: 수집 대상 이름 (파일 이름에 사용)
+    """
+
+    def __init__(self, name: str):
+        self.path = common.STATE_DIR / f"{name.lower().replace(' ', '_')}_fingerprints.json"
+        self.reused_calls = 0
+        self.changed_queries = 0
+        self._lock = threading.Lock()
+        self._previous = {}
+        self._current = {}
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._previous = json.load(f)
+
+    def reuse(self, query: str, first_page: dict):
+        """
+        1페이지 지문이 이전과 같으면 이전 2페이지 이후 응답 반환
+
+        Returns:
+            재사용할 응답 리스트 (지문이 달라졌거나 기록이 없으면 None)
+        """
+        previous = self._previous.get(query)
+        if previous is None or previous["fingerprint"] != fingerprint(first_page):
+            with self._lock:
+                self.changed_queries += 1
+            return None
+
+        with self._lock:
+            self.reused_calls += len(previous["pages"])
+        return previous["pages"]
+
+    def update(self, query: str, pages: list):
+        """이번 실행의 응답 기록 (pages[0]은 1페이지)"""
+        with self._lock:
+            self._current[query] = {
+                "fingerprint": fingerprint(pages[0]),
+                "pages": pages[1:],
+            }
+
+    def save(self):
+        """이번 실행 결과를 다음 실행을 위해 저장 (이번에 검색하지 않은 검색어는 유지)"""
+        state = dict(self._previous)
+        state.update(self._current)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+
+    def summary(self) -> str:
+        return f"지문이 바뀐 검색어 {self.changed_queries}개, 재사용한 페이지 {self.reused_calls}건 (API 호출 절약)"
+
+
+def load_previous_places(raw_filename: str) -> list:
+    """이전 실행의 원본 데이터 (없으면 빈 리스트)"""
+    raw_path = common.WORK_DIR / raw_filename
+    if not raw_path.exists():
+        return []
+    with open(raw_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def diff_places(previous: list, current: list) -> dict:
+    """이전/현재 장소 비교 (카카오 place id 기준)"""
+    previous_by_id = {p["id"]: p for p in previous if p.get("id")}
+    current_by_id = {p["id"]: p for p in current if p.get("id")}
+
+    added = [p for pid, p in current_by_id.items() if pid not in previous_by_id]
+    removed = [p for pid, p in previous_by_id.items() if pid not in current_by_id]
+    moved = []
+    for pid, place in current_by_id.items():
+        old = previous_by_id.get(pid)
+        if old is None:
+            continue
+        distance_m = common.haversine_distance(old["lat"], old["lng"], place["lat"], place["lng"]) * 1000
+        if distance_m >= MOVED_THRESHOLD_M:
+            moved.append({
+                "id": pid,
+                "name": place["name"],
+                "from": [old["lat"], old["lng"]],
+                "to": [place["lat"], place["lng"]],
+                "distance_m": round(distance_m),
+            })
+
+    return {
+        "added": [{"id": p["id"], "name": p["name"], "address": p["road_address"] or p["address"]} for p in added],
+        "removed": [{"id": p["id"], "name": p["name"], "address": p.get("road_address") or p.get("address", "")} for p in removed],
+        "moved": moved,
+    }
+
+
+def print_diff(diff: dict):
+    """변경 내역 요약 출력"""
+    print(f"🔀 변경 내역: 추가 {len(diff['added'])}개, 삭제 {len(diff['removed'])}개, 이동 {len(diff['moved'])}개")
+    for label, key in (("+", "added"), ("-", "removed")):
+        for place in diff[key][:10]:
+            print(f"   {label} {place['name']} ({place['address']})")
+        if len(diff[key]) > 10:
+            print(f"   ... 외 {len(diff[key]) - 10}개")
+    for place in diff["moved"][:10]:
+        print(f"   ~ {place['name']} ({place['distance_m']}m)")
@@ -0,0 +1,180 @@
+"""
+이름 + 지역 기준 레코드 연결 (카카오 핀 ↔ 학교알리미 등 외부 데이터)
+1. (정규화한 이름, 시도) 블록에서 정확히 일치하는 레코드를 찾고, 시군구를 알면 다른 시군구의 레코드는 뺀다
+2. 못 찾은 항목은 같은 시도 안에서 이름의 글자 2-gram을 공유하는 후보만 골라 유사도 순으로 비교한다
+항목마다 블록 하나와 흔하지 않은 2-gram 몇 개의 후보만 보므로 전체가 거의 선형 시간이다.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+# 이 유사도 이상이면 이름이 달라도 같은 레코드로 연결
+FUZZY_THRESHOLD = 0.85
+
+# 이보다 많은 레코드에 들어 있는 2-gram(예: "학교", "중학")은 후보를 고르는 데 쓰지 않음
+MAX_POSTING = 50
+
+# 시군구로 가려서 연결한 경우의 신뢰도
+LOCALITY_CONFIDENCE = 0.95
+
+# 괄호 안 설명, 공백과 기호
+_PARENTHESES = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_NOISE = re.compile(r"[\s\W_]+")
+
+# 시군구 이름 끝 (학교알리미는 "세종시", 카카오 주소는 "세종특별자치시"라 이 부분을 떼고 비교)
+_LOCALITY_SUFFIX = re.compile(r"(특별자치시|특별시|광역시|시|군|구)$")
+
+
+def normalize_name(name: str) -> str:
+    """비교용 이름 (괄호 설명, 공백/기호 제거)"""
+    name = unicodedata.normalize("NFKC", name or "")
+    name = _PARENTHESES.sub("", name)
+    return _NOISE.sub("", name).lower()
+
+
+def bigrams(text: str) -> set:
+    return {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+
+
+def locality_stem(locality: str) -> str:
+    """시군구 비교용 이름 (세종시, 세종특별자치시 → 세종)"""
+    return _LOCALITY_SUFFIX.sub("", locality) or locality
+
+
+def address_localities(address: str) -> set:
+    """주소의 단어마다 locality_stem"""
+    return {locality_stem(token) for token in (address or "").split()}
+
+
+def same_locality(record_locality: str, item_tokens: set) -> bool:
+    """레코드의 시군구가 항목 주소에 있는지 (item_tokens는 address_localities, 어느 한쪽이라도 모르면 같다고 본다)"""
+    if not record_locality or not item_tokens:
+        return True
+    return locality_stem(record_locality.split()[0]) in item_tokens
+
+
+class Match:
+    """연결 결과 하나 (record가 None이면 연결 실패)"""
+
+    __slots__ = ("item", "record", "method", "confidence", "candidates")
+
+    def __init__(self, item, record=None, method="none", confidence=0.0, candidates=0):
+        self.item = item
+        self.record = record
+        self.method = method
+        self.confidence = confidence
+        self.candidates = candidates
+
+
+def join_records(items: list, records: list, item_key, record_key, stem=None, threshold: float = FUZZY_THRESHOLD) -> list:
+    """
+    항목마다 가장 잘 맞는 레코드 연결
+
+    Args:
+        items: 연결할 항목 (예: 핀)
+        records: 연결 대상 레코드 (예: 학교알리미 학교 정보)
+        item_key: 항목 → (이름, 시도, 주소) - 주소의 단어로 시군구를 확인
+        record_key: 레코드 → (이름, 시도, 시군구) - 시군구는 없으면 ""
+        stem: 정규화한 이름 → 유사도를 잴 부분 (예: "학교" 같은 공통 접미사 제거, 선택)
+        threshold: 유사도 연결 기준
+
+    Returns:
+        items 순서의 Match 리스트
+        method: exact(블록에 하나), locality(같은 이름 중 시군구 일치), fuzzy(유사도),
+                ambiguous(같은 이름이 여럿인데 시군구로 가릴 수 없음), none
+    """
+    # 레코드 색인: (이름, 시도) 블록과 시도별 2-gram 역색인
+    stem = stem or (lambda name: name)
+    keys = [record_key(record) for record in records]
+    stems = []
+    blocks = {}
+    postings = {}
+    for i, (name, sido, _) in enumerate(keys):
+        name = normalize_name(name)
+        keys[i] = (name, sido, keys[i][2])
+        stems.append(stem(name))
+        blocks.setdefault((name, sido), []).append(i)
+        for gram in bigrams(name):
+            postings.setdefault((sido, gram), []).append(i)
+
+    matches = []
+    used = set()
+    pending = []
+
+    # 1. 정확히 일치하는 이름 (시군구가 다른 레코드는 제외)
+    for item in items:
+        name, sido, address = item_key(item)
+        name = normalize_name(name)
+        tokens = address_localities(address)
+        block = blocks.get((name, sido), [])
+        local = [i for i in block if same_locality(keys[i][2], tokens)]
+
+        if len(local) == 1:
+            used.add(local[0])
+            if len(block) == 1:
+                matches.append(Match(item, records[local[0]], "exact", 1.0, 1))
+            else:
+                matches.append(Match(item, records[local[0]], "locality", LOCALITY_CONFIDENCE, len(block)))
+        elif local:
+            matches.append(Match(item, None, "ambiguous", 0.0, len(local)))
+        else:
+            matches.append(Match(item))
+            pending.append((len(matches) - 1, name, sido, tokens))
+
+    # 2. 남은 항목은 같은 시도에서 흔하지 않은 2-gram을 공유하는 레코드 중 가장 비슷한 것
+    for index, name, sido, tokens in pending:
+        candidates = set()
+        for gram in bigrams(name):
+            posting = postings.get((sido, gram), ())
+            if len(posting) <= MAX_POSTING:
+                candidates.update(posting)
+        candidates -= used
+
+        best, best_score = None, 0.0
+        name_stem = stem(name)
+        for i in sorted(candidates):
+            if not same_locality(keys[i][2], tokens):
+                continue
+            score = SequenceMatcher(None, name_stem, stems[i], autojunk=False).ratio()
+            if score > best_score:
+                best, best_score = i, score
+
+        match = matches[index]
+        match.candidates = len(candidates)
+        if best is not None and best_score >= threshold:
+            used.add(best)
+            match.record = records[best]
+            match.method = "fuzzy"
+            match.confidence = round(best_score, 3)
+
+    return matches
+
+
+def match_report(matches: list, describe_item, describe_record) -> dict:
+    """
+    연결 리포트
+
+    Args:
+        describe_item, describe_record: 항목/레코드 → 리포트에 남길 dict
+    """
+    summary = {"items": len(matches), "matched": 0}
+    rows = []
+    for match in matches:
+        summary[match.method] = summary.get(match.method, 0) + 1
+        if match.record is not None:
+            summary["matched"] += 1
+        rows.append({
+            **describe_item(match.item),
+            "method": match.method,
+            "confidence": match.confidence,
+            "candidates": match.candidates,
+            "record": describe_record(match.record) if match.record is not None else None,
+        })
+
+    return {
+        "summary": summary,
+        "unmatched": [row for row in rows if row["record"] is None],
+        "fuzzy": [row for row in rows if row["method"] == "fuzzy"],
+        "matches": rows,
+    }
@@ -0,0 +1,79 @@
+"""
+수집 작업 저널
+완료된 작업 단위(예: 지역, 키워드, 페이지)와 결과를 JSON Lines 파일에 한 줄씩 추가한다.
+중간에 중단된 실행을 --resume으로 다시 시작하면 완료된 단위는 건너뛴다.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+
+class Journal:
+    """
+    append-only 작업 저널
+
+    Args:
+        path: 저널 파일 경로 (.jsonl)
+        resume: True면 기존 기록을 불러오고, False면 새로 시작
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = Path(path)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        if resume:
+            self._load()
+        elif self.path.exists():
+            self.path.unlink()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _key(unit) -> str:
+        return json.dumps(list(unit), ensure_ascii=False)
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        # 바이트로 읽어서 줄마다 디코딩 (기록 도중 중단되면 마지막 줄이 한글 글자 중간에서 잘릴 수 있음)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        for line in data.splitlines():
+            try:
+                entry = json.loads(line.decode("utf-8"))
+            except ValueError:  # UnicodeDecodeError 포함
+                # 기록 도중 중단된 마지막 줄
+                continue
+            self._entries[self._key(entry["unit"])] = entry["result"]
+
+        # 잘린 마지막 줄을 지워야 다음 기록이 그 뒤에 붙어서 함께 깨지지 않는다
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, unit):
+        """완료된 단위의 결과 (없으면 None)"""
+        return self._entries.get(self._key(unit))
+
+    def record(self, unit, result):
+        """완료된 단위 기록 (즉시 디스크에 반영)"""
+        line = json.dumps({"unit": list(unit), "result": result}, ensure_ascii=False)
+        with self._lock:
+            self._entries[self._key(unit)] = result
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self, completed=True):
+        """저널 닫기 (completed면 파일 삭제)"""
+        self._file.close()
+        if completed and self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+노선도 줌 구간별 파일 만들기
+data/{kind}_lines.json(OSM 원본 정밀도)을 줌 구간마다 화면 픽셀 기준으로 단순화(Douglas-Peucker)하고
+그 줌에서 구분되는 자릿수까지만 좌표를 반올림해서 data/lines/{kind}_z{최소}-{최대}.json으로 저장한다.
+클라이언트(app.js)는 data/lines/index.json을 보고 현재 줌 구간 파일만 받는다.
+
+구간 파일은 TopoJSON처럼 노선끼리 겹치는 구간(arc)을 한 번만 두고, arc 좌표는 정수로 양자화한 차이를
+Google encoded polyline 문자열로 적는다 (순서는 [경도, 위도], 10^decimals 배).
+
+    {"type": "Topology", "decimals": 5,
+     "arcs": ["_p~iF~ps|U_ulLnnqC", ...],
+     "features": [{"properties": {...}, "arcs": [[0, ~3, 7], ...]}]}
+
+features의 arcs는 MultiLineString의 선마다 이어 붙일 arc 번호이고, ~i(= -i-1)는 i번 arc를 뒤집어서 쓴다는 뜻이다.
+이어 붙일 때 두 번째 arc부터는 첫 점(앞 arc의 끝점)을 뺀다.
+
+사용법:
+    python line_bands.py                # 지하철, 기차 노선 모두
+    python line_bands.py subway         # 지정한 노선만
+    python line_bands.py --geojson      # 구간 파일을 GeoJSON으로 (디버깅용)
+"""
+
+import json
+import math
+import os
+import sys
+from array import array
+
+from osm_lines import stitch_lines
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.environ.get("PINS_DATA_DIR", os.path.join(os.path.dirname(SCRIPT_DIR), "data"))
+
+KINDS = ("subway", "train")
+
+# 줌 구간 (최소 줌, 최대 줌) - 각 구간의 최대 줌에서 허용 오차 안으로 단순화
+ZOOM_BANDS = [(0, 8), (9, 11), (12, 14), (15, 19)]
+
+# 단순화 허용 오차 (화면 픽셀)
+TOLERANCE_PX = 0.5
+
+TILE_SIZE = 256
+
+
+def pixels_per_degree(zoom: int) -> float:
+    """경도 1도가 이 줌에서 몇 픽셀인지"""
+    return TILE_SIZE * 2 ** zoom / 360
+
+
+def band_decimals(zoom: int) -> int:
+    """반올림 오차가 1/4 픽셀 이하가 되는 소수 자릿수"""
+    return math.ceil(math.log10(2 * pixels_per_degree(zoom)))
+
+
+def project(line: list) -> list:
+    """[[경도, 위도]] → 웹 메르카토르 좌표 (경도와 같은 '도' 단위라 줌마다 pixels_per_degree를 곱하면 픽셀)"""
+    return [(lon, math.degrees(math.log(math.tan(math.pi / 4 + math.radians(lat) / 2)))) for lon, lat in line]
+
+
+def simplify(points: list, tolerance: float) -> list:
+    """
+    Douglas-Peucker 단순화 (재귀 없이 스택으로)
+
+    Args:
+        points: [(x, y)] 투영 좌표
+        tolerance: 허용 오차 (points와 같은 단위)
+
+    Returns:
+        남길 점의 위치 (오름차순)
+    """
+    n = len(points)
+    if n <= 2:
+        return list(range(n))
+
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        ax, ay = points[first]
+        bx, by = points[last]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+
+        farthest, farthest_sq = -1, tolerance_sq
+        for i in range(first + 1, last):
+            px, py = points[i]
+            ex, ey = px - ax, py - ay
+            if length_sq:
+                # 선분까지의 거리 (선분 밖이면 가까운 끝점까지)
+                t = (ex * dx + ey * dy) / length_sq
+                if t > 1.0:
+                    ex, ey = px - bx, py - by
+                elif t > 0.0:
+                    ex -= t * dx
+                    ey -= t * dy
+            dist_sq = ex * ex + ey * ey
+            if dist_sq > farthest_sq:
+                farthest, farthest_sq = i, dist_sq
+
+        if farthest >= 0:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+
+    return [i for i in range(n) if keep[i]]
+
+
+def simplify_line(line: list, points: list, zoom: int, decimals: int) -> list:
+    """
+    노선 한 구간 단순화 + 반올림 (점 하나로 줄어들면 빈 리스트)
+
+    Args:
+        line: [[경도, 위도]]
+        points: project(line)
+    """
+    result = []
+    for i in simplify(points, TOLERANCE_PX / pixels_per_degree(zoom)):
+        coord = [round(line[i][0], decimals), round(line[i][1], decimals)]
+        if not result or coord != result[-1]:
+            result.append(coord)
+    return result if len(result) >= 2 else []
+
+
+def split_arcs(features: list, point_count: int) -> tuple:
+    """
+    노선들을 겹치는 구간(arc)으로 나누기 (TopoJSON의 join/cut/dedup)
+    끝점이거나, 다른 선(또는 같은 선의 다른 곳)에서 앞뒤 점이 다르게 지나가는 점을 접점으로 보고
+    모든 선을 접점에서 자른 뒤, 같은 점 순서(뒤집힌 것 포함)인 조각은 arc 하나로 합친다.
+
+    Args:
+        features: [(properties, [array('l') 점 번호, ...])]
+        point_count: 점 번호 개수
+
+    Returns:
+        (arcs, features) - arcs: [(점 번호, ...)],
+        features: [(properties, [[arc 번호, ...], ...])] (뒤집어 쓰는 arc는 ~번호)
+    """
+    # 점마다 처음 지나간 앞뒤 점 (작은 번호, 큰 번호) - 다른 앞뒤 점으로 다시 지나가면 접점
+    before = array("l", [-1]) * point_count
+    after = array("l", [-1]) * point_count
+    junction = bytearray(point_count)
+    for _, parts in features:
+        for line in parts:
+            junction[line[0]] = junction[line[-1]] = 1
+            for i in range(1, len(line) - 1):
+                point, a, b = line[i], line[i - 1], line[i + 1]
+                if a > b:
+                    a, b = b, a
+                if before[point] < 0:
+                    before[point], after[point] = a, b
+                elif before[point] != a or after[point] != b:
+                    junction[point] = 1
+    del before, after
+
+    arcs = []
+    arc_ids = {}
+    result = []
+    for properties, parts in features:
+        arc_lines = []
+        for line in parts:
+            refs = []
+            start = 0
+            for i in range(1, len(line)):
+                if junction[line[i]] or i == len(line) - 1:
+                    piece = tuple(line[start:i + 1])
+                    start = i
+                    arc_id = arc_ids.get(piece)
+                    if arc_id is None:
+                        arc_id = arc_ids.get(piece[::-1])
+                        if arc_id is not None:
+                            arc_id = ~arc_id
+                    if arc_id is None:
+                        arc_id = arc_ids[piece] = len(arcs)
+                        arcs.append(piece)
+                    refs.append(arc_id)
+            arc_lines.append(refs)
+        result.append((properties, arc_lines))
+    return arcs, result
+
+
+def encode_polyline(points: list) -> str:
+    """[(x, y)] 정수 좌표 → Google encoded polyline 문자열 (첫 점부터 차이값)"""
+    chars = []
+    last_x = last_y = 0
+    for x, y in points:
+        for value in (x - last_x, y - last_y):
+            value = ~(value << 1) if value < 0 else value << 1
+            while value >= 0x20:
+                chars.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            chars.append(chr(value + 63))
+        last_x, last_y = x, y
+    return "".join(chars)
+
+
+def quantize_arc(arc: list, points: list, band: dict) -> list:
+    """arc 하나를 줌 구간에 맞게 단순화해서 정수 좌표로 (10^decimals 배, 연속된 같은 점은 하나로)"""
+    scale = 10 ** band["decimals"]
+    coords = []
+    for i in simplify(points, TOLERANCE_PX / pixels_per_degree(band["max_zoom"])):
+        coord = (round(arc[i][0] * scale), round(arc[i][1] * scale))
+        if not coords or coord != coords[-1]:
+            coords.append(coord)
+    return coords
+
+
+def band_topology(arcs: list, features: list, band: dict) -> dict:
+    """
+    줌 구간 하나의 Topology (점 하나로 줄어든 선과 쓰지 않는 arc는 뺌)
+
+    Args:
+        arcs: [(encoded polyline, 점 수)] - split_arcs의 arc마다 quantize_arc → encode_polyline
+        features: split_arcs 결과의 features
+    """
+    used = {}
+    band_arcs = []
+    band_features = []
+    for properties, arc_lines in features:
+        lines = []
+        for refs in arc_lines:
+            if sum(arcs[~r if r < 0 else r][1] - 1 for r in refs) < 1:
+                continue
+            line = []
+            for ref in refs:
+                index = ~ref if ref < 0 else ref
+                if index not in used:
+                    used[index] = len(band_arcs)
+                    band_arcs.append(arcs[index])
+                line.append(used[index] if ref >= 0 else ~used[index])
+            lines.append(line)
+        if lines:
+            band_features.append({"properties": properties, "arcs": lines})
+
+    band["features"] = len(band_features)
+    band["points"] = sum(points for _, points in band_arcs)
+    return {
+        "type": "Topology",
+        "decimals": band["decimals"],
+        "arcs": [polyline for polyline, _ in band_arcs],
+        "features": band_features,
+    }
+
+
+def band_filename(kind: str, min_zoom: int, max_zoom: int) -> str:
+    return f"{kind}_z{min_zoom}-{max_zoom}.json"
+
+
+class BandWriter:
+    """
+    노선 feature를 받아서 줌 구간마다 단순화해 data/lines/{kind}_z*.json에 기록
+    Topology 파일은 노선끼리 겹치는 구간을 찾아야 해서 이어 붙인 선을 모아 두었다가 닫을 때 쓰고,
+    (좌표는 점마다 한 번만 경도/위도 배열에 두고, 선은 점 번호 배열로)
+    GeoJSON 파일(topology=False)은 받는 대로 쓴다.
+    닫을 때 data/lines/index.json의 이 노선 종류 항목을 갱신한다.
+
+        with BandWriter("subway", data_dir) as bands:
+            for feature in features:
+                bands.add(feature)
+    """
+
+    def __init__(self, kind: str, data_dir: str = DATA_DIR, topology: bool = True):
+        self.kind = kind
+        self.topology = topology
+        self.lines_dir = os.path.join(data_dir, "lines")
+        self.bands = [
+            {
+                "min_zoom": min_zoom,
+                "max_zoom": max_zoom,
+                "decimals": band_decimals(max_zoom),
+                "file": f"lines/{band_filename(kind, min_zoom, max_zoom)}",
+                "features": 0,
+                "points": 0,
+            }
+            for min_zoom, max_zoom in ZOOM_BANDS
+        ]
+        self._files = []
+        self._features = []
+        self._points = {}
+        self._lon = array("d")
+        self._lat = array("d")
+        self.arcs = 0
+        # 원본 노선 파일과 이어 붙인 뒤의 구간 수, 좌표 수
+        self.source = {"parts": 0, "points": 0}
+        self.stitched = {"parts": 0, "points": 0}
+
+    def __enter__(self):
+        os.makedirs(self.lines_dir, exist_ok=True)
+        for band in self.bands:
+            f = open(self._path(band) + ".tmp", "w", encoding="utf-8")
+            if not self.topology:
+                f.write('{"type":"FeatureCollection","features":[')
+            self._files.append(f)
+        return self
+
+    def _path(self, band: dict) -> str:
+        return os.path.join(os.path.dirname(self.lines_dir), band["file"])
+
+    def add(self, feature: dict):
+        # 예전에 저장한 노선 파일은 way 조각 그대로라 여기서도 이어 붙임 (이미 이어 붙인 노선은 그대로)
+        source = feature["geometry"]["coordinates"]
+        lines = stitch_lines(source)
+        self.source["parts"] += len(source)
+        self.source["points"] += sum(map(len, source))
+        self.stitched["parts"] += len(lines)
+        self.stitched["points"] += sum(map(len, lines))
+        if self.topology:
+            self._features.append((feature["properties"], [array("l", map(self._point, line)) for line in lines]))
+            return
+        projected = [project(line) for line in lines]
+        for band, f in zip(self.bands, self._files):
+            simplified = [simplify_line(line, points, band["max_zoom"], band["decimals"]) for line, points in zip(lines, projected)]
+            simplified = [line for line in simplified if line]
+            if not simplified:
+                continue
+            if band["features"]:
+                f.write(",")
+            f.write(json.dumps({
+                "type": "Feature",
+                "properties": feature["properties"],
+                "geometry": {"type": "MultiLineString", "coordinates": simplified},
+            }, ensure_ascii=False, separators=(",", ":")))
+            band["features"] += 1
+            band["points"] += sum(len(line) for line in simplified)
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.topology and exc_type is None:
+            self._write_topology()
+        for band, f in zip(self.bands, self._files):
+            if not self.topology:
+                f.write("]}")
+            f.close()
+            if exc_type is None:
+                os.replace(self._path(band) + ".tmp", self._path(band))
+                band["bytes"] = os.path.getsize(self._path(band))
+            else:
+                os.remove(self._path(band) + ".tmp")
+        if exc_type is None:
+            self._update_index()
+
+    def _point(self, coord: list) -> int:
+        # OSM 좌표는 소수 7자리라 정수 하나로 묶어서 키로 (튜플 키보다 작음)
+        key = round(coord[0] * 1e7) << 32 | round(coord[1] * 1e7) & 0xFFFFFFFF
+        point = self._points.get(key)
+        if point is None:
+            point = self._points[key] = len(self._lon)
+            self._lon.append(coord[0])
+            self._lat.append(coord[1])
+        return point
+
+    def _write_topology(self):
+        self._points = {}
+        arcs, features = split_arcs(self._features, len(self._lon))
+        self._features = []
+        self.arcs = len(arcs)
+        # arc마다 한 번 투영해서 모든 줌 구간의 polyline을 만들고, 좌표는 바로 버림
+        encoded = [[] for _ in self.bands]
+        for arc in arcs:
+            line = [(self._lon[i], self._lat[i]) for i in arc]
+            points = project(line)
+            for band, band_arcs in zip(self.bands, encoded):
+                coords = quantize_arc(line, points, band)
+                band_arcs.append((encode_polyline(coords), len(coords)))
+        del arcs
+        for band, band_arcs, f in zip(self.bands, encoded, self._files):
+            json.dump(band_topology(band_arcs, features, band), f, ensure_ascii=False, separators=(",", ":"))
+
+    def _update_index(self):
+        """목록 파일은 노선 종류별로 갱신 (다른 종류의 구간은 그대로)"""
+        index_path = os.path.join(self.lines_dir, "index.json")
+        index = {}
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        index[self.kind] = [{k: band[k] for k in ("min_zoom", "max_zoom", "file")} for band in self.bands]
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+
+
+def write_bands(kind: str, data_dir: str = DATA_DIR, topology: bool = True) -> BandWriter:
+    """저장된 data/{kind}_lines.json → data/lines/{kind}_z*.json"""
+    with open(os.path.join(data_dir, f"{kind}_lines.json"), "r", encoding="utf-8") as f:
+        geojson = json.load(f)
+    with BandWriter(kind, data_dir, topology) as bands:
+        for feature in geojson.get("features", []):
+            bands.add(feature)
+    return bands
+
+
+def print_bands(bands: BandWriter, data_dir: str = DATA_DIR):
+    source = os.path.getsize(os.path.join(data_dir, f"{bands.kind}_lines.json"))
+    print(f"🗺️ {bands.kind}_lines.json ({source / 1024:.0f}KB) → 줌 구간 {len(bands.bands)}개")
+    if bands.source != bands.stitched:
+        print(f"   구간 이어 붙이기: 구간 {bands.source['parts']} → {bands.stitched['parts']}개, "
+              f"좌표 {bands.source['points']} → {bands.stitched['points']}개")
+    if bands.topology:
+        print(f"   겹치는 구간으로 나눈 arc {bands.arcs}개 (encoded polyline)")
+    for band in bands.bands:
+        print(f"   z{band['min_zoom']}-{band['max_zoom']}: 점 {band['points']}개, {band['bytes'] / 1024:.0f}KB ({band['file']})")
+
+
+def main():
+    args = sys.argv[1:]
+    topology = "--geojson" not in args
+    kinds = [arg for arg in args if not arg.startswith("--")] or list(KINDS)
+    unknown = [kind for kind in kinds if kind not in KINDS]
+    if unknown:
+        print(f"❌ 알 수 없는 노선: {', '.join(unknown)} (가능: {', '.join(KINDS)})")
+        return 1
+    for kind in kinds:
+        if not os.path.exists(os.path.join(DATA_DIR, f"{kind}_lines.json")):
+            print(f"⚠️ data/{kind}_lines.json 파일이 없습니다. 건너뜁니다.")
+            continue
+        print_bands(write_bands(kind, topology=topology))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+로컬 API 대역 서버 (벤치마크/오프라인 테스트용)
+scripts/*_raw.json과 data/*_lines.json에 저장된 데이터를 실제 API와 같은 형식으로 응답한다.
+- 카카오 키워드 검색: GET /v2/local/search/keyword.json (15개씩 페이지, 최대 45개, meta.is_end)
+- Overpass: POST /api/interpreter (subway/train 노선 relation, node, way)
+- 학교알리미: GET /openApi.do (apiType 0, 10, 51)
+응답마다 지연 시간을 넣을 수 있고, 일정 비율로 429(Retry-After)를 돌려준다.
+
+사용법:
+    python mock_server.py [--port 8765] [--latency 50] [--rate-limit 0.02]
+
+    KAKAO_API_BASE=http://127.0.0.1:8765 \\
+    SCHOOLINFO_BASE_URL=http://127.0.0.1:8765/openApi.do \\
+    OVERPASS_URL=http://127.0.0.1:8765/api/interpreter \\
+    python fetch_libraries.py --no-cache
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from rules import place_to_doc
+
+SCRIPTS_DIR = Path(__file__).parent
+DATA_DIR = SCRIPTS_DIR.parent / "data"
+
+PAGE_SIZE = 15
+MAX_PAGEABLE = 45
+
+# 검색어의 광역단체 전체 이름 → 주소에 쓰이는 짧은 이름
+REGION_SHORT_NAMES = {
+    "서울특별시": "서울", "부산광역시": "부산", "대구광역시": "대구", "인천광역시": "인천",
+    "광주광역시": "광주", "대전광역시": "대전", "울산광역시": "울산", "세종특별자치시": "세종",
+    "경기도": "경기", "강원특별자치도": "강원", "충청북도": "충북", "충청남도": "충남",
+    "전북특별자치도": "전북", "전라남도": "전남", "경상북도": "경북", "경상남도": "경남",
+    "제주특별자치도": "제주",
+}
+
+# get_coed_type()의 역변환
+COED_CODES = {"남학교": "남", "여학교": "여", "공학": "남녀공학"}
+
+# get_school_type()이 같은 값을 돌려주도록 하는 고등학교 종류
+HS_KIND_NAMES = {
+    "과학고": "특수목적고등학교", "외고": "특수목적고등학교", "국제고": "특수목적고등학교",
+    "예술고": "특수목적고등학교", "체육고": "특수목적고등학교", "마이스터고": "특수목적고등학교",
+    "특목고": "특수목적고등학교", "자사고": "자율고등학교", "자공고": "자율고등학교",
+    "특성화고": "특성화고등학교", "일반고": "일반고등학교",
+}
+
+
+class MockData:
+    """응답에 쓸 데이터 (처음 요청할 때 한 번만 읽음)"""
+
+    def __init__(self, scripts_dir=SCRIPTS_DIR, data_dir=DATA_DIR):
+        self.scripts_dir = Path(scripts_dir)
+        self.data_dir = Path(data_dir)
+        self._lock = threading.Lock()
+        self._docs = None
+        self._overpass = {}
+        self._schools = None
+
+    def docs(self) -> list:
+        """카카오 검색 대상 문서 (id 순)"""
+        with self._lock:
+            if self._docs is None:
+                by_id = {}
+                for path in sorted(self.scripts_dir.glob("*_raw.json")):
+                    if "_schoolinfo_" in path.name:
+                        continue
+                    with open(path, "r", encoding="utf-8") as f:
+                        for place in json.load(f):
+                            doc = place_to_doc(place)
+                            if doc["id"]:
+                                by_id[doc["id"]] = doc
+                self._docs = [
+                    (doc, " ".join([
+                        doc.get("place_name", ""),
+                        doc.get("address_name", ""),
+                        doc.get("road_address_name", ""),
+                        doc.get("category_name", ""),
+                    ]))
+                    for _, doc in sorted(by_id.items())
+                ]
+            return self._docs
+
+    def overpass(self, kind: str) -> bytes:
+        """data/{kind}_lines.json을 Overpass 응답(relation → node → way)으로 변환"""
+        with self._lock:
+            if kind not in self._overpass:
+                with open(self.data_dir / f"{kind}_lines.json", "r", encoding="utf-8") as f:
+                    geojson = json.load(f)
+
+                node_ids = {}
+                nodes = []
+                ways = []
+                relations = []
+                for feature in geojson.get("features", []):
+                    members = []
+                    for line in feature["geometry"]["coordinates"]:
+                        refs = []
+                        for lon, lat in line:
+                            node_id = node_ids.get((lon, lat))
+                            if node_id is None:
+                                node_id = node_ids[(lon, lat)] = len(node_ids) + 1
+                                nodes.append({"type": "node", "id": node_id, "lat": lat, "lon": lon})
+                            refs.append(node_id)
+                        way_id = len(ways) + 1
+                        ways.append({"type": "way", "id": way_id, "nodes": refs})
+                        members.append({"type": "way", "ref": way_id, "role": ""})
+                    props = feature.get("properties", {})
+                    relations.append({
+                        "type": "relation",
+                        "id": len(relations) + 1,
+                        "members": members,
+                        "tags": {"name": props.get("name", ""), "colour": props.get("colour", "#888888")},
+                    })
+
+                # out body의 relation 다음에 out skel이 node, way 순서로 출력
+                body = {"version": 0.6, "generator": "mock_server", "elements": relations + nodes + ways}
+                self._overpass[kind] = json.dumps(body).encode("utf-8")
+            return self._overpass[kind]
+
+    def schools(self) -> dict:
+        """{학교급 코드: {시도 이름: [학교]}}"""
+        with self._lock:
+            if self._schools is None:
+                self._schools = {}
+                for kind_code, school_type in (("03", "중학교"), ("04", "고등학교")):
+                    by_sido = {}
+                    path = self.scripts_dir / f"{school_type}_schoolinfo_raw.json"
+                    if path.exists():
+                        with open(path, "r", encoding="utf-8") as f:
+                            for school in json.load(f):
+                                by_sido.setdefault(school.get("sido", ""), []).append(school)
+                    self._schools[kind_code] = by_sido
+            return self._schools
+
+
+def search(data: MockData, query: str, rect: str = None) -> list:
+    """검색어의 모든 단어가 이름/주소/카테고리에 들어 있는 문서"""
+    return list(_search(data, query, rect or ""))
+
+
+@lru_cache(maxsize=None)
+def _token_matches(data: MockData, token: str) -> frozenset:
+    """단어가 들어 있는 문서 번호 (단어마다 한 번만 전체를 훑는다)"""
+    return frozenset(i for i, (_, text) in enumerate(data.docs()) if token in text)
+
+
+@lru_cache(maxsize=4096)
+def _search(data: MockData, query: str, rect: str) -> tuple:
+    tokens = [REGION_SHORT_NAMES.get(token, token) for token in query.split()]
+    bounds = [float(v) for v in rect.split(",")] if rect else None
+    docs = data.docs()
+
+    if tokens:
+        indexes = frozenset.intersection(*(_token_matches(data, token) for token in tokens))
+    else:
+        indexes = range(len(docs))
+    matches = []
+    for i in sorted(indexes):
+        doc = docs[i][0]
+        if bounds:
+            x, y = float(doc["x"]), float(doc["y"])
+            if not (bounds[0] <= x <= bounds[2] and bounds[1] <= y <= bounds[3]):
+                continue
+        matches.append(doc)
+    return tuple(matches)
+
+
+def keyword_response(data: MockData, params: dict) -> dict:
+    """카카오 키워드 검색 응답"""
+    query = params.get("query", "")
+    page = int(params.get("page", 1))
+    size = int(params.get("size", PAGE_SIZE))
+    matches = search(data, query, params.get("rect"))
+
+    pageable = min(len(matches), MAX_PAGEABLE)
+    start = (page - 1) * size
+    documents = matches[start:min(start + size, pageable)]
+    return {
+        "documents": documents,
+        "meta": {
+            "total_count": len(matches),
+            "pageable_count": pageable,
+            "is_end": start + size >= pageable,
+            "same_name": None,
+        },
+    }
+
+
+def schoolinfo_response(data: MockData, params: dict) -> dict:
+    """학교알리미 openApi.do 응답"""
+    import fetch_school_info
+
+    api_type = params.get("apiType")
+    kind_code = params.get("schulKndCode", "")
+    schools = data.schools().get(kind_code, {})
+
+    if api_type == "0":
+        # 원본 데이터에는 시군구가 없어서 학교 코드 해시로 시군구에 나눠 담는다
+        sido_name = next(
+            (name for name, info in fetch_school_info.SIDO_SGG_CODES.items() if info["code"] == params.get("sidoCode")),
+            None,
+        )
+        if sido_name is None:
+            return {"resultCode": "success", "list": []}
+        sgg_codes = list(fetch_school_info.SIDO_SGG_CODES[sido_name]["sgg"].values())
+        rows = []
+        for school in schools.get(sido_name, []):
+            code = school.get("school_code", "")
+            if sgg_codes[zlib.crc32(code.encode()) % len(sgg_codes)] != params.get("sggCode"):
+                continue
+            rows.append({
+                "SCHUL_NM": school.get("name", ""),
+                "SCHUL_CODE": code,
+                "COEDU_SC_CODE": COED_CODES.get(school.get("coed_type"), ""),
+                "FOND_SC_CODE": school.get("found_type", ""),
+                "HS_KND_SC_NM": HS_KIND_NAMES.get(school.get("school_type"), ""),
+                "CLOSE_YN": "N",
+            })
+        return {"resultCode": "success", "list": rows}
+
+    school = next(
+        (s for by_sido in schools.values() for s in by_sido if s.get("school_code") == params.get("schulCode")),
+        None,
+    )
+    if school is None:
+        return {"resultCode": "success", "list": []}
+
+    if api_type == "10":
+        grade = "3" if kind_code == "03" else "4"
+        row = {"STDNT_SUM": school.get("student_total", 0)}
+        male = school.get("student_male", 0)
+        female = school.get("student_female", 0)
+        for i in (1, 2, 3):
+            row[f"STDNT_SUM_{grade}{i}"] = school.get(f"student_g{i}", 0)
+            # 남녀 학생수는 1학년에 몰아서 넣어도 합계는 같다
+            row[f"MAN_STDNT_{grade}{i}"] = male if i == 1 else 0
+            row[f"WOMAN_STDNT_{grade}{i}"] = female if i == 1 else 0
+        return {"resultCode": "success", "list": [row]}
+
+    if api_type == "51" and "grad_male" in school:
+        return {"resultCode": "success", "list": [{
+            "MAN_SUM": school.get("grad_male", 0),
+            "WOMAN_SUM": school.get("grad_female", 0),
+            "TOTAL_RATE": school.get("advancement_rate", ""),
+        }]}
+
+    return {"resultCode": "success", "list": []}
+
+
+class MockServer(ThreadingHTTPServer):
+    """
+    API 대역 서버
+
+    Args:
+        address: (host, port) - port가 0이면 빈 포트 사용
+        latency: 응답 지연 평균 (초, ±50% 균등 분포)
+        rate_limit: 429로 응답할 비율 (0~1)
+        retry_after: 429 응답의 Retry-After (초)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency=0.0, rate_limit=0.0, retry_after=0.2,
+                 scripts_dir=SCRIPTS_DIR, data_dir=DATA_DIR):
+        super().__init__(address, MockHandler)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.data = MockData(scripts_dir, data_dir)
+        self.counts = Counter()
+        self._counts_lock = threading.Lock()
+        self._random = random.Random(0)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str):
+        with self._counts_lock:
+            self.counts[name] += 1
+
+    def should_throttle(self) -> bool:
+        with self._counts_lock:
+            return self._random.random() < self.rate_limit
+
+    def delay(self):
+        if self.latency > 0:
+            with self._counts_lock:
+                jitter = self._random.uniform(0.5, 1.5)
+            time.sleep(self.latency * jitter)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 보내므로 Nagle 알고리즘을 끄지 않으면 keep-alive 요청마다 지연 ACK(약 40ms)을 기다린다
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, data: dict):
+        self._send(200, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    def _handle(self, params: dict):
+        server = self.server
+        path = urlparse(self.path).path
+        server.count("requests")
+        server.delay()
+
+        if server.should_throttle():
+            server.count("throttled")
+            self._send(429, b'{"errorType":"RequestThrottled"}', {"Retry-After": f"{server.retry_after:g}"})
+            return
+
+        if path == "/v2/local/search/keyword.json":
+            server.count("kakao")
+            self._send_json(keyword_response(server.data, params))
+        elif path == "/openApi.do":
+            server.count("schoolinfo")
+            self._send_json(schoolinfo_response(server.data, params))
+        elif path == "/api/interpreter":
+            server.count("overpass")
+            kind = "subway" if '"subway"' in params.get("data", "") else "train"
+            self._send(200, server.data.overpass(kind))
+        else:
+            self._send(404, b'{"error":"not found"}')
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self._handle({k: v[0] for k, v in query.items()})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = parse_qs(self.rfile.read(length).decode("utf-8"))
+        self._handle({k: v[0] for k, v in body.items()})
+
+
+def start_server(port=0, **kwargs) -> MockServer:
+    """백그라운드 스레드에서 서버 시작"""
+    server = MockServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="카카오/Overpass/학교알리미 API 대역 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0, help="평균 응답 지연 (ms)")
+    parser.add_argument("--rate-limit", type=float, default=0, help="429로 응답할 비율 (0~1)")
+    args = parser.parse_args()
+
+    server = MockServer(("127.0.0.1", args.port), latency=args.latency / 1000, rate_limit=args.rate_limit)
+    print(f"🧪 API 대역 서버: {server.base_url}")
+    print(f"   KAKAO_API_BASE={server.base_url}")
+    print(f"   SCHOOLINFO_BASE_URL={server.base_url}/openApi.do")
+    print(f"   OVERPASS_URL={server.base_url}/api/interpreter")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,517 @@
+"""
+Overpass 노선 응답 스트리밍 처리 (fetch_subway_lines, fetch_train_lines 공용)
+응답 전체를 json.loads 하지 않고 elements 배열을 원소 하나씩 읽으면서
+node는 좌표만, way는 노선 relation이 쓰는 것만 node ID 목록으로 남긴다.
+노선(같은 이름의 relation 묶음)에 필요한 way가 모두 모이면 바로 GeoJSON feature로 내보내고 그 way를 버린다.
+
+쿼리는 relation을 먼저 출력해야 한다 (out body; >; out skel qt;).
+relation 다음에 오는 way/node 중 노선에 쓰이지 않는 것은 읽는 즉시 버린다.
+"""
+
+import codecs
+import json
+import mmap
+import os
+import re
+import tempfile
+import urllib.parse
+import urllib.request
+from array import array
+from bisect import bisect_left
+from contextlib import nullcontext
+
+OVERPASS_URL = os.environ.get("OVERPASS_URL", "https://overpass-api.de/api/interpreter")
+
+CHUNK_SIZE = 1 << 16
+
+NAN = float("nan")
+
+# 처리 통계 - parts/points: 노선 feature의 구간 수, 좌표 수 (way 중복 제거와 이어 붙이기 전/후)
+COUNTS = ("elements", "relations", "parts_before", "parts_after", "points_before", "points_after")
+
+# 지정하면 노드 좌표 배열을 이 폴더에 파일로 두고 mmap으로 조회
+NODES_DIR = os.environ.get("OSM_NODES_DIR")
+
+_decoder = json.JSONDecoder()
+_SEPARATOR = re.compile(r"[\s,]*")
+
+
+def open_overpass(query: str, timeout: int = 300):
+    """Overpass API 요청 (응답 스트림을 돌려줌)"""
+    data = urllib.parse.urlencode({'data': query}).encode('utf-8')
+    req = urllib.request.Request(OVERPASS_URL, data=data)
+    return urllib.request.urlopen(req, timeout=timeout)
+
+
+def iter_elements(stream, chunk_size: int = CHUNK_SIZE):
+    """
+    Overpass JSON 응답의 elements 원소를 하나씩 (응답 크기와 관계없이 버퍼는 원소 몇 개 분량)
+
+    Args:
+        stream: read(n)으로 bytes를 주는 객체 (HTTP 응답, 파일)
+    """
+    reader = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + reader.decode(chunk or b"", final=eof)
+        pos = 0
+
+    # "elements" 배열 시작까지 건너뛰기
+    while True:
+        start = buffer.find('"elements"')
+        if start >= 0:
+            bracket = buffer.find("[", start)
+            if bracket >= 0:
+                pos = bracket + 1
+                break
+        if eof:
+            raise ValueError("Overpass 응답에 elements가 없습니다")
+        fill()
+
+    while True:
+        pos = _SEPARATOR.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Overpass 응답이 중간에 끊겼습니다")
+            fill()
+            continue
+        if buffer[pos] == "]":
+            return
+
+        try:
+            element, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # 원소가 버퍼 끝에서 잘림 - 더 읽어서 다시 시도
+            if eof:
+                raise
+            fill()
+            continue
+        pos = end
+        yield element
+
+
+def _sorted_run(ids: array, lons: array, lats: array):
+    """ID 순으로 정렬한 (ids, lons, lats) - 이미 정렬돼 있으면 그대로 (정렬된 두 묶음을 이어 붙인 것은 병합 한 번으로 정렬됨)"""
+    if not any(ids[i] > ids[i + 1] for i in range(len(ids) - 1)):
+        return ids, lons, lats
+    order = sorted(range(len(ids)), key=ids.__getitem__)
+    return array("q", [ids[i] for i in order]), array("d", [lons[i] for i in order]), array("d", [lats[i] for i in order])
+
+
+class NodeStore:
+    """
+    OSM 노드 좌표 저장소 - ID 순으로 정렬한 int64 배열과 경도/위도 float64 배열, 이진 탐색으로 조회
+    노드 하나에 24바이트라 노드마다 dict나 튜플을 두는 것보다 훨씬 작다.
+    속도가 아니라 메모리를 위한 구조: 조회는 dict보다 느리다 (README 참고).
+
+    들어온 노드는 뒤에 붙여 두었다가 조회할 때 그 부분만 정렬해서 정렬된 묶음(run)으로 넣는다.
+    Overpass는 보통 node를 모두 출력한 뒤 way를 출력하므로 묶음은 하나뿐이고,
+    node와 way가 섞여 오면 크기가 비슷한 묶음끼리 합쳐서 묶음 수를 log 단위로 유지한다
+    (이미 넣은 노드를 조회할 때마다 다시 정렬하지 않음).
+
+    Args:
+        spill_dir: 주면 정렬한 배열을 이 폴더의 파일로 쓰고 mmap으로 조회 (메모리 대신 디스크 사용)
+    """
+
+    def __init__(self, spill_dir=None):
+        self.spill_dir = spill_dir
+        # 정렬된 묶음 (ids, lons, lats)과 묶음마다 연 파일 [(mmap, memoryview, 경로), ...]
+        self._runs = []
+        self._maps = []
+        self._spilled = 0
+        # 아직 정렬하지 않은 노드
+        self._new_ids = array("q")
+        self._new_lons = array("d")
+        self._new_lats = array("d")
+        # 직전에 찾은 (묶음, 위치) - way의 노드 ID는 대개 이어지므로 다음 칸부터 확인
+        self._hint = (0, -1)
+
+    def __len__(self):
+        return sum(len(ids) for ids, _, _ in self._runs) + len(self._new_ids)
+
+    def add(self, node_id: int, lon: float, lat: float):
+        self._new_ids.append(node_id)
+        self._new_lons.append(lon)
+        self._new_lats.append(lat)
+
+    def freeze(self):
+        """뒤에 붙인 노드만 정렬해서 묶음으로 넣기"""
+        if not self._new_ids:
+            return
+        run = _sorted_run(self._new_ids, self._new_lons, self._new_lats)
+        self._new_ids, self._new_lons, self._new_lats = array("q"), array("d"), array("d")
+
+        runs = self._runs
+        if runs and self.spill_dir is None and runs[-1][0][-1] < run[0][0]:
+            # 마지막 묶음보다 ID가 모두 큼 - 이어 붙이기만
+            for values, tail in zip(runs[-1], run):
+                values.extend(tail)
+        else:
+            runs.append(self._store(run))
+        # 앞 묶음이 두 배보다 크지 않으면 합치기 (노드 하나가 병합되는 횟수는 log n 이하)
+        while len(runs) > 1 and len(runs[-2][0]) <= 2 * len(runs[-1][0]):
+            newer, older = runs.pop(), runs.pop()
+            merged = []
+            for typecode, values, more in zip("qdd", older, newer):
+                values = array(typecode, values)
+                values.extend(more)
+                merged.append(values)
+            self._release(self._maps.pop())
+            self._release(self._maps.pop())
+            runs.append(self._store(_sorted_run(*merged)))
+        self._hint = (len(runs) - 1, -1)
+
+    def _store(self, run: tuple) -> tuple:
+        """묶음 보관 - spill_dir이 있으면 파일로 쓰고 mmap으로 다시 열기"""
+        if self.spill_dir is None:
+            self._maps.append([])
+            return run
+        self._spilled += 1
+        maps = []
+        views = []
+        for name, values in zip(("ids", "lons", "lats"), run):
+            path = os.path.join(self.spill_dir, f"nodes_{self._spilled}_{name}.bin")
+            with open(path, "wb") as f:
+                values.tofile(f)
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped).cast(values.typecode)
+            maps.append((mapped, view, path))
+            views.append(view)
+        self._maps.append(maps)
+        return tuple(views)
+
+    @staticmethod
+    def _release(maps: list):
+        for mapped, view, path in maps:
+            view.release()
+            mapped.close()
+            os.remove(path)
+
+    def close(self):
+        self._runs = []
+        for maps in self._maps:
+            self._release(maps)
+        self._maps = []
+        self._new_ids, self._new_lons, self._new_lats = array("q"), array("d"), array("d")
+
+    def lookup(self, node_ids: list):
+        """
+        노드 ID 목록 → (경도, 위도를 번갈아 담은 array, 없는 노드 수) - 없는 노드 자리는 NaN
+        """
+        self.freeze()
+        runs = self._runs
+        coords = array("d")
+        append = coords.append
+        missing = 0
+        r, i = self._hint
+        ids, lons, lats = runs[r] if runs else (array("q"), array("d"), array("d"))
+        for node_id in node_ids:
+            i += 1
+            if i >= len(ids) or ids[i] != node_id:
+                for r, (ids, lons, lats) in enumerate(runs):
+                    i = bisect_left(ids, node_id)
+                    if i < len(ids) and ids[i] == node_id:
+                        break
+                else:
+                    append(NAN)
+                    append(NAN)
+                    missing += 1
+                    i = -1
+                    continue
+            append(lons[i])
+            append(lats[i])
+        self._hint = (r, i)
+        return coords, missing
+
+
+def compact_coords(coords: array) -> array:
+    """NaN(없는 노드) 자리를 뺀 좌표"""
+    return array("d", (v for i in range(0, len(coords), 2) if coords[i] == coords[i] for v in coords[i:i + 2]))
+
+
+def coords_to_line(coords: array) -> list:
+    """경도, 위도를 번갈아 담은 array → [[경도, 위도], ...]"""
+    return [[coords[i], coords[i + 1]] for i in range(0, len(coords), 2)]
+
+
+def stitch_lines(lines: list) -> list:
+    """
+    노선 한 개의 구간들을 이어 붙여 가능한 한 긴 선으로
+
+    같은 좌표열(반대 방향 포함)은 하나만 남기고, 끝점이 같은 구간은 이어 붙인다 (필요하면 뒤집어서).
+    끝점이 하나뿐인 곳(노선 끝)에서 시작해서 갈 수 있는 데까지 잇고, 갈림길에서는 먼저 나온 구간으로 간다.
+
+    Args:
+        lines: [[[경도, 위도], ...], ...]
+
+    Returns:
+        이어 붙인 선 리스트 (입력 순서를 최대한 따름)
+    """
+    parts = []
+    seen = set()
+    for line in lines:
+        key = tuple(map(tuple, line))
+        if len(key) < 2 or key in seen or key[::-1] in seen:
+            continue
+        seen.add(key)
+        parts.append(line)
+
+    # 끝점 → 그 끝점을 가진 (구간, 끝) 목록 (끝: 0 = 시작점, 1 = 끝점)
+    ends = {}
+    for i, line in enumerate(parts):
+        ends.setdefault(tuple(line[0]), []).append((i, 0))
+        ends.setdefault(tuple(line[-1]), []).append((i, 1))
+
+    used = [False] * len(parts)
+
+    def next_part(point):
+        """point에서 이어지는 아직 안 쓴 구간 → 그 점에서 시작하는 방향의 좌표"""
+        for i, end in ends.get(point, ()):
+            if not used[i]:
+                used[i] = True
+                return parts[i] if end == 0 else parts[i][::-1]
+        return None
+
+    def extend(line):
+        """line 끝에서 이어지는 구간을 계속 붙임"""
+        while True:
+            part = next_part(tuple(line[-1]))
+            if part is None:
+                return line
+            line.extend(part[1:])
+
+    # 노선 끝(끝점을 가진 구간이 하나뿐인 곳)에서 먼저 시작
+    starts = [i for i, line in enumerate(parts) if len(ends[tuple(line[0])]) == 1 or len(ends[tuple(line[-1])]) == 1]
+    result = []
+    for i in starts + list(range(len(parts))):
+        if used[i]:
+            continue
+        used[i] = True
+        line = parts[i] if len(ends[tuple(parts[i][0])]) == 1 else parts[i][::-1]
+        line = extend(list(line))
+        # 반대쪽으로도 이어지는 구간이 있으면 (원형이거나 갈림길에서 시작한 경우)
+        line.reverse()
+        result.append(extend(line))
+    return result
+
+
+class LineAssembler:
+    """
+    relation → node → way 순서로 들어오는 원소를 노선별 MultiLineString feature로 조립
+    (way가 node보다 먼저 와도 되지만 그 way는 노드가 다 올 때까지 기다림)
+
+    Args:
+        relation_line: relation 태그 → (노선명, 색상) 또는 None(건너뜀). 색상이 None이면 노선 색상을 바꾸지 않음
+        default_colour: 색상이 없는 노선의 색상
+        nodes: 노드 저장소 (기본: 메모리의 NodeStore)
+    """
+
+    def __init__(self, relation_line, default_colour: str, nodes: NodeStore = None):
+        self.relation_line = relation_line
+        self.default_colour = default_colour
+        self.counts = dict.fromkeys(COUNTS, 0)
+        self.nodes = nodes if nodes is not None else NodeStore()
+
+        # 노선명 → {colour, relations: [[way ID]], pending: 아직 모이지 않은 way 수}
+        self.lines = {}
+        self.closed = False
+        # way ID → 이 way를 쓰는 노선명
+        self.way_lines = {}
+        # 조립된 way 좌표 (경도, 위도 번갈아) / 노드를 기다리는 way의 좌표와 남은 노드 수
+        self.way_coords = {}
+        self.way_waiting = {}
+        # 노드 ID → 그 노드를 기다리는 (way ID, 좌표 위치)
+        self.node_waiters = {}
+
+    def feed(self, element: dict):
+        """원소 하나 처리 - 완성된 노선 feature를 yield"""
+        self.counts["elements"] += 1
+        kind = element.get("type")
+        if kind == "relation":
+            self._add_relation(element)
+            return
+        if not self.closed:
+            self._close_relations()
+        if kind == "way":
+            yield from self._add_way(element)
+        elif kind == "node":
+            yield from self._add_node(element)
+
+    def finish(self):
+        """응답 끝 - 빠진 노드/way는 없는 대로 남은 노선을 내보냄"""
+        if not self.closed:
+            self._close_relations()
+        for way_id, (coords, _) in list(self.way_waiting.items()):
+            yield from self._resolve_way(way_id, compact_coords(coords))
+        while self.lines:
+            yield from self._emit(next(iter(self.lines)))
+        self.nodes.close()
+
+    def _add_relation(self, rel: dict):
+        self.counts["relations"] += 1
+        line = self.relation_line(rel.get("tags", {}))
+        if line is None:
+            return
+        name, colour = line
+        entry = self.lines.setdefault(name, {"colour": self.default_colour, "relations": [], "pending": 0})
+        if colour is not None:
+            entry["colour"] = colour
+        entry["relations"].append([m["ref"] for m in rel.get("members", []) if m["type"] == "way"])
+
+    def _close_relations(self):
+        """relation이 끝남 - 노선마다 기다릴 way 수 계산"""
+        self.closed = True
+        for name, entry in self.lines.items():
+            way_ids = {way_id for refs in entry["relations"] for way_id in refs}
+            entry["pending"] = len(way_ids)
+            for way_id in way_ids:
+                self.way_lines.setdefault(way_id, []).append(name)
+
+    def _add_way(self, way: dict):
+        way_id = way["id"]
+        if way_id not in self.way_lines or way_id in self.way_coords or way_id in self.way_waiting:
+            return
+        nodes = way.get("nodes", [])
+        coords, missing = self.nodes.lookup(nodes)
+        if missing:
+            for k, node_id in enumerate(nodes):
+                if coords[2 * k] != coords[2 * k]:
+                    self.node_waiters.setdefault(node_id, []).append((way_id, 2 * k))
+            self.way_waiting[way_id] = (coords, missing)
+        else:
+            yield from self._resolve_way(way_id, coords)
+
+    def _add_node(self, node: dict):
+        if "lat" not in node or "lon" not in node:
+            return
+        node_id, lon, lat = node["id"], node["lon"], node["lat"]
+        self.nodes.add(node_id, lon, lat)
+        for way_id, k in self.node_waiters.pop(node_id, ()):
+            coords, missing = self.way_waiting[way_id]
+            coords[k] = lon
+            coords[k + 1] = lat
+            if missing > 1:
+                self.way_waiting[way_id] = (coords, missing - 1)
+            else:
+                yield from self._resolve_way(way_id, coords)
+
+    def _resolve_way(self, way_id: int, coords: array):
+        """way 좌표 확정 → 이 way를 기다리던 노선 중 완성된 것을 내보냄"""
+        self.way_waiting.pop(way_id, None)
+        self.way_coords[way_id] = coords
+        for name in list(self.way_lines.get(way_id, ())):
+            entry = self.lines.get(name)
+            if entry is None:
+                continue
+            entry["pending"] -= 1
+            if entry["pending"] == 0:
+                yield from self._emit(name)
+
+    def _emit(self, name: str):
+        """노선 feature 하나 내보내고 다른 노선이 쓰지 않는 way 좌표는 버림"""
+        entry = self.lines.pop(name)
+        coordinates = []
+        parts = set()
+        for refs in entry["relations"]:
+            for way_id in refs:
+                coords = self.way_coords.get(way_id)
+                if coords is not None and len(coords) >= 4:
+                    self.counts["parts_before"] += 1
+                    self.counts["points_before"] += len(coords) // 2
+                    # 상행/하행 relation이 같은 way를 공유하면 한 번만
+                    if way_id not in parts:
+                        parts.add(way_id)
+                        coordinates.append(coords_to_line(coords))
+        coordinates = stitch_lines(coordinates)
+        self.counts["parts_after"] += len(coordinates)
+        self.counts["points_after"] += sum(map(len, coordinates))
+
+        for way_id in {way_id for refs in entry["relations"] for way_id in refs}:
+            users = self.way_lines.get(way_id)
+            if users and name in users:
+                users.remove(name)
+                if not users:
+                    del self.way_lines[way_id]
+                    self.way_coords.pop(way_id, None)
+
+        if coordinates:
+            yield {
+                "type": "Feature",
+                "properties": {
+                    "name": name,
+                    "colour": entry["colour"]
+                },
+                "geometry": {
+                    "type": "MultiLineString",
+                    "coordinates": coordinates
+                }
+            }
+
+
+def stream_features(elements, relation_line, default_colour: str, counts: dict = None, nodes: NodeStore = None):
+    """
+    Overpass 원소 → 노선 feature (완성되는 순서대로)
+
+    Args:
+        counts: 주면 처리 통계(COUNTS)를 채워 줌
+        nodes: 노드 저장소 (기본: 메모리의 NodeStore)
+    """
+    assembler = LineAssembler(relation_line, default_colour, nodes)
+    if counts is not None:
+        assembler.counts = counts
+        counts.update(dict.fromkeys(COUNTS, 0))
+    for element in elements:
+        yield from assembler.feed(element)
+    yield from assembler.finish()
+
+
+def write_feature_collection(features, output_path, on_feature=None) -> list:
+    """
+    feature를 받는 대로 GeoJSON FeatureCollection 파일에 기록 (다 쓰면 기존 파일과 교체)
+
+    Args:
+        on_feature: 기록한 feature마다 호출 (예: 줌 구간 파일 쓰기)
+
+    Returns:
+        [(노선명, 색상)]
+    """
+    written = []
+    tmp_path = f"{output_path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('{"type": "FeatureCollection", "features": [')
+            for feature in features:
+                if written:
+                    f.write(", ")
+                f.write(json.dumps(feature, ensure_ascii=False))
+                props = feature["properties"]
+                written.append((props["name"], props["colour"]))
+                if on_feature is not None:
+                    on_feature(feature)
+            f.write("]}")
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
+
+
+def fetch_lines(query: str, relation_line, default_colour: str, output_path, on_feature=None) -> list:
+    """Overpass 요청 → 노선 GeoJSON 저장 (응답을 읽으면서 바로 기록, on_feature: write_feature_collection 참고)"""
+    counts = {}
+    with tempfile.TemporaryDirectory(dir=NODES_DIR) if NODES_DIR else nullcontext() as spill_dir:
+        with open_overpass(query) as response:
+            features = stream_features(iter_elements(response), relation_line, default_colour, counts, NodeStore(spill_dir))
+            lines = write_feature_collection(features, output_path, on_feature)
+    print(f"   {counts['elements']}개 elements 수신")
+    print(f"   {counts['relations']}개 노선 relation 발견")
+    print(f"🧵 구간 이어 붙이기: 구간 {counts['parts_before']} → {counts['parts_after']}개, "
+          f"좌표 {counts['points_before']} → {counts['points_after']}개")
+    return lines
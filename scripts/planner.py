@@ -0,0 +1,144 @@
+"""
+수확률 기반 검색 계획 (--plan)
+(지역, 키워드) 조합마다 원본 결과 수, 필터 통과 수, 새로 추가된 고유 장소 수를 기록해 두고,
+최근 실행에서 새 장소를 한 번도 내놓지 않은 조합은 다음 실행에서 건너뛴다.
+몇 번에 한 번은 모든 조합을 다시 검색해서 새로 생긴 장소를 놓치지 않는다.
+"""
+
+import json
+import os
+import threading
+
+import common
+
+# 이 횟수만큼 연속으로 새 장소가 없던 조합을 건너뜀
+YIELD_HISTORY = 3
+
+# --plan으로 이 횟수만큼 실행할 때마다 한 번은 전체 검색
+PLAN_FULL_EVERY = int(os.environ.get("FETCH_PLAN_FULL_EVERY", "5"))
+
+
+def pair_key(region: str, keyword: str) -> str:
+    return f"{region}|{keyword}"
+
+
+class YieldStats:
+    """
+    (지역, 키워드) 조합별 수확률 기록
+
+    Args:
+        name: 수집 대상 이름 (파일 이름에 사용)
+    """
+
+    def __init__(self, name: str):
+        self.path = common.STATE_DIR / f"{name.lower().replace(' ', '_')}_yield.json"
+        self._lock = threading.Lock()
+        self._current = {}
+        self.pairs = {}
+        self.planned_runs = 0
+        self._full = True
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.pairs = state.get("pairs", {})
+            self.planned_runs = state.get("planned_runs", 0)
+
+    def record(self, region: str, keyword: str, raw: int, accepted_ids: list, calls: int):
+        """이번 실행에서 조합 하나의 검색 결과 기록 (스레드 안전)"""
+        with self._lock:
+            self._current[pair_key(region, keyword)] = {
+                "raw": raw,
+                "accepted_ids": accepted_ids,
+                "calls": calls,
+            }
+
+    def is_low_yield(self, region: str, keyword: str) -> bool:
+        """최근 YIELD_HISTORY번 모두 새 장소가 없었는지"""
+        history = self.pairs.get(pair_key(region, keyword), {}).get("history", [])
+        if len(history) < YIELD_HISTORY:
+            return False
+        return all(entry["new"] == 0 for entry in history[-YIELD_HISTORY:])
+
+    def average_calls(self, region: str, keyword: str) -> float:
+        history = self.pairs.get(pair_key(region, keyword), {}).get("history", [])
+        if not history:
+            return 1
+        return sum(entry["calls"] for entry in history) / len(history)
+
+    def plan(self, regions: list, keywords: list):
+        """
+        이번 실행에서 검색할 조합 결정
+
+        Returns:
+            ({지역: 키워드 리스트}, 계획 요약 dict)
+        """
+        full = PLAN_FULL_EVERY > 0 and self.planned_runs + 1 >= PLAN_FULL_EVERY
+        plan = {}
+        skipped = 0
+        saved_calls = 0.0
+
+        for region in regions:
+            plan[region] = []
+            for keyword in keywords:
+                if not full and self.is_low_yield(region, keyword):
+                    skipped += 1
+                    saved_calls += self.average_calls(region, keyword)
+                    continue
+                plan[region].append(keyword)
+
+        self._full = full
+        summary = {
+            "full": full,
+            "pairs": len(regions) * len(keywords),
+            "skipped": skipped,
+            "saved_calls": round(saved_calls),
+        }
+        return plan, summary
+
+    def finish(self, regions: list, keywords: list, failed: set):
+        """
+        지역/키워드 순서대로 새 고유 장소 수를 계산해 기록에 반영
+        (스레드 완료 순서와 관계없이 remove_duplicates와 같은 기준)
+
+        Args:
+            failed: 재시도 후에도 실패한 검색어 (기록하지 않음)
+        """
+        # --plan 없이 실행했거나 전체 검색 차례였으면 다시 처음부터 센다
+        self.planned_runs = 0 if self._full else self.planned_runs + 1
+
+        seen = set()
+        for region in regions:
+            for keyword in keywords:
+                current = self._current.get(pair_key(region, keyword))
+                if current is None:
+                    continue
+                new_ids = set(current["accepted_ids"]) - seen
+                seen.update(current["accepted_ids"])
+                if f"{region} {keyword}" in failed:
+                    continue
+
+                entry = self.pairs.setdefault(pair_key(region, keyword), {"history": []})
+                entry["history"].append({
+                    "raw": current["raw"],
+                    "accepted": len(current["accepted_ids"]),
+                    "new": len(new_ids),
+                    "calls": current["calls"],
+                })
+                entry["history"] = entry["history"][-YIELD_HISTORY:]
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"planned_runs": self.planned_runs, "pairs": self.pairs}, f, ensure_ascii=False)
+
+
+def print_plan(summary: dict):
+    """검색 계획 요약 출력"""
+    if summary["full"]:
+        print(f"🧭 검색 계획: 전체 검색 ({PLAN_FULL_EVERY}번에 한 번, 조합 {summary['pairs']}개)")
+    else:
+        print(
+            f"🧭 검색 계획: 조합 {summary['pairs']}개 중 새 장소가 없던 {summary['skipped']}개 건너뜀 "
+            f"(예상 절약 호출 {summary['saved_calls']}건)"
+        )
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+원본 데이터로 핀 데이터 다시 만들기 (API 호출 없음)
+scripts/*_raw.json 백업을 다시 읽어서 필터 → 중복 제거 → 핀 변환 → 학교 정보 추가(school_stats.json이 있으면 연도별 추이 포함)를 거쳐
+data/{id}.json을 다시 저장한다. 필터 규칙이나 핀 형식을 바꾼 뒤 재수집 없이 반영할 때 사용한다.
+리스트 하나를 프로세스 하나가 맡아서 여러 리스트를 동시에 처리한다.
+
+사용법:
+    python rebuild.py                 # 원본 데이터가 있는 모든 리스트
+    python rebuild.py 1 9 24          # 지정한 리스트 ID만
+    python rebuild.py --dry-run       # 저장하지 않고 핀 수만 확인
+    python rebuild.py --merge-nearby  # 가까이 있는 같은 이름의 장소 병합 (수집할 때 --merge-nearby를 준 리스트)
+    python rebuild.py --workers 4
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from functools import lru_cache
+
+from common import WORK_DIR, convert_to_pins, remove_duplicates, save_pins
+from dedup import merge_nearby
+from rules import place_to_doc
+
+# fetch_all로 수집하는 리스트: (모듈, 필터 함수 이름)
+FETCH_ALL_LISTS = [
+    ("fetch_middle_schools", "filter_school"),
+    ("fetch_high_schools", "filter_school"),
+    ("fetch_universities", "filter_university"),
+    ("fetch_libraries", "filter_library"),
+    ("fetch_swimming_pools", "filter_pool"),
+    ("fetch_mcdonalds", "filter_mcdonalds"),
+    ("fetch_subway", "filter_subway"),
+]
+
+# 학교 상세 정보를 덧붙이는 리스트: 리스트 ID → 학교알리미 원본 데이터
+SCHOOL_INFO_RAW = {
+    1: "중학교_schoolinfo_raw.json",
+    9: "고등학교_schoolinfo_raw.json",
+}
+
+
+@lru_cache(maxsize=None)
+def rebuild_targets() -> dict:
+    """
+    리스트 ID → {name, raw, filter_func, kind}
+
+    필터 함수(컴파일된 규칙)는 프로세스 간에 넘길 수 없어서 프로세스마다 이 표를 만든다.
+    """
+    import importlib
+
+    import fetch_stations
+    from scheduler import all_jobs
+
+    targets = {}
+    for module_name, filter_name in FETCH_ALL_LISTS:
+        module = importlib.import_module(module_name)
+        targets[module.LIST_ID] = {
+            "name": module.NAME,
+            "filter_func": getattr(module, filter_name),
+            "kind": "places",
+        }
+    for job in all_jobs():
+        targets[job["list_id"]] = {
+            "name": job["name"],
+            "filter_func": job["filter_func"],
+            "kind": "places",
+        }
+    targets[fetch_stations.LIST_ID] = {
+        "name": fetch_stations.NAME,
+        "filter_func": fetch_stations.filter_station,
+        "kind": "stations",
+    }
+
+    for target in targets.values():
+        target["raw"] = f"{target['name'].lower().replace(' ', '_')}_raw.json"
+    return targets
+
+
+def load_raw(filename: str):
+    with open(WORK_DIR / filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def normalize_place(place: dict) -> dict:
+    """예전 원본 데이터의 latitude/longitude를 lat/lng로"""
+    if "lat" not in place and "latitude" in place:
+        place["lat"] = place.pop("latitude")
+        place["lng"] = place.pop("longitude")
+    return place
+
+
+def build_pins(list_id: int, target: dict, raw: list, merge: bool = False) -> list:
+    """원본 데이터 → 핀 (수집 스크립트와 같은 순서로 처리)"""
+    if target["kind"] == "stations":
+        import fetch_stations
+        return fetch_stations.build_pins(raw)
+
+    raw = [normalize_place(place) for place in raw]
+    filter_func = target["filter_func"]
+    places = [place for place in raw if filter_func(place_to_doc(place))] if filter_func else raw
+    print(f"🔍 필터링 후: {len(places)}개")
+    places = remove_duplicates(places)
+    if merge:
+        places = merge_nearby(places)
+    print(f"✨ 중복 제거 후: {len(places)}개")
+    pins = convert_to_pins(places)
+
+    info_file = SCHOOL_INFO_RAW.get(list_id)
+    if info_file and (WORK_DIR / info_file).exists():
+        from fetch_school_info import apply_school_info
+        from school_stats import STATS_PATH, SchoolStats
+        stats = SchoolStats.load() if STATS_PATH.exists() else None
+        summary = apply_school_info(pins, load_raw(info_file), stats)["summary"]
+        print(f"🏫 학교 정보 매칭: {summary['matched']}/{len(pins)}개 (유사한 이름 {summary.get('fuzzy', 0)}개)")
+    return pins
+
+
+def rebuild_list(list_id: int, dry_run: bool = False, merge: bool = False) -> dict:
+    """
+    리스트 하나 다시 만들기 (작업 프로세스에서 실행)
+
+    Returns:
+        {list_id, name, raw, pins, seconds, log} - 출력은 log에 모아서 돌려준다
+    """
+    target = rebuild_targets()[list_id]
+    started = time.perf_counter()
+    log = io.StringIO()
+    with redirect_stdout(log):
+        raw = load_raw(target["raw"])
+        pins = build_pins(list_id, target, raw, merge)
+        if not dry_run:
+            save_pins(pins, list_id)
+
+    return {
+        "list_id": list_id,
+        "name": target["name"],
+        "raw": len(raw),
+        "pins": len(pins),
+        "seconds": time.perf_counter() - started,
+        "log": log.getvalue(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="원본 데이터로 data/{id}.json 다시 만들기")
+    parser.add_argument("list_ids", nargs="*", type=int, help="리스트 ID (기본: 원본 데이터가 있는 전체)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="동시 처리할 프로세스 수")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않음")
+    parser.add_argument("--verbose", action="store_true", help="리스트별 처리 과정 출력")
+    parser.add_argument("--merge-nearby", action="store_true", help="가까이 있는 같은 이름의 장소 병합")
+    args = parser.parse_args()
+
+    targets = rebuild_targets()
+    unknown = [i for i in args.list_ids if i not in targets]
+    if unknown:
+        print(f"❌ 다시 만들 수 없는 리스트: {', '.join(map(str, unknown))} (가능: {', '.join(map(str, sorted(targets)))})")
+        return 1
+
+    list_ids = args.list_ids or sorted(targets)
+    missing = [i for i in list_ids if not (WORK_DIR / targets[i]["raw"]).exists()]
+    for list_id in missing:
+        print(f"⚠️ {list_id} {targets[list_id]['name']}: {targets[list_id]['raw']} 파일이 없습니다. 건너뜁니다.")
+    list_ids = [i for i in list_ids if i not in missing]
+    if not list_ids:
+        return 1
+
+    # 큰 원본부터 맡겨야 마지막에 큰 리스트 하나만 남아 기다리지 않는다
+    list_ids.sort(key=lambda i: (WORK_DIR / targets[i]["raw"]).stat().st_size, reverse=True)
+    workers = max(1, min(args.workers, len(list_ids)))
+
+    print(f"🔄 원본 데이터로 {len(list_ids)}개 리스트 다시 만들기 (프로세스 {workers}개){' - 저장 안 함' if args.dry_run else ''}")
+    started = time.perf_counter()
+    results = {}
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(rebuild_list, list_id, args.dry_run, args.merge_nearby): list_id for list_id in list_ids}
+        for future in as_completed(futures):
+            list_id = futures[future]
+            try:
+                results[list_id] = future.result()
+            except Exception as e:
+                failed.append(list_id)
+                print(f"❌ {list_id} {targets[list_id]['name']}: {e}")
+
+    print()
+    print(f"{'ID':>4}  {'리스트':<12}{'원본':>8}{'핀':>8}{'시간(s)':>10}")
+    for list_id in sorted(results):
+        r = results[list_id]
+        print(f"{list_id:>4}  {r['name']:<12}{r['raw']:>8}{r['pins']:>8}{r['seconds']:>10.2f}")
+        if args.verbose:
+            for line in r["log"].splitlines():
+                print(f"        {line}")
+
+    total_pins = sum(r["pins"] for r in results.values())
+    print()
+    print(f"✅ {len(results)}개 리스트, 핀 {total_pins}개 ({time.perf_counter() - started:.1f}초)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
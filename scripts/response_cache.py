@@ -0,0 +1,146 @@
+"""
+API 응답 디스크 캐시
+(endpoint, 요청 파라미터)로 주소를 정하는 JSON 캐시
+- 항목별 TTL (None이면 만료 없음)
+- 전체 용량 제한 (가장 오래 사용하지 않은 항목부터 삭제)
+- 오프라인 모드: 캐시에 있는 응답만 사용
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# put()에서 ttl을 지정하지 않았을 때 캐시 기본값 사용
+DEFAULT_TTL = object()
+
+
+class CacheMiss(Exception):
+    """오프라인 모드에서 캐시에 없는 요청"""
+
+
+class ResponseCache:
+    """
+    JSON 응답 디스크 캐시
+
+    Args:
+        cache_dir: 캐시 디렉토리
+        ttl: 기본 유효 기간 (초, None이면 만료 없음)
+        max_bytes: 최대 캐시 용량 (None이면 제한 없음)
+        offline: True면 네트워크 대신 캐시만 사용
+    """
+
+    def __init__(self, cache_dir, ttl=None, max_bytes=None, offline=False):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict) -> str:
+        """요청 내용으로 캐시 키 생성"""
+        payload = json.dumps([endpoint, params], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, endpoint: str, params: dict):
+        """캐시된 응답 반환 (없거나 만료됐으면 None, 오프라인이면 CacheMiss)"""
+        path = self._path(self.make_key(endpoint, params))
+        entry = None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        if entry is not None:
+            ttl = entry.get("ttl")
+            # 오프라인 모드에서는 만료된 응답도 사용
+            if self.offline or ttl is None or time.time() - entry["stored_at"] < ttl:
+                try:
+                    os.utime(path)  # LRU 순서 갱신
+                except OSError:
+                    pass
+                with self._lock:
+                    self.hits += 1
+                return entry["data"]
+
+        with self._lock:
+            self.misses += 1
+        if self.offline:
+            raise CacheMiss(f"캐시에 없음: {endpoint} {params}")
+        return None
+
+    def put(self, endpoint: str, params: dict, data, ttl=DEFAULT_TTL):
+        """응답 저장"""
+        if ttl is DEFAULT_TTL:
+            ttl = self.ttl
+
+        path = self._path(self.make_key(endpoint, params))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "endpoint": endpoint,
+            "params": params,
+            "stored_at": time.time(),
+            "ttl": ttl,
+            "data": data,
+        }
+
+        # 다른 스레드가 읽는 중에 반쯤 쓴 파일이 보이지 않도록 임시 파일 후 교체
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        old_size = path.stat().st_size if path.exists() else 0
+        os.replace(tmp_path, path)
+
+        if self.max_bytes is not None:
+            with self._lock:
+                if self._size is None:
+                    self._size = self._scan_size()
+                else:
+                    self._size += path.stat().st_size - old_size
+                if self._size > self.max_bytes:
+                    self._evict()
+
+    def _entries(self):
+        return list(self.cache_dir.glob("*/*.json"))
+
+    def _scan_size(self) -> int:
+        return sum(p.stat().st_size for p in self._entries())
+
+    def _evict(self):
+        """용량의 90% 이하가 될 때까지 오래 사용하지 않은 항목 삭제"""
+        entries = []
+        for p in self._entries():
+            try:
+                stat = p.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        entries.sort()
+
+        size = sum(e[1] for e in entries)
+        target = self.max_bytes * 0.9
+        for _, entry_size, p in entries:
+            if size <= target:
+                break
+            try:
+                p.unlink()
+                size -= entry_size
+            except OSError:
+                pass
+        self._size = size
+
+    def stats(self) -> str:
+        """적중률 요약 문자열"""
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        return f"캐시 적중 {self.hits}/{total}건 ({rate:.0f}%)"
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+여러 리스트 일괄 수집 스케줄러
+브랜드/아파트 리스트의 (리스트, 지역) 작업을 한 스레드 풀에 섞어서 넣고,
+하나의 초당 요청 예산과 일일 할당량 안에서 처리한다.
+- 오래된 리스트(data/{id}.json 수정 시각 기준)부터 우선
+- 할당량이 부족하면 가장 최근에 갱신된 리스트부터 이번 실행에서 제외
+- 리스트 하나의 모든 지역이 끝나면 바로 data/{id}.json 저장
+
+사용법:
+    python scheduler.py              # 브랜드 + 아파트 전체
+    python scheduler.py brands       # fetch_brand.py 브랜드만
+    python scheduler.py apartments   # fetch_apartments.py 아파트만
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import common
+import http_client
+import telemetry
+from dedup import merge_nearby
+from throttle import QuotaExceeded
+
+# 할당량 추정에 쓰는 검색어당 평균 페이지 수
+ESTIMATED_PAGES_PER_QUERY = 2
+
+
+def make_job(name, list_id, keywords, filter_func=None, regions=None, merge=None):
+    """수집 작업 정의 (merge: 가까이 있는 같은 이름의 장소 병합 여부, 기본: --merge-nearby 플래그)"""
+    return {
+        "name": name,
+        "list_id": list_id,
+        "keywords": keywords,
+        "filter_func": filter_func,
+        "regions": regions or common.REGIONS,
+        "merge": common.has_flag("merge-nearby") if merge is None else merge,
+    }
+
+
+def staleness(job) -> float:
+    """마지막 저장 이후 지난 시간 (초, 파일이 없으면 무한대)"""
+    data_path = common.DATA_DIR / f"{job['list_id']}.json"
+    if not data_path.exists():
+        return float("inf")
+    return time.time() - data_path.stat().st_mtime
+
+
+def estimate_calls(job) -> int:
+    """예상 API 호출 수"""
+    return len(job["regions"]) * len(job["keywords"]) * ESTIMATED_PAGES_PER_QUERY
+
+
+def plan_jobs(jobs: list) -> list:
+    """오래된 순으로 정렬하고, 남은 할당량에 들어가는 작업만 남긴다"""
+    ordered = sorted(jobs, key=staleness, reverse=True)
+    remaining = common.kakao_quota.remaining
+    if remaining is None:
+        return ordered
+
+    planned = []
+    budget = remaining
+    for job in ordered:
+        calls = estimate_calls(job)
+        if calls > budget:
+            print(f"⏭️ {job['name']}: 남은 할당량 부족으로 이번 실행에서 제외 (예상 {calls}건)")
+            continue
+        budget -= calls
+        planned.append(job)
+    return planned
+
+
+def interleave_units(jobs: list) -> list:
+    """(작업 번호, 지역 번호) 단위를 라운드 로빈으로 섞기 (앞 작업이 우선)"""
+    units = []
+    longest = max((len(job["regions"]) for job in jobs), default=0)
+    for region_index in range(longest):
+        for job_index, job in enumerate(jobs):
+            if region_index < len(job["regions"]):
+                units.append((job_index, region_index))
+    return units
+
+
+def finish_job(job, region_results: list, failures: list):
+    """작업 결과 중복 제거 후 저장"""
+    all_places = []
+    for places in region_results:
+        all_places.extend(places)
+
+    unique_places = common.remove_duplicates(all_places)
+    if job["merge"]:
+        unique_places = merge_nearby(unique_places)
+    print(f"\n✅ {job['name']}: 총 {len(unique_places)}개 수집 완료 (중복 제거 후)")
+
+    pins = common.convert_to_pins(unique_places)
+    common.save_pins(pins, job["list_id"])
+    common.save_raw_data(unique_places, f"{job['name'].lower().replace(' ', '_')}_raw.json")
+
+    job["journal"].close(completed=not failures)
+    if failures:
+        print(f"⚠️ {job['name']}: 재시도 후에도 실패한 검색 {len(failures)}건 (--resume으로 다시 시도할 수 있습니다)")
+    return len(unique_places)
+
+
+def run_jobs(jobs: list) -> dict:
+    """
+    여러 수집 작업을 한 번에 실행
+
+    Returns:
+        {리스트 이름: 수집 개수} (완료된 작업만)
+    """
+    if not common.check_api_key():
+        return {}
+    common.save_quota_at_exit()
+
+    jobs = plan_jobs(jobs)
+    if not jobs:
+        return {}
+
+    print(f"🗓️ {len(jobs)}개 리스트 일괄 수집 (오래된 순)")
+    for job in jobs:
+        age = staleness(job)
+        age_text = "없음" if age == float("inf") else f"{age / 86400:.0f}일 전"
+        print(f"   {job['name']} (data/{job['list_id']}.json, 마지막 갱신 {age_text})")
+    quota_left = common.kakao_quota.remaining
+    if quota_left is not None:
+        print(f"   오늘 남은 할당량: {quota_left}건")
+    print(f"   동시 요청: {common.MAX_WORKERS}개, 초당 {common.REQUESTS_PER_SECOND:g}건")
+    print()
+
+    for job in jobs:
+        job["journal"] = common.open_journal(job["name"])
+        job["results"] = [None] * len(job["regions"])
+        job["remaining"] = len(job["regions"])
+        job["queries"] = {f"{region} {keyword}" for region in job["regions"] for keyword in job["keywords"]}
+
+    telemetry.start()
+    failures_before = len(common.failed_queries)
+    units = interleave_units(jobs)
+    progress = telemetry.Progress(len(units))
+    completed = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, common.MAX_WORKERS)) as executor:
+        futures = {}
+        for job_index, region_index in units:
+            job = jobs[job_index]
+            future = executor.submit(
+                common.fetch_places_in_region,
+                job["regions"][region_index],
+                job["keywords"],
+                job["filter_func"],
+                job["journal"],
+            )
+            futures[future] = (job_index, region_index)
+
+        for future in as_completed(futures):
+            job_index, region_index = futures[future]
+            job = jobs[job_index]
+            try:
+                job["results"][region_index] = future.result()
+            except QuotaExceeded as e:
+                print(f"\n⛔ {e} - 완료되지 않은 리스트는 저장하지 않습니다 (--resume으로 이어서 수집할 수 있습니다)")
+                executor.shutdown(wait=True, cancel_futures=True)
+                break
+
+            job["remaining"] -= 1
+            progress.step(f"{job['name']} {job['regions'][region_index]} → {len(job['results'][region_index])}개")
+
+            if job["remaining"] == 0:
+                failures = [f for f in common.failed_queries[failures_before:] if f[0] in job["queries"]]
+                completed[job["name"]] = finish_job(job, job["results"], failures)
+
+    for job in jobs:
+        if job["name"] not in completed:
+            job["journal"].close(completed=False)
+
+    http_client.print_stats()
+    if common.kakao_cache:
+        print(f"   {common.kakao_cache.stats()}")
+    print(f"   오늘 사용한 API 호출: {common.kakao_quota.used}건")
+    telemetry.write_report("scheduler", common.WORK_DIR, {"lists": completed})
+    return completed
+
+
+def all_jobs(which="all") -> list:
+    """설정된 모든 브랜드/아파트 작업"""
+    import fetch_apartments
+    import fetch_brand
+
+    jobs = []
+    if which in ("all", "brands"):
+        jobs.extend(fetch_brand.brand_jobs())
+    if which in ("all", "apartments"):
+        jobs.extend(fetch_apartments.apartment_jobs())
+    return jobs
+
+
+if __name__ == "__main__":
+    which = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith("--") else "all"
+    if which not in ("all", "brands", "apartments"):
+        print("사용법: python scheduler.py [all|brands|apartments] [--resume]")
+        sys.exit(1)
+
+    results = run_jobs(all_jobs(which))
+    print("\n" + "=" * 50)
+    print("📊 수집 결과 요약:")
+    for name, count in results.items():
+        print(f"   {name}: {count}개")
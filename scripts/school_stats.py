@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+학교 통계 연도별 저장소
+학교알리미에서 받은 학생수, 졸업생 진로현황을 해마다 덮어쓰지 않고 (학교 코드 × 공시 연도)로 쌓는다.
+열(통계 항목)마다 연도별로 학교 순서의 숫자 배열 하나를 두는 열 방식이라,
+API가 문자열/정수를 섞어 주는 값도 정수(학생수)와 실수(진학률)로 맞춰서 작게 저장된다.
+
+    {"years": [2024, 2025], "schools": [학교 코드...], "names": [학교명...],
+     "columns": {"student_total": {"2025": [437, 512, null, ...]}, ...}}
+
+사용법:
+    python school_stats.py import 고등학교_schoolinfo_raw.json --year 2025   # 기존 원본 데이터 추가
+    python school_stats.py show S010000379                                 # 학교 하나의 연도별 값
+    python school_stats.py trends student_total --top 10                   # 많이 늘고 준 학교
+"""
+
+import argparse
+import json
+import math
+import sys
+from array import array
+from pathlib import Path
+
+from common import WORK_DIR
+
+STATS_PATH = WORK_DIR / "school_stats.json"
+
+# 통계 항목 → 배열 타입 ("l": 정수, 없으면 -1 / "d": 실수, 없으면 NaN)
+COLUMNS = {
+    "student_total": "l",
+    "student_male": "l",
+    "student_female": "l",
+    "student_g1": "l",
+    "student_g2": "l",
+    "student_g3": "l",
+    "grad_male": "l",
+    "grad_female": "l",
+    "advancement_rate": "d",
+}
+
+# 졸업생 진로현황은 학생수 공시 연도의 전년도 자료
+GRADUATION_COLUMNS = {"grad_male", "grad_female", "advancement_rate"}
+
+MISSING_INT = -1
+
+# 핀에 넣는 추이 (최근 몇 년, 어떤 항목)
+SPARKLINE_YEARS = 5
+SPARKLINE_COLUMNS = {"student_total": "student_trend", "advancement_rate": "advancement_trend"}
+SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+
+
+def to_number(value, typecode):
+    """API 값(정수, " 100.0" 같은 문자열, 빈 값)을 숫자로 (읽을 수 없으면 None)"""
+    if value is None:
+        return None
+    try:
+        number = float(str(value).replace(",", "").strip())
+    except ValueError:
+        return None
+    if math.isnan(number):
+        return None
+    return int(number) if typecode == "l" else number
+
+
+def sparkline(values: list) -> str:
+    """숫자 리스트 → ▁▃▇ 모양 문자열 (없는 값은 공백)"""
+    present = [v for v in values if v is not None]
+    if not present:
+        return ""
+    low, high = min(present), max(present)
+    span = high - low
+    chars = []
+    for v in values:
+        if v is None:
+            chars.append(" ")
+        elif span == 0:
+            chars.append(SPARK_BLOCKS[len(SPARK_BLOCKS) // 2])
+        else:
+            chars.append(SPARK_BLOCKS[round((v - low) / span * (len(SPARK_BLOCKS) - 1))])
+    return "".join(chars)
+
+
+class SchoolStats:
+    """
+    학교 통계 시계열 (학교 코드 × 연도, 항목별 열)
+
+    Args:
+        path: 저장 파일 (기본: scripts/school_stats.json)
+    """
+
+    def __init__(self, path=STATS_PATH):
+        self.path = Path(path)
+        self.years = []
+        self.schools = []
+        self.names = []
+        self._rows = {}
+        # 항목 → {연도: 학교 순서의 array}
+        self.columns = {column: {} for column in COLUMNS}
+
+    @classmethod
+    def load(cls, path=STATS_PATH):
+        """저장 파일 읽기 (없으면 빈 저장소)"""
+        stats = cls(path)
+        if not stats.path.exists():
+            return stats
+
+        with open(stats.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        stats.years = data.get("years", [])
+        stats.schools = data.get("schools", [])
+        stats.names = data.get("names", [""] * len(stats.schools))
+        stats._rows = {code: i for i, code in enumerate(stats.schools)}
+        for column, typecode in COLUMNS.items():
+            for year, values in data.get("columns", {}).get(column, {}).items():
+                stats.columns[column][int(year)] = array(typecode, (stats._encode(v, typecode) for v in values))
+        return stats
+
+    def save(self):
+        """저장 파일 쓰기 (없는 값은 null)"""
+        data = {
+            "years": self.years,
+            "schools": self.schools,
+            "names": self.names,
+            "columns": {
+                column: {str(year): [self._decode(v, COLUMNS[column]) for v in values] for year, values in sorted(by_year.items())}
+                for column, by_year in self.columns.items()
+                if by_year
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        print(f"📈 학교 통계 저장: {self.path} (학교 {len(self.schools)}개, {len(self.years)}개 연도)")
+
+    @staticmethod
+    def _encode(value, typecode):
+        if value is None:
+            return MISSING_INT if typecode == "l" else math.nan
+        return value
+
+    @staticmethod
+    def _decode(value, typecode):
+        if typecode == "l":
+            return None if value == MISSING_INT else value
+        return None if math.isnan(value) else value
+
+    def _row(self, code: str, name: str = "") -> int:
+        """학교 행 번호 (처음 보는 학교면 모든 열에 빈 값으로 추가)"""
+        row = self._rows.get(code)
+        if row is None:
+            row = self._rows[code] = len(self.schools)
+            self.schools.append(code)
+            self.names.append(name)
+            for column, by_year in self.columns.items():
+                for values in by_year.values():
+                    values.append(self._encode(None, COLUMNS[column]))
+        elif name:
+            self.names[row] = name
+        return row
+
+    def _values(self, column: str, year: int) -> array:
+        """항목·연도 배열 (없으면 빈 값으로 만듦)"""
+        by_year = self.columns[column]
+        if year not in by_year:
+            typecode = COLUMNS[column]
+            by_year[year] = array(typecode, [self._encode(None, typecode)] * len(self.schools))
+            if year not in self.years:
+                self.years.append(year)
+                self.years.sort()
+        return by_year[year]
+
+    def record(self, school_info_list: list, year: int) -> int:
+        """
+        한 해의 학교 정보 추가 (같은 학교·연도는 새 값으로 교체)
+
+        Args:
+            school_info_list: fetch_school_info가 만든 학교 정보 리스트
+            year: 학생수 공시 연도 (졸업생 진로현황은 year - 1로 저장)
+
+        Returns:
+            추가/교체한 학교 수
+        """
+        count = 0
+        for info in school_info_list:
+            code = info.get("school_code")
+            if not code:
+                continue
+            row = self._row(code, info.get("name", ""))
+            for column, typecode in COLUMNS.items():
+                value = to_number(info.get(column), typecode)
+                if value is None:
+                    continue
+                column_year = year - 1 if column in GRADUATION_COLUMNS else year
+                self._values(column, column_year)[row] = value
+            count += 1
+        return count
+
+    def series(self, code: str, column: str) -> list:
+        """[(연도, 값)] - 값이 있는 연도만"""
+        row = self._rows.get(code)
+        if row is None:
+            return []
+        typecode = COLUMNS[column]
+        result = []
+        for year in self.years:
+            values = self.columns[column].get(year)
+            if values is not None:
+                value = self._decode(values[row], typecode)
+                if value is not None:
+                    result.append((year, value))
+        return result
+
+    def latest(self, code: str, column: str):
+        """가장 최근 (연도, 값) 또는 None"""
+        points = self.series(code, column)
+        return points[-1] if points else None
+
+    def trend(self, code: str, column: str):
+        """연평균 변화량 (최소제곱 기울기, 값이 2개 미만이면 None)"""
+        points = self.series(code, column)
+        if len(points) < 2:
+            return None
+        n = len(points)
+        mean_x = sum(x for x, _ in points) / n
+        mean_y = sum(y for _, y in points) / n
+        var_x = sum((x - mean_x) ** 2 for x, _ in points)
+        return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+    def pin_fields(self, code: str) -> dict:
+        """핀에 넣을 값: 항목별 최근 값 + 최근 SPARKLINE_YEARS년 추이 (2개 연도 이상일 때)"""
+        fields = {}
+        for column in COLUMNS:
+            point = self.latest(code, column)
+            if point is not None:
+                fields[column] = point[1]
+
+        for column, field in SPARKLINE_COLUMNS.items():
+            points = dict(self.series(code, column))
+            if len(points) < 2:
+                continue
+            years = range(max(points) - SPARKLINE_YEARS + 1, max(points) + 1)
+            fields[field] = sparkline([points.get(year) for year in years if year >= min(points)])
+        return fields
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학교 통계 연도별 저장소")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    importer = subparsers.add_parser("import", help="원본 데이터(*_schoolinfo_raw.json) 추가")
+    importer.add_argument("path")
+    importer.add_argument("--year", type=int, required=True, help="학생수 공시 연도")
+
+    show = subparsers.add_parser("show", help="학교 하나의 연도별 값")
+    show.add_argument("code")
+
+    trends = subparsers.add_parser("trends", help="연평균 변화량이 큰 학교")
+    trends.add_argument("column", choices=list(COLUMNS))
+    trends.add_argument("--top", type=int, default=10)
+
+    args = parser.parse_args()
+    stats = SchoolStats.load()
+
+    if args.command == "import":
+        path = Path(args.path)
+        if not path.is_absolute():
+            path = WORK_DIR / path
+        with open(path, "r", encoding="utf-8") as f:
+            count = stats.record(json.load(f), args.year)
+        print(f"✅ {path.name}: {count}개 학교 ({args.year}년) 추가")
+        stats.save()
+
+    elif args.command == "show":
+        row = stats._rows.get(args.code)
+        if row is None:
+            print(f"❌ 없는 학교 코드: {args.code}")
+            return 1
+        print(f"🏫 {stats.names[row]} ({args.code})")
+        for column in COLUMNS:
+            points = stats.series(args.code, column)
+            if points:
+                values = ", ".join(f"{year}: {value:g}" for year, value in points)
+                print(f"   {column:<18}{sparkline([v for _, v in points]):<8}{values}")
+
+    elif args.command == "trends":
+        ranked = [(stats.trend(code, args.column), code) for code in stats.schools]
+        ranked = sorted((t, code) for t, code in ranked if t is not None)
+        if not ranked:
+            print("ℹ️ 2개 연도 이상 값이 있는 학교가 없습니다")
+            return 0
+        rising = [(t, code) for t, code in reversed(ranked) if t > 0][:args.top]
+        falling = [(t, code) for t, code in ranked if t < 0][:args.top]
+        for title, part in (("📈 증가", rising), ("📉 감소", falling)):
+            print(title)
+            for t, code in part:
+                print(f"   {stats.names[stats._rows[code]]:<20}{t:+.1f}/년  {sparkline([v for _, v in stats.series(code, args.column)])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
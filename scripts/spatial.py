@@ -0,0 +1,175 @@
+"""
+공간 색인
+좌표를 일정 크기의 격자 칸으로 나눠 담아 두고, 가까운 칸만 살펴서 주변 점을 찾는다.
+모든 쌍을 비교하지 않아서 점이 수십만 개여도 거의 선형 시간에 동작한다.
+"""
+
+import math
+
+# 위도 1도의 길이 (m)
+METERS_PER_DEGREE = 111320
+
+# 대한민국 북쪽 끝 위도 - 경도 1도가 가장 짧은 곳 기준으로 칸 크기를 정하면 어디서나 칸이 radius보다 넓다
+REFERENCE_LAT = 38.7
+
+
+class GridIndex:
+    """
+    격자 공간 색인
+
+    Args:
+        cell_m: 칸 크기 (m) - 찾을 반경 이상이어야 주변 3×3칸만 보면 된다
+    """
+
+    def __init__(self, cell_m: float, reference_lat: float = REFERENCE_LAT):
+        self.cell_m = cell_m
+        self.cell_lat = cell_m / METERS_PER_DEGREE
+        self.cell_lng = cell_m / (METERS_PER_DEGREE * math.cos(math.radians(reference_lat)))
+        self._cells = {}
+
+    def __len__(self):
+        return sum(len(items) for items in self._cells.values())
+
+    def cell(self, lat: float, lng: float) -> tuple:
+        return (math.floor(lat / self.cell_lat), math.floor(lng / self.cell_lng))
+
+    def insert(self, lat: float, lng: float, item):
+        """점 추가"""
+        self._cells.setdefault(self.cell(lat, lng), []).append((lat, lng, item))
+
+    def nearby(self, lat: float, lng: float):
+        """주변 3×3칸의 (lat, lng, item) - 거리 확인은 호출하는 쪽에서"""
+        row, col = self.cell(lat, lng)
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                yield from self._cells.get((row + d_row, col + d_col), ())
+
+    def within(self, lat: float, lng: float, radius_m: float):
+        """반경 radius_m 안의 (거리 m, item), 가까운 순"""
+        found = []
+        for other_lat, other_lng, item in self.nearby(lat, lng):
+            distance = approx_distance_m(lat, lng, other_lat, other_lng)
+            if distance <= radius_m:
+                found.append((distance, item))
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+
+class KDTree:
+    """
+    2차원 KD 트리 (정적 - 한 번 만들고 범위 검색만)
+    점 번호를 축을 번갈아 가며 중앙값으로 나눠 정렬해 두고, 검색할 때는 범위에 걸치는 쪽만 내려간다.
+
+    Args:
+        points: (x, y) 리스트 - 거리는 평면 거리라 투영한 좌표를 넣는다
+        leaf_size: 이 개수 이하인 구간은 나누지 않고 전부 확인
+    """
+
+    def __init__(self, points: list, leaf_size: int = 16):
+        self.points = points
+        self.leaf_size = leaf_size
+        self.ids = list(range(len(points)))
+        stack = [(0, len(points) - 1, 0)]
+        while stack:
+            left, right, axis = stack.pop()
+            if right - left <= leaf_size:
+                continue
+            self.ids[left:right + 1] = sorted(self.ids[left:right + 1], key=lambda i: points[i][axis])
+            middle = (left + right) // 2
+            stack.append((left, middle - 1, 1 - axis))
+            stack.append((middle + 1, right, 1 - axis))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def within(self, x: float, y: float, radius: float) -> list:
+        """(x, y)에서 radius 안의 점 번호 (자기 자신 포함, 순서 없음)"""
+        found = []
+        radius_sq = radius * radius
+        points, ids = self.points, self.ids
+        stack = [(0, len(ids) - 1, 0)]
+        while stack:
+            left, right, axis = stack.pop()
+            if right - left <= self.leaf_size:
+                for i in ids[left:right + 1]:
+                    px, py = points[i]
+                    if (px - x) ** 2 + (py - y) ** 2 <= radius_sq:
+                        found.append(i)
+                continue
+
+            middle = (left + right) // 2
+            i = ids[middle]
+            px, py = points[i]
+            if (px - x) ** 2 + (py - y) ** 2 <= radius_sq:
+                found.append(i)
+            value = (x, y)[axis]
+            split = (px, py)[axis]
+            if value - radius <= split:
+                stack.append((left, middle - 1, 1 - axis))
+            if value + radius >= split:
+                stack.append((middle + 1, right, 1 - axis))
+        return found
+
+
+def approx_distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """짧은 거리용 근사 거리 (m, equirectangular) - 수 km 이내에서는 haversine과 거의 같다"""
+    x = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return math.hypot(x, y) * 6371000
+
+
+class UnionFind:
+    """서로소 집합 (경로 압축 + 크기 기준 합치기)"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, a: int, b: int):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+    def groups(self) -> list:
+        """집합별 원소 번호 리스트 (원소 번호 순, 집합은 가장 작은 번호 순)"""
+        groups = {}
+        for i in range(len(self.parent)):
+            groups.setdefault(self.find(i), []).append(i)
+        return sorted(groups.values(), key=lambda members: members[0])
+
+
+def cluster_points(points: list, radius_m: float, key=None) -> list:
+    """
+    반경 안에서 이어지는 점들을 묶기 (A-B, B-C가 가까우면 A, B, C가 한 묶음)
+
+    Args:
+        points: (lat, lng) 리스트
+        radius_m: 연결 거리 (m)
+        key: 점 번호 → 묶음 조건 값 (같은 값끼리만 묶음, 선택)
+
+    Returns:
+        묶음별 점 번호 리스트 (points 순서 기준)
+    """
+    index = GridIndex(radius_m)
+    sets = UnionFind(len(points))
+
+    for i, (lat, lng) in enumerate(points):
+        group = key(i) if key else None
+        for other_lat, other_lng, (other, other_group) in index.nearby(lat, lng):
+            if other_group == group and approx_distance_m(lat, lng, other_lat, other_lng) <= radius_m:
+                sets.union(i, other)
+        index.insert(lat, lng, (i, group))
+
+    return sets.groups()
@@ -0,0 +1,199 @@
+"""
+사각형 분할 검색 (quadtree sweep)
+카카오 키워드 검색의 rect 파라미터로 영역을 검색하고,
+결과가 45개 제한을 넘는 셀만 4등분해서 다시 검색한다.
+DETAILED_REGIONS 없이도 밀집 지역까지 빠짐없이 수집할 수 있다.
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import common
+
+# 대한민국 전체 영역 (min_lng, min_lat, max_lng, max_lat)
+KOREA_BOUNDS = (124.5, 33.0, 131.0, 38.7)
+
+# 쿼리당 최대 조회 가능 개수 (15개 × 3페이지)
+MAX_PAGEABLE = 45
+MAX_PAGES = 3
+
+# 이보다 작은 셀은 더 나누지 않음 (약 200m)
+MIN_CELL_SIZE = 0.002
+
+
+def rect_param(rect) -> str:
+    """카카오 API rect 파라미터 문자열"""
+    return ",".join(f"{v:.6f}" for v in rect)
+
+
+def split_rect(rect) -> list:
+    """사각형을 4등분"""
+    min_x, min_y, max_x, max_y = rect
+    mid_x = (min_x + max_x) / 2
+    mid_y = (min_y + max_y) / 2
+    return [
+        (min_x, min_y, mid_x, mid_y),
+        (mid_x, min_y, max_x, mid_y),
+        (min_x, mid_y, mid_x, max_y),
+        (mid_x, mid_y, max_x, max_y),
+    ]
+
+
+class CellError(Exception):
+    """셀 검색 실패 (실패한 페이지와 원래 오류)"""
+
+    def __init__(self, page: int, error: Exception):
+        super().__init__(str(error))
+        self.page = page
+        self.error = error
+
+
+def search_cell(journal, keyword: str, page: int, rect) -> dict:
+    """셀 한 페이지 검색 (할당량 초과 외의 오류는 페이지 번호를 붙여 CellError로)"""
+    try:
+        return common.journaled_search(journal, keyword, page, rect=rect_param(rect))
+    except common.QuotaExceeded:
+        raise
+    except Exception as e:
+        raise CellError(page, e) from e
+
+
+def sweep_cell(keyword: str, rect, depth: int, filter_func=None, journal=None):
+    """
+    셀 하나 검색
+
+    Returns:
+        (장소 리스트, 셀 통계, 나눌 하위 셀 리스트)
+    """
+    data = search_cell(journal, keyword, 1, rect)
+    meta = data.get("meta", {})
+    total_count = meta.get("total_count", 0)
+    calls = 1
+
+    too_small = (rect[2] - rect[0]) < MIN_CELL_SIZE or (rect[3] - rect[1]) < MIN_CELL_SIZE
+    if total_count > MAX_PAGEABLE and not too_small:
+        stats = {
+            "rect": list(rect),
+            "depth": depth,
+            "calls": calls,
+            "total_count": total_count,
+            "found": 0,
+            "split": True,
+        }
+        return [], stats, split_rect(rect)
+
+    documents = list(data.get("documents", []))
+    page = 1
+    while not meta.get("is_end", True) and page < MAX_PAGES:
+        page += 1
+        data = search_cell(journal, keyword, page, rect)
+        meta = data.get("meta", {})
+        documents.extend(data.get("documents", []))
+        calls += 1
+
+    places = [common.doc_to_place(doc) for doc in documents if not filter_func or filter_func(doc)]
+    stats = {
+        "rect": list(rect),
+        "depth": depth,
+        "calls": calls,
+        "total_count": total_count,
+        "found": len(places),
+        "split": False,
+    }
+    if total_count > MAX_PAGEABLE:
+        stats["saturated"] = True
+    return places, stats, []
+
+
+def sweep_keyword(keyword: str, filter_func=None, bounds=KOREA_BOUNDS, journal=None):
+    """
+    영역 전체를 quadtree로 검색
+    실패한 셀(오프라인 모드의 CacheMiss 포함)은 common.failed_queries에 남긴다.
+    그 아래 하위 셀은 검색하지 못하므로 fetch_all이 저널을 지우지 않고, --resume으로 다시 시도한다.
+
+    Returns:
+        (장소 리스트, 셀 통계 리스트)
+    """
+    places = []
+    cell_stats = []
+
+    with ThreadPoolExecutor(max_workers=max(1, common.MAX_WORKERS)) as executor:
+        pending = {executor.submit(sweep_cell, keyword, bounds, 0, filter_func, journal): (0, bounds)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth, rect = pending.pop(future)
+                try:
+                    cell_places, stats, children = future.result()
+                except common.QuotaExceeded:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+                except CellError as e:
+                    print(f"  오류 발생 ({keyword}, depth {depth}, page {e.page}): {e}")
+                    common.record_failure(keyword, e.page, e.error, rect=rect_param(rect))
+                    continue
+                places.extend(cell_places)
+                cell_stats.append(stats)
+                for child in children:
+                    pending[executor.submit(sweep_cell, keyword, child, depth + 1, filter_func, journal)] = (depth + 1, child)
+
+    # 셀 완료 순서와 관계없이 같은 결과가 나오도록 정렬
+    places.sort(key=lambda p: (p["id"] or ""))
+    cell_stats.sort(key=lambda s: (s["depth"], s["rect"]))
+    return places, cell_stats
+
+
+def summarize_by_region(cell_stats: list) -> dict:
+    """셀 통계의 region 기준 호출 수 집계"""
+    summary = Counter()
+    for stats in cell_stats:
+        summary[stats.get("region", "기타")] += stats["calls"]
+    return dict(summary.most_common())
+
+
+def sweep(keywords: list, filter_func=None, bounds=KOREA_BOUNDS, journal=None):
+    """
+    여러 키워드를 quadtree로 검색
+
+    Returns:
+        (장소 리스트, 통계 dict)
+    """
+    all_places = []
+    report = {"keywords": {}, "regions": Counter()}
+
+    for keyword in keywords:
+        print(f"🔲 '{keyword}' 영역 분할 검색 중...")
+        places, cell_stats = sweep_keyword(keyword, filter_func, bounds, journal)
+
+        # 셀마다 결과가 가장 많은 광역단체를 기록 (결과가 없는 셀은 '빈 셀')
+        for stats in cell_stats:
+            if stats["split"]:
+                stats["region"] = "분할"
+            else:
+                min_x, min_y, max_x, max_y = stats["rect"]
+                regions = Counter(
+                    common.extract_region(p["road_address"] or p["address"])
+                    for p in places
+                    if min_x <= p["lng"] <= max_x and min_y <= p["lat"] <= max_y
+                )
+                stats["region"] = regions.most_common(1)[0][0] if regions else "빈 셀"
+
+        calls = sum(s["calls"] for s in cell_stats)
+        leaves = sum(1 for s in cell_stats if not s["split"])
+        saturated = sum(1 for s in cell_stats if s.get("saturated"))
+        print(f"   → {len(places)}개, 호출 {calls}건, 셀 {leaves}개 (최대 깊이 {max(s['depth'] for s in cell_stats) if cell_stats else 0})")
+        if saturated:
+            print(f"   ⚠️ 최소 크기에서도 45개를 넘는 셀 {saturated}개")
+
+        region_calls = summarize_by_region(cell_stats)
+        report["regions"].update(region_calls)
+        report["keywords"][keyword] = {
+            "calls": calls,
+            "found": len(places),
+            "cells": cell_stats,
+            "region_calls": region_calls,
+        }
+        all_places.extend(places)
+
+    report["regions"] = dict(report["regions"].most_common())
+    return all_places, report
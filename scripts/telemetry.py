@@ -0,0 +1,156 @@
+"""
+수집 실행 계측
+- 진행 상황에 초당 요청 수와 남은 시간(ETA) 표시
+- 지역별 수집 개수와 걸린 시간 기록
+- 실행이 끝나면 엔드포인트별 요청 통계(응답 시간 백분위수, 재시도, 수신 바이트)와 함께
+  {이름}_run.json / {이름}_run.csv 리포트로 저장 (원본 데이터 백업과 같은 폴더)
+"""
+
+import csv
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import http_client
+
+_lock = threading.Lock()
+_started_at = None
+_started = None
+_regions = []
+
+
+def start():
+    """실행 시작 시각 기록 (이전 지역 기록은 지움)"""
+    global _started_at, _started
+    with _lock:
+        _started_at = datetime.now().isoformat(timespec="seconds")
+        _started = time.perf_counter()
+        _regions.clear()
+
+
+def elapsed() -> float:
+    """start() 이후 지난 시간 (초)"""
+    if _started is None:
+        start()
+    return time.perf_counter() - _started
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}시간 {seconds % 3600 // 60}분"
+    if seconds >= 60:
+        return f"{seconds // 60}분 {seconds % 60}초"
+    return f"{seconds}초"
+
+
+def record_region(region: str, found: int, seconds: float, **extra):
+    """지역 하나의 수집 결과 기록"""
+    entry = {"region": region, "found": found, "seconds": round(seconds, 3)}
+    entry.update(extra)
+    with _lock:
+        _regions.append(entry)
+
+
+def annotate_region(region: str, **fields):
+    """기록된 지역에 값 추가 (예: 중복 제거 후 새로 추가된 개수)"""
+    with _lock:
+        for entry in _regions:
+            if entry["region"] == region:
+                entry.update(fields)
+
+
+class Progress:
+    """
+    진행 상황 표시 (완료 개수, 초당 요청 수, 남은 시간)
+
+    Args:
+        total: 전체 작업 수
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._requests_before = http_client.total_requests()
+
+    def advance(self) -> str:
+        """작업 하나 완료 처리 후 상태 문자열 반환"""
+        with self._lock:
+            self.done += 1
+            done = self.done
+        spent = time.perf_counter() - self._started
+        rate = (http_client.total_requests() - self._requests_before) / spent if spent > 0 else 0
+        status = f"{rate:.1f} req/s"
+        if done < self.total:
+            status += f", 남은 시간 약 {format_duration(spent / done * (self.total - done))}"
+        return status
+
+    def step(self, message: str):
+        """작업 하나 완료 출력: [완료/전체] message (상태)"""
+        status = self.advance()
+        print(f"[{self.done}/{self.total}] {message} ({status})")
+
+
+def build_report(name: str, extra: dict = None) -> dict:
+    """실행 리포트"""
+    wall = elapsed()
+    endpoints = http_client.get_stats()
+    for counts in endpoints.values():
+        counts["requests_per_second"] = round(counts["requests"] / wall, 2) if wall > 0 else 0
+
+    with _lock:
+        regions = list(_regions)
+
+    report = {
+        "name": name,
+        "started_at": _started_at,
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "wall_seconds": round(wall, 2),
+        "requests": sum(c["requests"] for c in endpoints.values()),
+        "bytes": sum(c["bytes"] for c in endpoints.values()),
+        "endpoints": endpoints,
+        "regions": regions,
+    }
+    if extra:
+        report.update(extra)
+    return report
+
+
+def write_report(name: str, directory, extra: dict = None) -> dict:
+    """
+    실행 리포트를 JSON과 CSV로 저장
+
+    CSV는 실행끼리 비교하기 쉽도록 (section, key, metric, value) 한 줄에 값 하나
+    """
+    report = build_report(name, extra)
+    base = Path(directory) / f"{name.lower().replace(' ', '_')}_run"
+
+    with open(base.with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    with open(base.with_suffix(".csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["section", "key", "metric", "value"])
+        for metric in ("wall_seconds", "requests", "bytes"):
+            writer.writerow(["run", name, metric, report[metric]])
+        for key, value in (extra or {}).items():
+            if isinstance(value, (int, float, str)):
+                writer.writerow(["run", name, key, value])
+        for endpoint, counts in sorted(report["endpoints"].items()):
+            for metric, value in counts.items():
+                if metric == "latency_ms":
+                    for p, ms in value.items():
+                        writer.writerow(["endpoint", endpoint, f"latency_{p}_ms", ms])
+                else:
+                    writer.writerow(["endpoint", endpoint, metric, value])
+        for entry in report["regions"]:
+            for metric, value in entry.items():
+                if metric != "region":
+                    writer.writerow(["region", entry["region"], metric, value])
+
+    print(f"📈 실행 리포트 저장: {base.with_suffix('.json')} (.csv)")
+    return report
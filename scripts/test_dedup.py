@@ -0,0 +1,22 @@
+"""dedup.py 회귀 테스트 (python -m pytest)"""
+
+from dedup import merge_nearby, normalize_name
+
+
+def test_normalize_name_keeps_complex_units():
+    assert normalize_name("래미안부평아파트") != normalize_name("래미안부평아파트(2단지)")
+    assert normalize_name("힐스테이트(1회차)") != normalize_name("힐스테이트(2회차)")
+    assert normalize_name("인천 래미안부평아파트 (2단지)") == normalize_name("래미안부평아파트 2단지")
+    assert normalize_name("강남구립 논현도서관(별관)") == normalize_name("논현도서관")
+
+
+def test_merge_nearby_keeps_distinct_complexes():
+    places = [
+        {"id": "1", "name": "래미안부평아파트", "lat": 37.49, "lng": 126.72},
+        {"id": "2", "name": "래미안부평아파트(2단지)", "lat": 37.4901, "lng": 126.7201},
+        {"id": "3", "name": "논현도서관 별관", "lat": 37.51, "lng": 127.03},
+        {"id": "4", "name": "강남구립 논현도서관", "lat": 37.5101, "lng": 127.0301},
+    ]
+    kept = merge_nearby(places, 100)
+    assert [place["id"] for place in kept] == ["1", "2", "3"]
+    assert kept[2]["merged_ids"] == ["4"]
@@ -0,0 +1,42 @@
+"""join.py 회귀 테스트 (python -m pytest)"""
+
+from join import join_records, same_locality, address_localities
+
+
+def pin_key(pin):
+    return pin["title"], pin["sido"], pin["address"]
+
+
+def record_key(record):
+    return record["name"], record["sido"], record["sgg"]
+
+
+def test_sejong_locality_matches_full_city_name():
+    # 학교알리미 시군구는 "세종시", 카카오 주소는 "세종특별자치시"
+    assert same_locality("세종시", address_localities("세종특별자치시 조치원읍 신안리 123"))
+
+
+def test_sejong_school_joins_exactly():
+    pins = [{"title": "세종중학교", "sido": "세종", "address": "세종특별자치시 조치원읍 신안리 123"}]
+    records = [{"name": "세종중학교", "sido": "세종", "sgg": "세종시"}]
+    [match] = join_records(pins, records, pin_key, record_key)
+    assert match.method == "exact"
+    assert match.record is records[0]
+
+
+def test_sejong_school_joins_fuzzy():
+    pins = [{"title": "세종 새롬중학교", "sido": "세종", "address": "세종특별자치시 새롬동 1"}]
+    records = [{"name": "새롬중학교", "sido": "세종", "sgg": "세종시"}]
+    [match] = join_records(pins, records, pin_key, record_key, threshold=0.7)
+    assert match.method == "fuzzy"
+
+
+def test_other_locality_is_still_rejected():
+    pins = [{"title": "중앙중학교", "sido": "서울", "address": "서울특별시 강남구 역삼동 1"}]
+    records = [
+        {"name": "중앙중학교", "sido": "서울", "sgg": "강남구"},
+        {"name": "중앙중학교", "sido": "서울", "sgg": "강동구"},
+    ]
+    [match] = join_records(pins, records, pin_key, record_key)
+    assert match.method == "locality"
+    assert match.record is records[0]
@@ -0,0 +1,24 @@
+"""journal.py 회귀 테스트 (python -m pytest)"""
+
+from journal import Journal
+
+
+def test_resume_after_record_cut_mid_character(tmp_path):
+    path = tmp_path / "도서관.jsonl"
+    journal = Journal(path)
+    journal.record(("서울", "도서관", 1), {"documents": []})
+    journal.close(completed=False)
+
+    # 기록 도중 중단: 마지막 줄이 '서울'의 첫 바이트들에서 끊김
+    with open(path, "ab") as f:
+        f.write(b'{"unit": ["' + "서울".encode("utf-8")[:4])
+
+    journal = Journal(path, resume=True)
+    assert len(journal) == 1
+    journal.record(("부산", "도서관", 1), {"documents": []})
+    journal.close(completed=False)
+
+    journal = Journal(path, resume=True)
+    assert journal.get(("서울", "도서관", 1)) == {"documents": []}
+    assert journal.get(("부산", "도서관", 1)) == {"documents": []}
+    journal.close(completed=False)
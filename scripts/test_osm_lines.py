@@ -0,0 +1,29 @@
+"""osm_lines.NodeStore 회귀 테스트 (python -m pytest)"""
+
+import random
+
+import pytest
+
+from osm_lines import NodeStore
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_lookup_between_node_sections(tmp_path, spill):
+    # node와 way가 번갈아 오는 응답: 조회 사이에 노드가 계속 늘어남
+    ids = list(range(1, 5001))
+    random.Random(0).shuffle(ids)
+    store = NodeStore(tmp_path if spill else None)
+    for k in range(0, len(ids), 300):
+        for node_id in ids[k:k + 300]:
+            store.add(node_id, node_id * 0.5, node_id * 0.25)
+        coords, missing = store.lookup([ids[k], ids[0], 0])
+        assert missing == 1
+        assert list(coords[:4]) == [ids[k] * 0.5, ids[k] * 0.25, ids[0] * 0.5, ids[0] * 0.25]
+    assert len(store) == len(ids)
+    assert len(store._runs) < 8
+
+    coords, missing = store.lookup(sorted(ids))
+    assert missing == 0
+    assert list(coords[::2]) == [node_id * 0.5 for node_id in sorted(ids)]
+    store.close()
+    assert list(tmp_path.iterdir()) == []
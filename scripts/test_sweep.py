@@ -0,0 +1,47 @@
+"""sweep.py / fetch_all 저널 회귀 테스트 (python -m pytest)"""
+
+import pytest
+
+import common
+import sweep
+
+FAILING_RECT = sweep.rect_param(sweep.split_rect(sweep.KOREA_BOUNDS)[1])
+
+
+def fake_search(query, page=1, rect=None, fresh=False):
+    """전국 셀은 4등분, 하위 셀 하나는 실패, 나머지는 장소 하나씩"""
+    if rect == sweep.rect_param(sweep.KOREA_BOUNDS):
+        return {"meta": {"total_count": 100, "is_end": False}, "documents": []}
+    if rect == FAILING_RECT:
+        raise RuntimeError("연결 끊김")
+    return {
+        "meta": {"total_count": 1, "is_end": True},
+        "documents": [{"id": rect, "place_name": f"도서관 {rect}", "x": rect.split(",")[0], "y": rect.split(",")[1]}],
+    }
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(common, "search_keyword", fake_search)
+    monkeypatch.setattr(common, "API_KEY", "test")
+    monkeypatch.setattr(common, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(common, "WORK_DIR", tmp_path)
+    monkeypatch.setattr(common, "JOURNAL_DIR", tmp_path / ".journal")
+    monkeypatch.setattr(common, "failed_queries", [])
+    return tmp_path
+
+
+def test_failed_cell_is_recorded(workdir):
+    places, _ = sweep.sweep_keyword("도서관")
+    assert len(places) == 3
+    assert common.failed_queries == [("도서관", 1, FAILING_RECT, "연결 끊김")]
+
+
+def test_journal_survives_failed_sweep_cell(workdir):
+    common.fetch_all("도서관", ["도서관"], 99, sweep=True)
+
+    assert common.failed_queries and common.failed_queries[0][2] == FAILING_RECT
+    journal = workdir / ".journal" / "도서관.jsonl"
+    assert journal.exists()
+    # 성공한 셀은 기록되어 있어 --resume에서 실패한 셀만 다시 요청한다
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 4
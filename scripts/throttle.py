@@ -0,0 +1,145 @@
+"""
+요청 속도 제한 유틸리티
+- 여러 스레드가 하나의 초당 요청 예산을 공유하도록 하는 토큰 버킷
+- 실행 간에 공유되는 일일 요청 할당량
+"""
+
+import json
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷
+
+    Args:
+        rate: 초당 허용 요청 수 (0 이하면 제한 없음)
+        burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.target_rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def slow_down(self, pause: float = 0.0, factor: float = 0.5, min_rate: float = 0.5):
+        """
+        서버가 요청을 거절했을 때(429) 전체 속도를 낮춘다
+
+        Args:
+            pause: 모든 스레드가 요청을 멈출 시간 (Retry-After, 초)
+            factor: 현재 속도에 곱할 비율
+            min_rate: 최저 속도 (초당 요청 수)
+        """
+        if self.target_rate <= 0:
+            return
+        with self._lock:
+            self.rate = max(min_rate, self.rate * factor)
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+    def recover(self, factor: float = 1.05):
+        """요청이 성공하면 원래 속도까지 조금씩 회복"""
+        if self.rate >= self.target_rate:
+            return
+        with self._lock:
+            self.rate = min(self.target_rate, self.rate * factor)
+
+
+class QuotaExceeded(Exception):
+    """일일 요청 할당량 초과"""
+
+
+class DailyQuota:
+    """
+    파일에 저장되는 일일 요청 할당량 (여러 실행이 같은 날의 사용량을 공유)
+
+    Args:
+        path: 사용량 저장 파일
+        limit: 하루 최대 요청 수 (0 이하면 제한 없음)
+    """
+
+    SAVE_EVERY = 50
+
+    def __init__(self, path, limit: int):
+        self.path = Path(path)
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._date = date.today().isoformat()
+        self._used = 0
+        self._unsaved = 0
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("date") == self._date:
+                self._used = saved.get("used", 0)
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+    @property
+    def remaining(self):
+        """남은 요청 수 (제한이 없으면 None)"""
+        if self.limit <= 0:
+            return None
+        return max(0, self.limit - self._used)
+
+    def consume(self, count: int = 1):
+        """요청 수 차감 (할당량을 넘으면 QuotaExceeded)"""
+        with self._lock:
+            today = date.today().isoformat()
+            if today != self._date:
+                self._date = today
+                self._used = 0
+            if self.limit > 0 and self._used + count > self.limit:
+                raise QuotaExceeded(f"일일 할당량 {self.limit}건을 모두 사용했습니다")
+            self._used += count
+            self._unsaved += count
+            if self._unsaved >= self.SAVE_EVERY:
+                self._save()
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"date": self._date, "used": self._used}, f)
+        self._unsaved = 0
+
+    def save(self):
+        """사용량 저장 (저장하지 않은 사용량이 있을 때만)"""
+        with self._lock:
+            if self._unsaved:
+                self._save()